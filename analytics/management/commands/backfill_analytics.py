@@ -0,0 +1,69 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from analytics.rollups import rebuild_range
+from orders.models import Order
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the sales rollup tables from the order history, a chunk of "
+        "days at a time. Orders are kept up to date by signals afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start",
+            type=datetime.date.fromisoformat,
+            help="First day to rebuild (YYYY-MM-DD); defaults to the first order.",
+        )
+        parser.add_argument(
+            "--end",
+            type=datetime.date.fromisoformat,
+            help="Last day to rebuild (YYYY-MM-DD); defaults to today.",
+        )
+        parser.add_argument(
+            "--chunk-days",
+            type=int,
+            default=31,
+            help="Days read and written per chunk.",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_days"] < 1:
+            raise CommandError("--chunk-days must be at least 1.")
+        first, last = Order.objects.aggregate(
+            first=Min("created_at"), last=Max("created_at")
+        ).values()
+        if first is None:
+            self.stdout.write("No orders to backfill.")
+            return
+        start = options["start"] or timezone.localdate(first)
+        end = options["end"] or max(timezone.localdate(last), timezone.localdate())
+        if start > end:
+            raise CommandError("--start must not be after --end.")
+
+        step = datetime.timedelta(days=options["chunk_days"])
+        started_at = time.perf_counter()
+        total = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + step, end + datetime.timedelta(days=1))
+            orders = rebuild_range(chunk_start, chunk_end)
+            total += orders
+            self.stdout.write(
+                f"{chunk_start} .. {chunk_end - datetime.timedelta(days=1)}: "
+                f"{orders} orders"
+            )
+            chunk_start = chunk_end
+
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {start} .. {end} from {total} orders in {elapsed:.1f}s."
+            )
+        )
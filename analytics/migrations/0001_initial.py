@@ -0,0 +1,107 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("products", "0008_productdocument"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyOrderStatus",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("status", models.CharField(max_length=20)),
+                ("orders", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "Daily Order Statuses",
+                "ordering": ["date", "status"],
+            },
+        ),
+        migrations.CreateModel(
+            name="DailySales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(unique=True)),
+                ("orders", models.PositiveIntegerField(default=0)),
+                ("items", models.PositiveIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "Daily Sales",
+                "ordering": ["date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyProductSales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("quantity", models.PositiveIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="products.product",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Daily Product Sales",
+                "ordering": ["date", "product"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailyorderstatus",
+            constraint=models.UniqueConstraint(
+                fields=("date", "status"), name="unique_daily_order_status"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="dailyproductsales",
+            constraint=models.UniqueConstraint(
+                fields=("date", "product"), name="unique_daily_product_sales"
+            ),
+        ),
+    ]
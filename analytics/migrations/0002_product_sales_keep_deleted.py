@@ -0,0 +1,47 @@
+# Generated by Django 4.2.23 on 2026-10-19 19:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import OuterRef, Subquery
+
+
+def copy_product_details(apps, schema_editor):
+    DailyProductSales = apps.get_model("analytics", "DailyProductSales")
+    Product = apps.get_model("products", "Product")
+    products = Product._base_manager.filter(pk=OuterRef("product_id"))
+    DailyProductSales.objects.update(
+        title=Subquery(products.values("title")[:1]),
+        sku=Subquery(products.values("sku")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0010_image_derivatives"),
+        ("analytics", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dailyproductsales",
+            name="sku",
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name="dailyproductsales",
+            name="title",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name="dailyproductsales",
+            name="product",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="products.product",
+            ),
+        ),
+        migrations.RunPython(copy_product_details, migrations.RunPython.noop),
+    ]
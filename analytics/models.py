@@ -0,0 +1,68 @@
+from django.db import models
+
+from products.models import Product
+
+
+class DailySales(models.Model):
+    """Orders, items and revenue of one day, cancelled and refunded excluded."""
+
+    date = models.DateField(unique=True)
+    orders = models.PositiveIntegerField(default=0)
+    items = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["date"]
+        verbose_name_plural = "Daily Sales"
+
+    def __str__(self):
+        return f"{self.date}: {self.orders} orders, {self.revenue}"
+
+
+class DailyOrderStatus(models.Model):
+    """How many of the orders placed on `date` are currently in `status`."""
+
+    date = models.DateField()
+    status = models.CharField(max_length=20)
+    orders = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["date", "status"]
+        verbose_name_plural = "Daily Order Statuses"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "status"], name="unique_daily_order_status"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.date}: {self.orders} {self.status}"
+
+
+class DailyProductSales(models.Model):
+    """
+    Units and revenue of one product on one day. The title and SKU are kept
+    on the row, so sales of products that were deleted since stay counted.
+    """
+
+    date = models.DateField()
+    product = models.ForeignKey(
+        Product, on_delete=models.SET_NULL, null=True, related_name="+"
+    )
+    title = models.CharField(max_length=255, blank=True)
+    sku = models.IntegerField(null=True)
+    quantity = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["date", "product"]
+        verbose_name_plural = "Daily Product Sales"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "product"], name="unique_daily_product_sales"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.date}: {self.quantity} x {self.title}"
@@ -0,0 +1,179 @@
+import datetime
+import threading
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.tasks import TaskQueue
+from orders.models import Order, OrderItem
+
+from .models import DailyOrderStatus, DailyProductSales, DailySales
+
+# Orders in these statuses are counted in the funnel but not in sales.
+EXCLUDED_STATUSES = ("Cancelled", "Refunded")
+
+rollup_queue = TaskQueue("analytics")
+
+_pending_days = set()
+_pending_lock = threading.Lock()
+
+
+def day_start(date):
+    """The aware datetime at which `date` starts in the default time zone."""
+    return datetime.datetime.combine(
+        date, datetime.time.min, tzinfo=timezone.get_default_timezone()
+    )
+
+
+def load_orders(start, end):
+    """
+    Return the `(orders, items)` rows of the orders placed from `start` up to,
+    not including, `end` (dates).
+    """
+    orders = Order.objects.filter(
+        created_at__gte=day_start(start), created_at__lt=day_start(end)
+    )
+    order_rows = list(orders.values_list("id", "created_at", "order_status", "total"))
+    item_rows = list(
+        OrderItem.objects.filter(order__in=orders).values_list(
+            "order_id",
+            "product_id",
+            "product__title",
+            "product__sku",
+            "quantity",
+            "total",
+        )
+    )
+    return order_rows, item_rows
+
+
+def to_cents(amounts):
+    """Decimal amounts (None counting as zero) as an int64 array of cents."""
+    import numpy as np
+
+    values = amounts.fillna(0).astype(float).to_numpy()
+    return np.rint(values * 100).astype(np.int64)
+
+
+def from_cents(cents):
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def summarize(order_rows, item_rows):
+    """
+    Aggregate order and item rows per day with pandas, and return the
+    unsaved `DailySales`, `DailyOrderStatus` and `DailyProductSales` rows.
+    """
+    if not order_rows:
+        return [], [], []
+
+    # pandas is only needed to build rollups, so it is imported on first use.
+    import pandas as pd
+
+    orders = pd.DataFrame(order_rows, columns=["id", "created_at", "status", "total"])
+    items = pd.DataFrame(
+        item_rows,
+        columns=["order_id", "product_id", "title", "sku", "quantity", "total"],
+    )
+    orders["date"] = (
+        pd.to_datetime(orders["created_at"], utc=True)
+        .dt.tz_convert(timezone.get_default_timezone_name())
+        .dt.date
+    )
+    orders["cents"] = to_cents(orders["total"])
+    items["cents"] = to_cents(items["total"])
+
+    counted = orders[~orders["status"].isin(EXCLUDED_STATUSES)]
+    items = items.merge(
+        counted[["id", "date"]], left_on="order_id", right_on="id", how="inner"
+    )
+    sales = counted.groupby("date").agg(orders=("id", "size"), revenue=("cents", "sum"))
+    sales["items"] = (
+        items.groupby("date")["quantity"].sum().reindex(sales.index, fill_value=0)
+    )
+    statuses = orders.groupby(["date", "status"]).size()
+    products = items.groupby(["date", "product_id"]).agg(
+        title=("title", "first"),
+        sku=("sku", "first"),
+        quantity=("quantity", "sum"),
+        revenue=("cents", "sum"),
+    )
+
+    return (
+        [
+            DailySales(
+                date=date,
+                orders=row.orders,
+                items=row.items,
+                revenue=from_cents(row.revenue),
+            )
+            for date, row in zip(sales.index, sales.itertuples())
+        ],
+        [
+            DailyOrderStatus(date=date, status=status, orders=count)
+            for (date, status), count in statuses.items()
+        ],
+        [
+            DailyProductSales(
+                date=date,
+                product_id=product_id,
+                title=row.title,
+                sku=row.sku,
+                quantity=row.quantity,
+                revenue=from_cents(row.revenue),
+            )
+            for (date, product_id), row in zip(products.index, products.itertuples())
+        ],
+    )
+
+
+def rebuild_range(start, end, attempts=3):
+    """
+    Recompute the rollups of the days from `start` up to, not including,
+    `end`; returns how many orders were read.
+    """
+    for attempt in range(attempts):
+        order_rows, item_rows = load_orders(start, end)
+        sales, statuses, products = summarize(order_rows, item_rows)
+        try:
+            with transaction.atomic():
+                for model in (DailySales, DailyOrderStatus, DailyProductSales):
+                    rows = model.objects.filter(date__gte=start, date__lt=end)
+                    if model is DailyProductSales:
+                        # Sales of deleted products can't be recomputed, as
+                        # their order items are gone; keep them.
+                        rows = rows.filter(product__isnull=False)
+                    rows.delete()
+                DailySales.objects.bulk_create(sales)
+                DailyOrderStatus.objects.bulk_create(statuses)
+                DailyProductSales.objects.bulk_create(products)
+        except IntegrityError:
+            # Another process rebuilt the same days concurrently; read again.
+            if attempt == attempts - 1:
+                raise
+        else:
+            return len(order_rows)
+
+
+def rebuild_day(date):
+    with _pending_lock:
+        _pending_days.discard(date)
+    rebuild_range(date, date + datetime.timedelta(days=1))
+
+
+def schedule_day(date):
+    with _pending_lock:
+        if date in _pending_days:
+            return
+        _pending_days.add(date)
+    rollup_queue.submit(rebuild_day, date)
+
+
+def invalidate_day(created_at):
+    """
+    Rebuild the rollups of the day `created_at` falls on once the current
+    transaction commits; changes to many orders of a day rebuild it once.
+    """
+    date = timezone.localdate(created_at)
+    transaction.on_commit(lambda: schedule_day(date))
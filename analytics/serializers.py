@@ -0,0 +1,51 @@
+from rest_framework import serializers
+
+PERIOD_CHOICES = ["day", "week", "month"]
+
+
+class DateRangeSerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, data):
+        if "start" in data and "end" in data and data["start"] > data["end"]:
+            raise serializers.ValidationError("start must not be after end.")
+        return data
+
+
+class RevenueQuerySerializer(DateRangeSerializer):
+    period = serializers.ChoiceField(choices=PERIOD_CHOICES, default="day")
+
+
+class TopProductsQuerySerializer(DateRangeSerializer):
+    order_by = serializers.ChoiceField(
+        choices=["revenue", "quantity"], default="revenue"
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class SalesSerializer(serializers.Serializer):
+    orders = serializers.IntegerField()
+    items = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    average_order_value = serializers.DecimalField(
+        max_digits=14, decimal_places=2, allow_null=True
+    )
+
+
+class RevenueSerializer(SalesSerializer):
+    period = serializers.DateField()
+
+
+class OrderFunnelSerializer(serializers.Serializer):
+    status = serializers.CharField()
+    orders = serializers.IntegerField()
+    share = serializers.FloatField()
+
+
+class TopProductSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField(allow_null=True)
+    sku = serializers.IntegerField(allow_null=True)
+    title = serializers.CharField()
+    quantity = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from orders.models import Order, OrderItem
+
+from .rollups import invalidate_day
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def order_changed(sender, instance, **kwargs):
+    if instance.created_at:
+        invalidate_day(instance.created_at)
+
+
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+def order_item_changed(sender, instance, **kwargs):
+    if OrderItem.order.field.is_cached(instance):
+        created_at = instance.order.created_at
+    else:
+        # The order may already be gone when its items are cascade-deleted;
+        # its own post_delete covers that day.
+        created_at = (
+            Order._base_manager.filter(pk=instance.order_id)
+            .values_list("created_at", flat=True)
+            .first()
+        )
+    if created_at:
+        invalidate_day(created_at)
@@ -0,0 +1,108 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.admin.sites import site
+from django.test import TestCase
+from django.utils import timezone
+
+from orders.admin import OrderAdmin, OrderItemAdmin
+from orders.models import Order, OrderItem
+from products.models import Product
+
+from .models import DailyOrderStatus, DailyProductSales, DailySales
+from .rollups import rebuild_range
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.kettle = Product.objects.create(
+            title="Kettle", sku=2001, new_price=10, brand="Acme"
+        )
+        self.toaster = Product.objects.create(
+            title="Toaster", sku=2002, new_price=25, brand="Acme"
+        )
+
+    def order(self, status="Pending", items=()):
+        order = Order.objects.create(order_status=status)
+        for product, quantity in items:
+            OrderItem.objects.create(
+                order=order, product=product, quantity=quantity, price=product.new_price
+            )
+        order.total = sum(item.total for item in order.order_items.all())
+        order.save()
+        return order
+
+    def rebuild(self):
+        rebuild_range(self.today, self.today + datetime.timedelta(days=1))
+
+    def test_rollups_of_a_day(self):
+        self.order(items=[(self.kettle, 2), (self.toaster, 1)])
+        self.order("Shipped", items=[(self.kettle, 1)])
+        self.order("Cancelled", items=[(self.toaster, 4)])
+        self.rebuild()
+
+        sales = DailySales.objects.get(date=self.today)
+        self.assertEqual((sales.orders, sales.items), (2, 4))
+        self.assertEqual(sales.revenue, Decimal("55.00"))
+        self.assertEqual(
+            dict(
+                DailyOrderStatus.objects.filter(date=self.today).values_list(
+                    "status", "orders"
+                )
+            ),
+            {"Pending": 1, "Shipped": 1, "Cancelled": 1},
+        )
+        self.assertEqual(
+            list(
+                DailyProductSales.objects.order_by("sku").values_list(
+                    "product_id", "title", "sku", "quantity", "revenue"
+                )
+            ),
+            [
+                (self.kettle.pk, "Kettle", 2001, 3, Decimal("30.00")),
+                (self.toaster.pk, "Toaster", 2002, 1, Decimal("25.00")),
+            ],
+        )
+
+    def test_order_changes_rebuild_the_day_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            order = self.order(items=[(self.kettle, 1)])
+        self.assertEqual(DailySales.objects.get(date=self.today).orders, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order.order_status = "Cancelled"
+            order.save()
+        self.assertFalse(DailySales.objects.filter(date=self.today).exists())
+
+    def test_admin_bulk_updates_rebuild_the_day_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            order = self.order(items=[(self.kettle, 2), (self.toaster, 1)])
+        self.assertEqual(DailySales.objects.get(date=self.today).items, 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            OrderItemAdmin(OrderItem, site).perform_bulk_update(
+                OrderItem.objects.filter(product=self.kettle), is_deleted=True
+            )
+        self.assertEqual(DailySales.objects.get(date=self.today).items, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            OrderAdmin(Order, site).perform_bulk_update(
+                Order.objects.filter(pk=order.pk), is_deleted=True
+            )
+        self.assertFalse(DailySales.objects.filter(date=self.today).exists())
+
+    def test_sales_of_deleted_products_are_kept(self):
+        self.order(items=[(self.kettle, 2), (self.toaster, 1)])
+        self.rebuild()
+        self.kettle.hard_delete()
+        self.rebuild()
+
+        self.assertEqual(
+            list(
+                DailyProductSales.objects.order_by("sku").values_list(
+                    "product_id", "title", "sku", "quantity"
+                )
+            ),
+            [(None, "Kettle", 2001, 2), (self.toaster.pk, "Toaster", 2002, 1)],
+        )
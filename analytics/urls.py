@@ -0,0 +1,10 @@
+from django.urls import path
+
+from .views import OrderFunnelView, RevenueView, SalesSummaryView, TopProductsView
+
+urlpatterns = [
+    path("summary/", SalesSummaryView.as_view(), name="analytics-summary"),
+    path("revenue/", RevenueView.as_view(), name="analytics-revenue"),
+    path("funnel/", OrderFunnelView.as_view(), name="analytics-funnel"),
+    path("top-products/", TopProductsView.as_view(), name="analytics-top-products"),
+]
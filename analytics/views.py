@@ -0,0 +1,158 @@
+from decimal import Decimal
+
+from django.db.models import F, Max, Sum
+from django.db.models.functions import Coalesce, TruncMonth, TruncWeek
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from orders.models import Order
+
+from .models import DailyOrderStatus, DailyProductSales, DailySales
+from .serializers import (
+    DateRangeSerializer,
+    OrderFunnelSerializer,
+    RevenueQuerySerializer,
+    RevenueSerializer,
+    SalesSerializer,
+    TopProductSerializer,
+    TopProductsQuerySerializer,
+)
+
+PERIODS = {
+    "day": F("date"),
+    "week": TruncWeek("date"),
+    "month": TruncMonth("date"),
+}
+
+
+def average_order_value(revenue, orders):
+    if not orders:
+        return None
+    return (revenue / orders).quantize(Decimal("0.01"))
+
+
+def filter_dates(queryset, params):
+    if "start" in params:
+        queryset = queryset.filter(date__gte=params["start"])
+    if "end" in params:
+        queryset = queryset.filter(date__lte=params["end"])
+    return queryset
+
+
+class AnalyticsView(APIView):
+    """
+    Base for the sales analytics endpoints, which read the daily rollup tables
+    maintained by `analytics.rollups` instead of scanning orders.
+    """
+
+    permission_classes = [IsAdminUser]
+    query_serializer_class = DateRangeSerializer
+
+    def get_params(self):
+        serializer = self.query_serializer_class(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def get_sales(self, params):
+        return filter_dates(DailySales.objects.all(), params)
+
+
+class SalesSummaryView(AnalyticsView):
+    @extend_schema(
+        summary="Sales Summary",
+        tags=["Analytics"],
+        description="Orders, items sold, revenue and average order value between `start` and `end` (inclusive). Cancelled and refunded orders are excluded.",
+        parameters=[DateRangeSerializer],
+        responses={200: SalesSerializer},
+    )
+    def get(self, request):
+        totals = self.get_sales(self.get_params()).aggregate(
+            orders=Sum("orders"), items=Sum("items"), revenue=Sum("revenue")
+        )
+        totals = {key: value or 0 for key, value in totals.items()}
+        totals["revenue"] = Decimal(totals["revenue"])
+        totals["average_order_value"] = average_order_value(
+            totals["revenue"], totals["orders"]
+        )
+        return Response(SalesSerializer(totals).data)
+
+
+class RevenueView(AnalyticsView):
+    query_serializer_class = RevenueQuerySerializer
+
+    @extend_schema(
+        summary="Revenue by Period",
+        tags=["Analytics"],
+        description="Orders, items sold, revenue and average order value per day, week (starting Monday) or month. Periods without sales are omitted.",
+        parameters=[RevenueQuerySerializer],
+        responses={200: RevenueSerializer(many=True)},
+    )
+    def get(self, request):
+        params = self.get_params()
+        rows = (
+            self.get_sales(params)
+            .annotate(period=PERIODS[params["period"]])
+            .values("period")
+            .annotate(orders=Sum("orders"), items=Sum("items"), revenue=Sum("revenue"))
+            .order_by("period")
+        )
+        for row in rows:
+            row["average_order_value"] = average_order_value(
+                row["revenue"], row["orders"]
+            )
+        return Response(RevenueSerializer(rows, many=True).data)
+
+
+class OrderFunnelView(AnalyticsView):
+    @extend_schema(
+        summary="Order Status Funnel",
+        tags=["Analytics"],
+        description="How many of the orders placed between `start` and `end` are in each status now, in the order of the order lifecycle.",
+        parameters=[DateRangeSerializer],
+        responses={200: OrderFunnelSerializer(many=True)},
+    )
+    def get(self, request):
+        counts = dict(
+            filter_dates(DailyOrderStatus.objects.all(), self.get_params())
+            .values("status")
+            .annotate(total=Sum("orders"))
+            .values_list("status", "total")
+        )
+        total = sum(counts.values())
+        funnel = [
+            {
+                "status": status,
+                "orders": counts.get(status, 0),
+                "share": round(counts.get(status, 0) / total, 4) if total else 0.0,
+            }
+            for status, _ in Order.STATUS_CHOICES
+        ]
+        return Response(OrderFunnelSerializer(funnel, many=True).data)
+
+
+class TopProductsView(AnalyticsView):
+    query_serializer_class = TopProductsQuerySerializer
+
+    @extend_schema(
+        summary="Top Products",
+        tags=["Analytics"],
+        description="The products with the most revenue (or units sold) between `start` and `end`.",
+        parameters=[TopProductsQuerySerializer],
+        responses={200: TopProductSerializer(many=True)},
+    )
+    def get(self, request):
+        params = self.get_params()
+        rows = (
+            filter_dates(DailyProductSales.objects.all(), params)
+            .values("product_id", "sku")
+            .annotate(
+                # Deleted products are told apart by their SKU.
+                title=Coalesce(Max("product__title"), Max("title")),
+                quantity=Sum("quantity"),
+                revenue=Sum("revenue"),
+            )
+            .order_by(f"-{params['order_by']}", "product_id", "sku")[: params["limit"]]
+        )
+        return Response(TopProductSerializer(rows, many=True).data)
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from core.rendering import RenderRequest, with_request_origin
+
+from .models import Banner
+from .serializers import BannerSerializer
+
+ACTIVE_BANNERS_KEY = "banners:active"
+
+
+def active_banners(now):
+    return (
+        Banner.objects.filter(status="Active")
+        .filter(Q(start_date__isnull=True) | Q(start_date__lte=now))
+        .filter(Q(end_date__isnull=True) | Q(end_date__gt=now))
+        .order_by("display_order", "-start_date", "pk")
+    )
+
+
+def next_boundary(now):
+    """When the set of active banners next changes on its own, or None."""
+    boundaries = Banner.objects.filter(status="Active").aggregate(
+        start=Min("start_date", filter=Q(start_date__gt=now)),
+        end=Min("end_date", filter=Q(end_date__gt=now)),
+    )
+    return min(filter(None, boundaries.values()), default=None)
+
+
+def build_active_banners(now):
+    banners = {location: [] for location, _ in Banner.DISPLAY_LOCATION_CHOICES}
+    serializer = BannerSerializer(
+        active_banners(now), many=True, context={"request": RenderRequest()}
+    )
+    for banner in serializer.data:
+        banners.setdefault(banner["display_location"], []).append(banner)
+    return banners
+
+
+def get_active_banners(request):
+    """
+    Return the active banners by display location, in display order, with
+    URLs absolute to `request`. The map is cached until the next banner
+    starts or ends (at most `BANNER_CACHE_TIMEOUT` seconds) and dropped
+    whenever a banner changes.
+    """
+    now = timezone.now()
+    cached = cache.get(ACTIVE_BANNERS_KEY)
+    if cached is not None and (cached["until"] is None or now < cached["until"]):
+        return with_request_origin(cached["banners"], request)
+
+    banners = build_active_banners(now)
+    until = next_boundary(now)
+    timeout = settings.BANNER_CACHE_TIMEOUT
+    if until is not None:
+        timeout = min(timeout, max((until - now).total_seconds(), 1))
+    cache.set(ACTIVE_BANNERS_KEY, {"banners": banners, "until": until}, timeout)
+    return with_request_origin(banners, request)
+
+
+def invalidate_active_banners():
+    # After the commit, so a concurrent read can't cache the old banners.
+    transaction.on_commit(lambda: cache.delete(ACTIVE_BANNERS_KEY))
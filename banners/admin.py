@@ -5,6 +5,7 @@ from unfold.admin import ModelAdmin
 from core.admin import SoftDeleteAdmin
 from core.mixins import FormatBaseModelFieldsMixin, HideBaseModelFieldsMixin
 
+from .active import invalidate_active_banners
 from .models import Banner
 
 
@@ -36,6 +37,11 @@ class BannerAdmin(
     ordering = ("-start_date", "display_order")
     readonly_fields = ("created_at", "updated_at")
 
+    def perform_bulk_update(self, queryset, **changes):
+        updated = super().perform_bulk_update(queryset, **changes)
+        invalidate_active_banners()
+        return updated
+
     def banner_image(self, obj):
         if obj.image:
             return format_html(
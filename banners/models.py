@@ -36,6 +36,7 @@ class Banner(BaseModel):
     image = models.ImageField(
         upload_to="banners/", null=True, blank=True, verbose_name="Banner Image"
     )
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     call_to_action_link = models.URLField(max_length=255, blank=True, null=True)
     call_to_action_text = models.CharField(max_length=100, blank=True, null=True)
     show_call_to_action = models.BooleanField(default=True)
@@ -48,6 +49,8 @@ class Banner(BaseModel):
         max_length=50, choices=DISPLAY_LOCATION_CHOICES, default="homepage__header"
     )
 
+    derivative_fields = ["image"]
+
     class Meta:
         ordering = ["display_order", "-start_date"]
         verbose_name_plural = "Banners"
@@ -1,9 +1,11 @@
-from core.serializers import BaseModelSerializer
+from core.serializers import BaseModelSerializer, ImageDerivativesField
 
 from .models import Banner
 
 
 class BannerSerializer(BaseModelSerializer):
+    image_derivatives = ImageDerivativesField("image")
+
     class Meta:
         model = Banner
         fields = [
@@ -12,6 +14,7 @@ class BannerSerializer(BaseModelSerializer):
             "title",
             "subtitle",
             "image",
+            "image_derivatives",
             "call_to_action_link",
             "call_to_action_text",
             "show_call_to_action",
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.images import derivatives_ready
+
+from .active import invalidate_active_banners
+from .models import Banner
+
+
+@receiver(post_save, sender=Banner)
+@receiver(post_delete, sender=Banner)
+@receiver(derivatives_ready, sender=Banner)
+def banner_changed(sender, **kwargs):
+    invalidate_active_banners()
@@ -1 +1,65 @@
-# Create your tests here.
+from datetime import timedelta
+
+from django.contrib.admin.sites import site
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.testing import APITestCase
+
+from .active import ACTIVE_BANNERS_KEY
+from .admin import BannerAdmin
+from .models import Banner
+
+
+class ActiveBannerTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.banner = Banner.objects.create(
+            title="Sale", image="banners/sale.jpg", display_order=2
+        )
+
+    def by_location(self, **headers):
+        response = self.client.get(
+            "/api/banner/by-location/",
+            {"display_location": "homepage__header"},
+            **headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_active_banners_are_cached(self):
+        self.by_location()
+        with self.assertNumQueries(0):
+            banners = self.by_location()
+        self.assertEqual([banner["title"] for banner in banners], ["Sale"])
+
+    def test_changes_drop_the_cache_on_commit(self):
+        self.by_location()
+        with self.captureOnCommitCallbacks(execute=True):
+            Banner.objects.create(title="New")
+        self.assertEqual(
+            [banner["title"] for banner in self.by_location()], ["New", "Sale"]
+        )
+
+    def test_admin_bulk_updates_drop_the_cache_on_commit(self):
+        self.by_location()
+        with self.captureOnCommitCallbacks(execute=True):
+            BannerAdmin(Banner, site).perform_bulk_update(
+                Banner.objects.all(), is_deleted=True
+            )
+        self.assertEqual(self.by_location(), [])
+
+    def test_cache_expires_when_a_banner_ends(self):
+        end_date = timezone.now() + timedelta(hours=1)
+        Banner.objects.filter(pk=self.banner.pk).update(end_date=end_date)
+        self.by_location()
+        self.assertEqual(cache.get(ACTIVE_BANNERS_KEY)["until"], end_date)
+
+    def test_urls_are_absolute_to_each_request(self):
+        self.assertEqual(
+            self.by_location()[0]["image"], "http://testserver/media/banners/sale.jpg"
+        )
+        self.assertEqual(
+            self.by_location(HTTP_HOST="shop.example.com")[0]["image"],
+            "http://shop.example.com/media/banners/sale.jpg",
+        )
@@ -1,11 +1,16 @@
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework import filters, status
+from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 
 from core.mixins import BulkOperationsMixin, MultiLookupMixin
 from core.utils import generate_bulk_schema_view, generate_crud_schema_view
 from core.views import BaseViewSet
 
+from .active import get_active_banners
 from .filters import BannerFilter
 from .models import Banner
 from .serializers import BannerSerializer
@@ -38,5 +43,37 @@ class BannerViewSet(MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
         "destroy": [IsAuthenticated, IsAdminUser],
         "retrieve": [AllowAny],
         "list": [AllowAny],
+        "by_location": [AllowAny],
         "default": [AllowAny],
     }
+
+    @extend_schema(
+        tags=["Banner"],
+        summary="Active banners by location",
+        description="The banners showing right now (status `Active`, started and not ended), grouped by display location in display order. Served from a cache that is refreshed when a banner changes, starts or ends.",
+        parameters=[
+            OpenApiParameter(
+                name="display_location",
+                type=str,
+                description="Only return the banners of this location, as a list.",
+                required=False,
+                enum=[location for location, _ in Banner.DISPLAY_LOCATION_CHOICES],
+            )
+        ],
+        responses={
+            200: OpenApiTypes.OBJECT,
+            400: OpenApiResponse(description="Unknown display location."),
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="by-location")
+    def by_location(self, request):
+        banners = get_active_banners(request)
+        location = request.query_params.get("display_location")
+        if location is None:
+            return Response(banners)
+        if location not in banners:
+            return Response(
+                {"detail": f"Unknown display location '{location}'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(banners[location])
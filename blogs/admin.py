@@ -36,6 +36,7 @@ class BlogAdmin(
         "formatted_created_at",
         "is_deleted_display",
     )
+    list_select_related = ("category",)
     search_fields = ("title", "category__name")
     list_filter = ("category", "date")
     ordering = ("-date", "category")
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-19 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blogs", "0004_alter_blog_created_by_alter_blog_deleted_by_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blog",
+            name="image_derivatives",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="blogcategory",
+            name="image_derivatives",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.23 on 2026-10-19 19:28
+
+from django.db import migrations, models
+
+from blogs.text import make_excerpt, reading_time
+
+
+def fill_excerpts(apps, schema_editor):
+    Blog = apps.get_model("blogs", "Blog")
+    blogs = Blog._base_manager.only("short_description", "description")
+    for blog in blogs.iterator(chunk_size=200):
+        blog.excerpt = make_excerpt(blog.short_description, blog.description)
+        blog.reading_time = reading_time(blog.description)
+        blog.save(update_fields=["excerpt", "reading_time"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blogs", "0005_image_derivatives"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blog",
+            name="excerpt",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="blog",
+            name="reading_time",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Reading Time (minutes)"
+            ),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,8 @@ from django.db import models
 
 from core.models import BaseModel
 
+from .text import make_excerpt, reading_time
+
 
 class Blog(BaseModel):
     category = models.ForeignKey(
@@ -20,6 +22,7 @@ class Blog(BaseModel):
         blank=True,
         verbose_name="Blog Image",
     )
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     date = models.DateField(verbose_name="Published Date")
     title = models.CharField(max_length=255, unique=True, verbose_name="Blog Title")
 
@@ -30,6 +33,14 @@ class Blog(BaseModel):
     description = RichTextUploadingField(
         null=True, blank=True, verbose_name="Full Description"
     )
+    # Plain-text summary and minutes to read, derived from the rich text on
+    # save so blog lists don't have to load it.
+    excerpt = models.TextField(blank=True, default="", editable=False)
+    reading_time = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Reading Time (minutes)"
+    )
+
+    derivative_fields = ["image"]
 
     class Meta:
         verbose_name_plural = "Blogs"
@@ -37,6 +48,17 @@ class Blog(BaseModel):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"short_description", "description"} & set(
+            update_fields
+        ):
+            self.excerpt = make_excerpt(self.short_description, self.description)
+            self.reading_time = reading_time(self.description)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "excerpt", "reading_time"}
+        super().save(*args, **kwargs)
+
 
 class BlogCategory(BaseModel):
     name = models.CharField(max_length=100, unique=True, verbose_name="Category Name")
@@ -49,6 +71,9 @@ class BlogCategory(BaseModel):
         blank=True,
         verbose_name="Category Image",
     )
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
+
+    derivative_fields = ["image"]
 
     class Meta:
         verbose_name_plural = "Blog Categories"
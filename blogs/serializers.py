@@ -1,11 +1,13 @@
 from rest_framework import serializers
 
-from core.serializers import BaseModelSerializer
+from core.serializers import BaseModelSerializer, ImageDerivativesField
 
 from .models import Blog, BlogCategory
 
 
 class BlogCategorySerializer(BaseModelSerializer):
+    image_derivatives = ImageDerivativesField("image")
+
     class Meta:
         model = BlogCategory
         fields = [
@@ -15,16 +17,25 @@ class BlogCategorySerializer(BaseModelSerializer):
             "name",
             "description",
             "image",
+            "image_derivatives",
             "created_at",
             "updated_at",
         ]
 
 
+class BlogCategoryCountSerializer(BlogCategorySerializer):
+    blogs_count = serializers.IntegerField(read_only=True)
+
+    class Meta(BlogCategorySerializer.Meta):
+        fields = BlogCategorySerializer.Meta.fields + ["blogs_count"]
+
+
 class BlogSerializer(BaseModelSerializer):
     category = BlogCategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(
         queryset=BlogCategory.objects.all(), source="category", write_only=True
     )
+    image_derivatives = ImageDerivativesField("image")
 
     class Meta:
         model = Blog
@@ -35,10 +46,26 @@ class BlogSerializer(BaseModelSerializer):
             "category",
             "title",
             "image",
+            "image_derivatives",
             "date",
             "short_description",
             "description",
+            "excerpt",
+            "reading_time",
             "created_at",
             "updated_at",
             "category_id",
         ]
+
+
+class BlogListSerializer(BlogSerializer):
+    """Blogs in lists: the excerpt and reading time instead of the rich text."""
+
+    category_id = None
+
+    class Meta(BlogSerializer.Meta):
+        fields = [
+            field
+            for field in BlogSerializer.Meta.fields
+            if field not in ("short_description", "description", "category_id")
+        ]
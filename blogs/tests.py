@@ -1 +1,47 @@
-# Create your tests here.
+import datetime
+
+from core.testing import APITestCase
+
+from .models import Blog, BlogCategory
+
+
+class BlogTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.news = BlogCategory.objects.create(
+            name="News", image="blogs/categories/news.jpg"
+        )
+        self.guides = BlogCategory.objects.create(name="Guides")
+
+    def create_blog(self, title, **fields):
+        return Blog.objects.create(
+            title=title, date=datetime.date(2026, 1, 1), category=self.news, **fields
+        )
+
+    def test_excerpt_and_reading_time_follow_the_description(self):
+        blog = self.create_blog("Launch", description="<p>" + "word " * 450 + "</p>")
+        self.assertEqual(blog.reading_time, 3)
+        self.assertTrue(blog.excerpt.startswith("word word"))
+
+        blog.description = "<p>Short <b>news</b>.</p>"
+        blog.save(update_fields=["description"])
+        blog.refresh_from_db()
+        self.assertEqual((blog.excerpt, blog.reading_time), ("Short news.", 1))
+
+    def test_categories_with_counts(self):
+        self.create_blog("One")
+        self.create_blog("Two")
+        self.create_blog("Gone").delete()
+
+        response = self.client.get(
+            "/api/blog-category/with-counts/", HTTP_HOST="shop.example.com"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["name"], row["blogs_count"]) for row in response.json()],
+            [("Guides", 0), ("News", 2)],
+        )
+        self.assertEqual(
+            response.json()[1]["image"],
+            "http://shop.example.com/media/blogs/categories/news.jpg",
+        )
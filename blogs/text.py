@@ -0,0 +1,42 @@
+import math
+
+from django.conf import settings
+from django.utils.text import Truncator
+
+# Elements that separate words; inline ones (`<b>`, `<a>`...) don't, so
+# "<b>news</b>." stays "news.".
+BLOCK_TAGS = (
+    "address article blockquote br dd div dl dt figcaption figure h1 h2 h3 h4 "
+    "h5 h6 hr li ol p pre section table td th tr ul"
+).split()
+
+
+def html_to_text(html):
+    """The visible text of rich text `html`, with whitespace collapsed."""
+    if not html:
+        return ""
+    # BeautifulSoup is only needed when blogs are saved.
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for element in soup(["script", "style"]):
+        element.decompose()
+    for element in soup(BLOCK_TAGS):
+        element.insert_before(" ")
+        element.insert_after(" ")
+    return " ".join(soup.get_text().split())
+
+
+def make_excerpt(short_description, description):
+    """
+    Plain-text excerpt of a blog: its short description, or the start of
+    its description, cut at a word within `BLOG_EXCERPT_LENGTH` characters.
+    """
+    text = html_to_text(short_description) or html_to_text(description)
+    return Truncator(text).chars(settings.BLOG_EXCERPT_LENGTH)
+
+
+def reading_time(description):
+    """Minutes needed to read `description`; at least 1 when it has text."""
+    words = len(html_to_text(description).split())
+    return math.ceil(words / settings.BLOG_WORDS_PER_MINUTE)
@@ -1,6 +1,10 @@
+from django.db.models import Count, Q
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import filters
+from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 
 from core.mixins import BulkOperationsMixin, MultiLookupMixin
 from core.utils import generate_bulk_schema_view, generate_crud_schema_view
@@ -8,14 +12,21 @@ from core.views import BaseViewSet
 
 from .filters import BlogFilter
 from .models import Blog, BlogCategory
-from .serializers import BlogCategorySerializer, BlogSerializer
+from .serializers import (
+    BlogCategoryCountSerializer,
+    BlogCategorySerializer,
+    BlogListSerializer,
+    BlogSerializer,
+)
 
 
 @generate_bulk_schema_view("Blog", BlogSerializer)
 @generate_crud_schema_view("Blog")
+@extend_schema_view(list=extend_schema(responses=BlogListSerializer(many=True)))
 class BlogViewSet(MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
-    queryset = Blog.objects.all()
+    queryset = Blog.objects.select_related("category")
     serializer_class = BlogSerializer
+    cache_lookups = True
     filterset_class = BlogFilter
     lookup_field = "pk"
     lookup_url_kwarg = "pk"
@@ -41,6 +52,18 @@ class BlogViewSet(MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
         "default": [AllowAny],
     }
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "list":
+            # Lists show the excerpt; the rich text can be very large.
+            queryset = queryset.defer("short_description", "description")
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return BlogListSerializer
+        return super().get_serializer_class()
+
 
 @generate_bulk_schema_view("Blog", BlogSerializer)
 @generate_crud_schema_view("BlogCategory")
@@ -66,5 +89,24 @@ class BlogCategoryViewSet(MultiLookupMixin, BaseViewSet):
         "destroy": [IsAuthenticated, IsAdminUser],
         "retrieve": [AllowAny],
         "list": [AllowAny],
+        "with_counts": [AllowAny],
         "default": [AllowAny],
     }
+
+    @extend_schema(
+        tags=["BlogCategory"],
+        summary="Blog categories with post counts",
+        description="Every blog category with the number of its blogs (soft-deleted ones excluded), ordered by name, in one query.",
+        responses=BlogCategoryCountSerializer(many=True),
+    )
+    @action(detail=False, methods=["get"], url_path="with-counts")
+    def with_counts(self, request):
+        categories = (
+            self.filter_queryset(self.get_queryset())
+            .annotate(blogs_count=Count("blogs", filter=Q(blogs__is_deleted=False)))
+            .order_by("name")
+        )
+        serializer = BlogCategoryCountSerializer(
+            categories, many=True, context=self.get_serializer_context()
+        )
+        return Response(serializer.data)
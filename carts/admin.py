@@ -2,7 +2,7 @@
 from django.contrib import admin
 from unfold.admin import ModelAdmin
 
-from core.admin import SoftDeleteAdmin
+from core.admin import AutocompleteFilter, SoftDeleteAdmin
 from core.mixins import FormatBaseModelFieldsMixin, HideBaseModelFieldsMixin
 
 from .models import Cart, CartItem
@@ -21,10 +21,15 @@ class CartAdmin(
         "formatted_created_at",
         "is_deleted_display",
     )
+    list_select_related = ("user",)
     search_fields = ("user__email", "session_key")
     list_filter = ("created_at",)
     readonly_fields = ("created_at", "updated_at")
 
+    def get_queryset(self, request):
+        # total_items_display and total_price_display read every item.
+        return super().get_queryset(request).prefetch_related("items__product")
+
     def user_display(self, obj):
         return obj.user.email if obj.user else "Guest"
 
@@ -54,8 +59,10 @@ class CartItemAdmin(
         "formatted_created_at",
         "is_deleted_display",
     )
+    list_select_related = ("product", "cart__user")
     search_fields = ("product__title", "cart__user__email", "cart__session_key")
-    list_filter = ("product", "cart")
+    list_filter = (("product", AutocompleteFilter), ("cart", AutocompleteFilter))
+    list_filter_submit = True
     readonly_fields = ("created_at", "updated_at")
 
     def product_display(self, obj):
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework.renderers import JSONRenderer
+
+from core.rendering import RenderRequest, with_request_origin
+from products.models import Product
+
+from .models import Category
+from .serializers import CategorySerializer
+
+CATEGORY_MENU_KEY = "categories:menu"
+
+
+def product_counts():
+    """Non-deleted products of the outer category, as a subquery."""
+    return Coalesce(
+        Subquery(
+            Product.objects.filter(category=OuterRef("pk"))
+            .order_by()
+            .values("category")
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def recount_categories(category_ids=None):
+    """
+    Set `Category.item` to the number of non-deleted products of the given
+    categories (all of them when None) with one UPDATE.
+    """
+    categories = Category._base_manager.all()
+    if category_ids is not None:
+        category_ids = {pk for pk in category_ids if pk is not None}
+        if not category_ids:
+            return 0
+        categories = categories.filter(pk__in=category_ids)
+    updated = categories.update(item=product_counts())
+    invalidate_category_menu()
+    return updated
+
+
+def _cached_menu():
+    menu = cache.get(CATEGORY_MENU_KEY)
+    if menu is None:
+        categories = Category.objects.order_by("num", "name")
+        serializer = CategorySerializer(
+            categories, many=True, context={"request": RenderRequest()}
+        )
+        data = list(serializer.data)
+        renderer = JSONRenderer()
+        menu = {
+            "categories": data,
+            "documents": {item["id"]: renderer.render(item) for item in data},
+        }
+        cache.set(CATEGORY_MENU_KEY, menu, settings.CATEGORY_MENU_CACHE_TIMEOUT)
+    return menu
+
+
+def get_category_menu(request):
+    """
+    Return the categories ordered by `num` with their product counts and
+    URLs absolute to `request`, cached for `CATEGORY_MENU_CACHE_TIMEOUT`
+    seconds and dropped whenever a category or a count changes.
+    """
+    return with_request_origin(_cached_menu()["categories"], request)
+
+
+def get_category_document(category_id):
+    """
+    The category rendered as JSON by `CategorySerializer` with URLs on
+    `RENDER_ORIGIN`, from the cached menu, or None when it isn't listed.
+    """
+    return _cached_menu()["documents"].get(category_id)
+
+
+def invalidate_category_menu():
+    # After the commit, so a concurrent read can't cache the old menu.
+    transaction.on_commit(lambda: cache.delete(CATEGORY_MENU_KEY))
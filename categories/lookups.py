@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Category
+
+CATEGORY_SLUGS_KEY = "categories:slugs"
+
+
+def get_category_slugs():
+    """
+    Return `{slug: id}` for every category, cached for
+    `CATEGORY_SLUG_CACHE_TIMEOUT` seconds and dropped when categories change.
+    """
+    slugs = cache.get(CATEGORY_SLUGS_KEY)
+    if slugs is None:
+        slugs = dict(
+            Category._base_manager.exclude(slug__isnull=True).values_list("slug", "pk")
+        )
+        cache.set(CATEGORY_SLUGS_KEY, slugs, settings.CATEGORY_SLUG_CACHE_TIMEOUT)
+    return slugs
+
+
+def resolve_category_ids(values):
+    """
+    The ids of the categories whose id or slug is in `values`, so products
+    can be filtered with `category_id__in` instead of joining categories.
+    Slugs missing from the cached map (e.g. a category created by another
+    worker) are looked up in one query.
+    """
+    slugs = get_category_slugs()
+    ids = set()
+    missing = []
+    for value in map(str, values):
+        if value.isdigit():
+            ids.add(int(value))
+        if value in slugs:
+            ids.add(slugs[value])
+        elif not value.isdigit():
+            missing.append(value)
+    if missing:
+        ids.update(
+            Category._base_manager.filter(slug__in=missing).values_list("pk", flat=True)
+        )
+    return ids
+
+
+def invalidate_category_slugs():
+    # After the commit, so a concurrent read can't cache the old slugs.
+    transaction.on_commit(lambda: cache.delete(CATEGORY_SLUGS_KEY))
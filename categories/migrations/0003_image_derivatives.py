@@ -0,0 +1,21 @@
+# Generated by Django 4.2.23 on 2026-10-19 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "categories",
+            "0002_alter_category_created_by_alter_category_deleted_by_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="image_derivatives",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
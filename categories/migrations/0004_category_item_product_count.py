@@ -0,0 +1,35 @@
+# Generated by Django 4.2.23 on 2026-10-19 19:31
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_products(apps, schema_editor):
+    Category = apps.get_model("categories", "Category")
+    Product = apps.get_model("products", "Product")
+    counts = (
+        Product._base_manager.filter(category=OuterRef("pk"), is_deleted=False)
+        .order_by()
+        .values("category")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    Category._base_manager.update(item=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0003_image_derivatives"),
+        ("products", "0010_image_derivatives"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="category",
+            name="item",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_products, migrations.RunPython.noop),
+    ]
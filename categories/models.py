@@ -14,10 +14,13 @@ class Category(BaseModel):
         blank=True,
         verbose_name="Category Image",
     )  # Use ImageField for local or other image storage
-    item = models.PositiveIntegerField(default=0)
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
+    # Number of non-deleted products, kept up to date by categories.counts.
+    item = models.PositiveIntegerField(default=0, editable=False)
     num = models.PositiveIntegerField(default=0)
 
     unique_fields = ["name"]
+    derivative_fields = ["image"]
 
     class Meta:
         ordering = ["num", "name"]
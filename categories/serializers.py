@@ -1,12 +1,13 @@
 from rest_framework import serializers
 
-from core.serializers import BaseModelSerializer
+from core.serializers import BaseModelSerializer, ImageDerivativesField
 
 from .models import Category
 
 
 class CategorySerializer(BaseModelSerializer):
-    products_count = serializers.SerializerMethodField(read_only=True)
+    products_count = serializers.IntegerField(source="item", read_only=True)
+    image_derivatives = ImageDerivativesField("image")
 
     class Meta:
         model = Category
@@ -18,15 +19,10 @@ class CategorySerializer(BaseModelSerializer):
             "persantine",
             "icon",
             "image",
+            "image_derivatives",
             "item",
             "num",
             "created_at",
             "updated_at",
             "products_count",
         ]
-
-    def get_products_count(self, obj):
-        """
-        Returns the count of products in the queryset.
-        """
-        return obj.products.count()
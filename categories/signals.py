@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.images import derivatives_ready
+
+from .counts import invalidate_category_menu
+from .lookups import invalidate_category_slugs
+from .models import Category
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(derivatives_ready, sender=Category)
+def category_changed(sender, **kwargs):
+    invalidate_category_menu()
+    invalidate_category_slugs()
@@ -1 +1,93 @@
-# Create your tests here.
+from unittest import mock
+
+from django.contrib import admin
+from django.test import RequestFactory, TestCase
+
+from core.testing import APITestCase, create_product
+from products.models import Product
+from users.models import User
+
+from .models import Category
+
+
+class CategoryCountTests(TestCase):
+    def setUp(self):
+        self.kitchen = Category.objects.create(name="Kitchen")
+        self.garden = Category.objects.create(name="Garden")
+
+    def counts(self):
+        return dict(Category.objects.values_list("name", "item"))
+
+    def test_counts_follow_product_changes(self):
+        kettle = create_product(1001, category=self.kitchen)
+        create_product(1002, category=self.kitchen)
+        self.assertEqual(self.counts(), {"Kitchen": 2, "Garden": 0})
+
+        kettle.category = self.garden
+        kettle.save()
+        self.assertEqual(self.counts(), {"Kitchen": 1, "Garden": 1})
+
+        kettle.delete()
+        self.assertEqual(self.counts(), {"Kitchen": 1, "Garden": 0})
+
+    def test_admin_soft_delete_and_restore_update_the_counts(self):
+        kettle = create_product(1001, category=self.kitchen)
+        create_product(1002, category=self.garden)
+        self.client.force_login(
+            User.objects.create_superuser(
+                email="admin@example.com",
+                password="Passw0rd!x",
+                first_name="Ad",
+                last_name="Min",
+            )
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/admin/products/product/",
+                {"action": "soft_delete_selected", "_selected_action": [kettle.pk]},
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.counts(), {"Kitchen": 0, "Garden": 1})
+
+        product_admin = admin.site._registry[Product]
+        request = RequestFactory().post("/admin/products/product/")
+        with mock.patch.object(product_admin, "message_user"):
+            product_admin.restore_selected(
+                request, Product._base_manager.filter(pk=kettle.pk)
+            )
+        self.assertEqual(self.counts(), {"Kitchen": 1, "Garden": 1})
+
+
+class CategoryMenuTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.kitchen = Category.objects.create(
+            name="Kitchen", num=1, image="categories/kitchen.jpg"
+        )
+
+    def menu(self, **headers):
+        response = self.client.get("/api/category/menu/", **headers)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_menu_is_cached_until_a_count_changes(self):
+        self.menu()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.menu()[0]["products_count"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_product(1001, category=self.kitchen)
+        self.assertEqual(self.menu()[0]["products_count"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name="Garden", num=2)
+        self.assertEqual([row["name"] for row in self.menu()], ["Kitchen", "Garden"])
+
+    def test_urls_are_absolute_to_each_request(self):
+        self.assertEqual(
+            self.menu()[0]["image"], "http://testserver/media/categories/kitchen.jpg"
+        )
+        self.assertEqual(
+            self.menu(HTTP_HOST="shop.example.com")[0]["image"],
+            "http://shop.example.com/media/categories/kitchen.jpg",
+        )
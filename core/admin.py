@@ -1,17 +1,93 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
 from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.utils.html import format_html
 from unfold.admin import ModelAdmin
+from unfold.contrib.filters.admin import ValueMixin
 
 from .models import APIKey
+from .pagination import EstimatedCountPaginator
 
 # Register the default Django Group model with the django-unfold GroupAdmin
 admin.site.unregister(Group)
 admin.site.register(Group, ModelAdmin)
 
 
+class AutocompleteFilterForm(forms.Form):
+    def __init__(self, name, label, field, admin_site, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields[name] = forms.ModelChoiceField(
+            label=label,
+            required=False,
+            queryset=field.remote_field.model._default_manager.all(),
+            widget=AutocompleteSelect(field, admin_site),
+        )
+
+    class Media:
+        js = (
+            "admin/js/vendor/jquery/jquery.js",
+            "admin/js/vendor/select2/select2.full.js",
+            "admin/js/jquery.init.js",
+            "admin/js/autocomplete.js",
+        )
+        css = {
+            "screen": (
+                "admin/css/vendor/select2/select2.css",
+                "admin/css/autocomplete.css",
+            ),
+        }
+
+
+class AutocompleteFilter(ValueMixin, admin.FieldListFilter):
+    """
+    Filter on a foreign key picked with the admin autocomplete widget, so the
+    sidebar only loads the selected object instead of the whole related
+    table. The related model's admin must define `search_fields`, and the
+    model admin `list_filter_submit = True`.
+    """
+
+    template = "unfold/filters/filters_field.html"
+    form_class = AutocompleteFilterForm
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = f"{field_path}__{field.target_field.attname}__exact"
+        self.lookup_val = params.get(self.lookup_kwarg)
+        self.admin_site = model_admin.admin_site
+        super().__init__(field, request, params, model, model_admin, field_path)
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        value = self.value()
+        try:
+            self.field.target_field.to_python(value)
+        except ValidationError:
+            value = None
+        return (
+            {
+                "form": self.form_class(
+                    name=self.lookup_kwarg,
+                    label=f"By {self.title}",
+                    field=self.field,
+                    admin_site=self.admin_site,
+                    data={self.lookup_kwarg: value},
+                ),
+            },
+        )
+
+
 class SoftDeleteAdmin(admin.ModelAdmin):
+    # Big tables show an estimated count, and filtered changelists skip the
+    # second COUNT(*) of the whole table.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     # Display only non-deleted objects in the list view by default
     def get_queryset(self, request):
@@ -30,9 +106,14 @@ class SoftDeleteAdmin(admin.ModelAdmin):
 
     is_deleted_display.short_description = "Status"
 
+    def perform_bulk_update(self, queryset, **changes):
+        # `update` sends no signals; override to update derived data.
+        return queryset.update(**changes)
+
     def soft_delete_selected(self, request, queryset):
         """Soft delete selected objects."""
-        updated_count = queryset.update(
+        updated_count = self.perform_bulk_update(
+            queryset,
             is_deleted=True,
             status="inactive",
             deleted_at=timezone.now(),
@@ -45,8 +126,8 @@ class SoftDeleteAdmin(admin.ModelAdmin):
     # Adding action to restore soft-deleted records
     def restore_selected(self, request, queryset):
         # Ensure only soft-deleted records are restored
-        restored_count = queryset.filter(is_deleted=True).update(
-            is_deleted=False, deleted_at=None
+        restored_count = self.perform_bulk_update(
+            queryset.filter(is_deleted=True), is_deleted=False, deleted_at=None
         )
         self.message_user(request, f"{restored_count} record(s) restored successfully!")
 
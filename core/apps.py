@@ -6,6 +6,7 @@ class CoreConfig(AppConfig):
     name = "core"
 
     def ready(self):
+        from . import checks, signals  # noqa: F401
         from .extensions import APIKeyAuthScheme
 
         print(APIKeyAuthScheme)
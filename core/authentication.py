@@ -1,11 +1,41 @@
 # hosapp/authentication.py
+import hashlib
+
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
+from core.metrics import api_key_cache_requests_total
 from core.models import APIKey
 
 
+def api_key_cache_key(key):
+    return f"api_key:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def get_active_api_key(key):
+    """
+    Return the active `APIKey` matching `key`, or None. Valid keys are cached
+    for `API_KEY_CACHE_TIMEOUT` seconds so the middleware and the
+    authentication class don't query the table on every request. Saving or
+    deleting a key drops it from the cache, which reaches every worker only
+    with a shared cache (`CACHE_URL`).
+    """
+    cache_key = api_key_cache_key(key)
+    api_key = cache.get(cache_key)
+    if api_key is not None:
+        api_key_cache_requests_total.inc(result="hit")
+        return api_key
+
+    api_key_cache_requests_total.inc(result="miss")
+    api_key = APIKey.objects.filter(key=key, is_active=True).first()
+    if api_key is not None:
+        cache.set(cache_key, api_key, timeout=settings.API_KEY_CACHE_TIMEOUT)
+    return api_key
+
+
 class APIKeyAuthentication(BaseAuthentication):
     keyword = "X-API-KEY"
 
@@ -14,8 +44,6 @@ class APIKeyAuthentication(BaseAuthentication):
         if not api_key:
             return None
 
-        try:
-            APIKey.objects.get(key=api_key, is_active=True)
-        except APIKey.DoesNotExist:
+        if get_active_api_key(api_key) is None:
             raise AuthenticationFailed("Invalid or inactive API key.")
         return (AnonymousUser(), api_key)
@@ -0,0 +1,134 @@
+import os
+import threading
+
+import psycopg2.extras
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+from psycopg2 import pool
+from psycopg2.extensions import TRANSACTION_STATUS_UNKNOWN
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class BlockingConnectionPool(pool.ThreadedConnectionPool):
+    """
+    Thread-safe pool that waits up to `timeout` seconds for a connection to be
+    returned instead of failing immediately once `maxconn` are checked out.
+    """
+
+    def __init__(self, minconn, maxconn, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(maxconn)
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def getconn(self, key=None):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise pool.PoolError(
+                "Timed out waiting for a database connection from the pool."
+            )
+        try:
+            return super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._slots.release()
+
+
+def get_pool(alias, conn_params, options):
+    # Pools are keyed by pid as well, so a worker forked from a process that
+    # already opened connections never shares their sockets.
+    pool_key = (os.getpid(), alias)
+    with _pools_lock:
+        connection_pool = _pools.get(pool_key)
+        if connection_pool is None:
+            connection_pool = _pools[pool_key] = BlockingConnectionPool(
+                options.get("min_size", 0),
+                options.get("max_size", 10),
+                timeout=options.get("timeout", 10),
+                **conn_params,
+            )
+        return connection_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL backend that checks connections out of an in-process pool and
+    returns them when Django closes the connection, so connections outlive the
+    requests using them even with `CONN_MAX_AGE = 0`.
+
+    Configured through `OPTIONS["pool"]`: `min_size`, `max_size`, `timeout`
+    (seconds to wait for a free connection) and `pre_ping` (run `SELECT 1` on
+    checkout and replace connections the server has dropped).
+    """
+
+    def get_connection_params(self):
+        options = self.settings_dict["OPTIONS"]
+        pool_options = options.pop("pool", None)
+        try:
+            conn_params = super().get_connection_params()
+        finally:
+            if pool_options is not None:
+                options["pool"] = pool_options
+        return conn_params
+
+    @property
+    def pool_options(self):
+        options = self.settings_dict["OPTIONS"].get("pool") or {}
+        if not isinstance(options, dict):
+            raise ImproperlyConfigured("OPTIONS['pool'] must be a dictionary.")
+        return options
+
+    def _checkout(self, connection_pool):
+        connection = connection_pool.getconn()
+        if connection.closed:
+            connection_pool.putconn(connection, close=True)
+            return connection_pool.getconn()
+        if self.pool_options.get("pre_ping", True):
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                connection.rollback()
+            except psycopg2.Error:
+                connection_pool.putconn(connection, close=True)
+                return connection_pool.getconn()
+        return connection
+
+    def get_new_connection(self, conn_params):
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = base.IsolationLevel(
+                options.get("isolation_level", base.IsolationLevel.READ_COMMITTED)
+            )
+        except ValueError:
+            raise ImproperlyConfigured(
+                f"Invalid transaction isolation level {options['isolation_level']} "
+                f"specified. Use one of the psycopg.IsolationLevel values."
+            )
+
+        self._pool = get_pool(self.alias, conn_params, self.pool_options)
+        connection = self._checkout(self._pool)
+        if "isolation_level" in options:
+            connection.isolation_level = self.isolation_level
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        # The pool rolls back unfinished transactions and discards connections
+        # in an unknown state; connections that errored are dropped as well.
+        discard = (
+            self.connection.closed
+            or self.connection.info.transaction_status == TRANSACTION_STATUS_UNKNOWN
+            or (self.errors_occurred and not self.is_usable())
+        )
+        with self.wrap_database_errors:
+            self._pool.putconn(self.connection, close=discard)
@@ -0,0 +1,102 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import close_old_connections, connections
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core.models import APIKey
+
+
+def percentile(sorted_values, quantile):
+    if not sorted_values:
+        return 0.0
+    index = min(int(quantile * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed):
+    """Summarize request latencies (in seconds) measured over `elapsed` seconds."""
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        "requests": count,
+        "elapsed_s": round(elapsed, 3),
+        "req_per_s": round(count / elapsed, 1) if elapsed else 0.0,
+        "avg_ms": round(sum(latencies) / count * 1000, 2) if count else 0.0,
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if count else 0.0,
+    }
+
+
+@contextmanager
+def temporary_api_key(name="benchmark"):
+    """Yield an API key that is deleted when the block exits."""
+    api_key = APIKey.objects.create(name=name)
+    try:
+        yield api_key.key
+    finally:
+        api_key.delete()
+
+
+@contextmanager
+def benchmark_client(name="benchmark"):
+    """
+    Yield a test client authenticated with a temporary API key. Emails are
+    captured in memory while the block runs.
+    """
+    setup_test_environment()
+    try:
+        with temporary_api_key(name) as key:
+            yield Client(HTTP_X_API_KEY=key)
+    finally:
+        teardown_test_environment()
+
+
+def run_concurrently(func, requests, threads):
+    """
+    Call `func(client)` `requests` times spread over `threads` threads, each
+    thread with its own client, and return `(latencies, statuses, elapsed)`.
+    """
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker(client):
+        try:
+            while True:
+                with lock:
+                    if next(counter, None) is None:
+                        return
+                started_at = time.perf_counter()
+                response = func(client)
+                # The test client disconnects Django's end-of-request
+                # connection handling, so apply CONN_MAX_AGE here instead.
+                close_old_connections()
+                latency = time.perf_counter() - started_at
+                with lock:
+                    latencies.append(latency)
+                    statuses[response.status_code] = (
+                        statuses.get(response.status_code, 0) + 1
+                    )
+        finally:
+            connections.close_all()
+
+    with benchmark_client() as client:
+        headers = client.defaults
+        pool = [
+            threading.Thread(target=worker, args=(Client(**headers),))
+            for _ in range(threads)
+        ]
+        started_at = time.perf_counter()
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - started_at
+
+    return latencies, statuses, elapsed
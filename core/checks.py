@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+
+# Cached lookups that are cleared when their source changes. A cleared
+# entry is only gone from every worker when the default cache is shared.
+INVALIDATED_CACHE_TIMEOUTS = [
+    "API_KEY_CACHE_TIMEOUT",
+    "ORDER_TRACKING_CACHE_TIMEOUT",
+    "BANNER_CACHE_TIMEOUT",
+    "CATEGORY_SLUG_CACHE_TIMEOUT",
+    "CATEGORY_MENU_CACHE_TIMEOUT",
+]
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if not isinstance(caches["default"], LocMemCache):
+        return []
+    stale = [name for name in INVALIDATED_CACHE_TIMEOUTS if getattr(settings, name)]
+    if not stale:
+        return []
+    return [
+        Warning(
+            "The default cache is per process, so changes only clear cached "
+            "entries in the worker that made them.",
+            hint=(
+                "Set CACHE_URL to a shared cache, or set these to 0 to "
+                f"disable the caches: {', '.join(stale)}."
+            ),
+            id="core.W001",
+        )
+    ]
+
+
+@register(deploy=True)
+def check_metrics_token(app_configs, **kwargs):
+    if settings.METRICS_AUTH_TOKEN:
+        return []
+    return [
+        Warning(
+            "/api/metrics/ refuses every scrape without a token.",
+            hint="Set METRICS_AUTH_TOKEN and send it as a bearer token.",
+            id="core.W002",
+        )
+    ]
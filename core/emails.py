@@ -0,0 +1,26 @@
+import os
+
+from django.core.mail import EmailMultiAlternatives
+from django.template.loader import render_to_string
+
+from .metrics import email_queue_depth
+from .tasks import TaskQueue
+
+email_queue = TaskQueue("email", depth_gauge=email_queue_depth)
+
+
+def send_templated_email(subject, template, context, to):
+    """Render `template` with `context` and send it as an HTML email."""
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body="",
+        from_email=os.environ.get("EMAIL_HOST_USER"),
+        to=to,
+    )
+    message.attach_alternative(render_to_string(template, context), "text/html")
+    message.send(fail_silently=False)
+
+
+def queue_templated_email(subject, template, context, to):
+    """Send the email in the background once the transaction commits."""
+    email_queue.enqueue(send_templated_email, subject, template, context, to)
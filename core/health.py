@@ -0,0 +1,132 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="health-probe")
+_lock = threading.Lock()
+_in_flight = {}
+_last_result = None
+_last_checked_at = 0.0
+
+
+def probe_database(timeout):
+    """
+    Run `SELECT 1` on the calling thread's connection, the one its requests
+    use. Connections are per thread, so this can't run on the probe pool;
+    PostgreSQL bounds it with a statement timeout and `DB_CONNECT_TIMEOUT`
+    instead.
+    """
+    connection.close_if_unusable_or_obsolete()
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Reset when the transaction ends.
+                cursor.execute(f"SET LOCAL statement_timeout = {int(timeout * 1000)}")
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    except Exception:
+        # Drop the broken connection so the next request reconnects.
+        connection.close()
+        raise
+
+
+def probe_cache():
+    key = f"health-check:{os.getpid()}"
+    value = uuid.uuid4().hex
+    cache.set(key, value, timeout=30)
+    if cache.get(key) != value:
+        raise RuntimeError("Cache returned a different value than was written.")
+
+
+def probe_storage():
+    default_storage.exists(settings.HEALTH_CHECK_STORAGE_PATH)
+
+
+def get_probes():
+    probes = {"cache": probe_cache}
+    if settings.HEALTH_CHECK_STORAGE:
+        probes["storage"] = probe_storage
+    return probes
+
+
+def _timed(probe):
+    started_at = time.perf_counter()
+    probe()
+    return time.perf_counter() - started_at
+
+
+def _submit(name, probe):
+    # A probe still stuck from a previous check is not submitted again, so a
+    # hanging dependency can't exhaust the probe threads.
+    future = _in_flight.get(name)
+    if future is None or future.done():
+        future = _in_flight[name] = _executor.submit(_timed, probe)
+    return future
+
+
+def check_database():
+    timeout = settings.HEALTH_CHECK_TIMEOUTS["database"]
+    started_at = time.perf_counter()
+    try:
+        latency = _timed(lambda: probe_database(timeout))
+    except Exception:
+        if time.perf_counter() - started_at >= timeout:
+            return {"status": "timeout", "timeout_ms": timeout * 1000}
+        logger.exception("Health check of the database failed")
+        return {"status": "error"}
+    return {"status": "ok", "latency_ms": round(latency * 1000, 2)}
+
+
+def run_checks():
+    """
+    Probe the database on the calling thread while the other dependencies
+    are probed concurrently, each bounded by its own timeout from
+    `HEALTH_CHECK_TIMEOUTS`, and return the per-dependency status and
+    latency.
+    """
+    started_at = time.perf_counter()
+    futures = {name: _submit(name, probe) for name, probe in get_probes().items()}
+
+    checks = {"database": check_database()}
+    for name, future in futures.items():
+        timeout = settings.HEALTH_CHECK_TIMEOUTS.get(name, 2.0)
+        remaining = max(timeout - (time.perf_counter() - started_at), 0)
+        try:
+            latency = future.result(timeout=remaining)
+            checks[name] = {"status": "ok", "latency_ms": round(latency * 1000, 2)}
+        except FutureTimeoutError:
+            checks[name] = {"status": "timeout", "timeout_ms": timeout * 1000}
+        except Exception:
+            # Errors can name hosts or credentials; they are only logged.
+            logger.exception("Health check of %s failed", name)
+            checks[name] = {"status": "error"}
+
+    ready = all(check["status"] == "ok" for check in checks.values())
+    return {"status": "ready" if ready else "unavailable", "checks": checks}
+
+
+def get_readiness():
+    """
+    Return the readiness result, re-running the probes at most once per
+    `HEALTH_CHECK_CACHE_SECONDS` so frequent probes don't add load.
+    """
+    global _last_result, _last_checked_at
+
+    with _lock:
+        age = time.monotonic() - _last_checked_at
+        if _last_result is None or age >= settings.HEALTH_CHECK_CACHE_SECONDS:
+            _last_result = run_checks()
+            _last_checked_at = time.monotonic()
+            age = 0.0
+        return {**_last_result, "age_ms": round(age * 1000, 2)}
@@ -0,0 +1,231 @@
+import hashlib
+import hmac
+import os
+import secrets
+import string
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils.crypto import salted_hmac
+
+from .models import IdBlock
+
+UPPER_ALPHANUMERIC = string.ascii_uppercase + string.digits
+LOWER_ALPHANUMERIC = string.ascii_lowercase + string.digits
+
+
+def encode(value, alphabet, length=None):
+    """Encode a non-negative integer in `alphabet`, left-padded to `length`."""
+    base = len(alphabet)
+    chars = []
+    while value:
+        value, digit = divmod(value, base)
+        chars.append(alphabet[digit])
+    encoded = "".join(reversed(chars)) or alphabet[0]
+    return encoded.rjust(length or 0, alphabet[0])
+
+
+class PendingBlock:
+    """A block reserved inside a transaction that hasn't committed yet."""
+
+    def __init__(self, allocator, start, end):
+        self.allocator = allocator
+        self.next = start
+        self.end = end
+        transaction.on_commit(self.commit)
+
+    def is_open(self):
+        # Django forgets the on-commit callbacks of a rolled back transaction
+        # or savepoint, which also undid the reservation.
+        return any(func == self.commit for _, func, _ in connection.run_on_commit)
+
+    def commit(self):
+        self.allocator.committed(self)
+
+
+class BlockAllocator:
+    """
+    Hands out consecutive integers of the `name` counter from blocks of
+    `block_size` reserved in `IdBlock`, so only one query in `block_size`
+    touches the database. Values unused when a process exits are skipped.
+
+    A block reserved inside a transaction is reserved on the caller's
+    connection, and only that transaction uses it until it commits. A
+    rollback undoes the reservation along with the rows that used its
+    values, which are then handed out again.
+    """
+
+    def __init__(self, name, block_size=100):
+        self.name = name
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = self._end = 0
+        self._pid = None
+        self._local = threading.local()
+
+    def reserve(self):
+        """Reserve the next block and return its `(start, end)`."""
+        blocks = IdBlock.objects.filter(name=self.name)
+        with transaction.atomic():
+            if not blocks.update(next_value=F("next_value") + self.block_size):
+                IdBlock.objects.get_or_create(name=self.name)
+                blocks.update(next_value=F("next_value") + self.block_size)
+            end = blocks.values_list("next_value", flat=True).get()
+        return end - self.block_size, end
+
+    def next(self):
+        with self._lock:
+            # A forked process must not reuse its parent's block.
+            if self._pid != os.getpid():
+                self._next = self._end = 0
+                self._pid = os.getpid()
+            if self._next >= self._end and not connection.in_atomic_block:
+                self._next, self._end = self.reserve()
+            if self._next < self._end:
+                value = self._next
+                self._next += 1
+                return value
+        return self._next_pending()
+
+    def _next_pending(self):
+        block = getattr(self._local, "block", None)
+        if block is None or block.next >= block.end or not block.is_open():
+            block = self._local.block = PendingBlock(self, *self.reserve())
+        value = block.next
+        block.next += 1
+        return value
+
+    def committed(self, block):
+        if getattr(self._local, "block", None) is block:
+            self._local.block = None
+        # What is left of the block can now be used by every thread.
+        with self._lock:
+            if self._next >= self._end and self._pid == os.getpid():
+                self._next, self._end = block.next, block.end
+
+
+class SequenceStrategy:
+    """
+    Fixed-length IDs from a `BlockAllocator` counter, shuffled by a Feistel
+    permutation of the ID space keyed with `SECRET_KEY`, so they never
+    collide and, without the key, don't reveal each other or how many were
+    issued. Changing `SECRET_KEY` changes the permutation; the few IDs that
+    then collide with old ones are left to the unique constraint.
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, name, length=12, alphabet=UPPER_ALPHANUMERIC, block_size=100):
+        self.length = length
+        self.alphabet = alphabet
+        self.space = len(alphabet) ** length
+        self.allocator = BlockAllocator(name, block_size)
+        # The smallest even number of bits covering the space, split in two.
+        self.half_bits = ((self.space - 1).bit_length() + 1) // 2
+        self.half_mask = (1 << self.half_bits) - 1
+        self.key = salted_hmac(f"core.ids.{name}", "sequence").digest()
+
+    def round_value(self, index, half):
+        message = index.to_bytes(1, "big") + half.to_bytes(16, "big")
+        digest = hmac.new(self.key, message, hashlib.sha256).digest()
+        return int.from_bytes(digest[:16], "big") & self.half_mask
+
+    def permute(self, value):
+        # Values that leave the space are permuted again (cycle walking),
+        # which keeps the result a bijection of the space itself.
+        while True:
+            left, right = value >> self.half_bits, value & self.half_mask
+            for index in range(self.ROUNDS):
+                left, right = right, left ^ self.round_value(index, right)
+            value = (left << self.half_bits) | right
+            if value < self.space:
+                return value
+
+    def generate(self):
+        value = self.allocator.next() % self.space
+        return encode(self.permute(value), self.alphabet, self.length)
+
+
+class TimeOrderedStrategy:
+    """
+    IDs that sort by creation time: milliseconds since the epoch followed by
+    `random_length` random characters, incremented within one millisecond.
+    """
+
+    def __init__(self, name, alphabet=LOWER_ALPHANUMERIC, random_length=4):
+        self.alphabet = alphabet
+        self.random_length = random_length
+        self.random_space = len(alphabet) ** random_length
+        self._lock = threading.Lock()
+        self._last = (0, 0)
+
+    def generate(self):
+        with self._lock:
+            millis = time.time_ns() // 1_000_000
+            last_millis, last_random = self._last
+            if millis <= last_millis:
+                millis, random = last_millis, last_random + 1
+                if random >= self.random_space:
+                    millis, random = millis + 1, secrets.randbelow(self.random_space)
+            else:
+                random = secrets.randbelow(self.random_space)
+            self._last = (millis, random)
+        return encode(millis, self.alphabet) + encode(
+            random, self.alphabet, self.random_length
+        )
+
+
+class RandomStrategy:
+    """Random IDs; rare collisions are left to the unique constraint."""
+
+    def __init__(self, name, length=12, alphabet=UPPER_ALPHANUMERIC):
+        self.length = length
+        self.alphabet = alphabet
+
+    def generate(self):
+        return "".join(secrets.choice(self.alphabet) for _ in range(self.length))
+
+
+STRATEGIES = {
+    "sequence": SequenceStrategy,
+    "time": TimeOrderedStrategy,
+    "random": RandomStrategy,
+}
+
+_generators = {}
+_generators_lock = threading.Lock()
+
+
+def get_generator(name):
+    """Return the strategy configured for `name` in `ID_STRATEGIES`."""
+    generator = _generators.get(name)
+    if generator is None:
+        with _generators_lock:
+            generator = _generators.get(name)
+            if generator is None:
+                options = dict(settings.ID_STRATEGIES[name])
+                strategy = STRATEGIES[options.pop("strategy")]
+                generator = _generators[name] = strategy(name, **options)
+    return generator
+
+
+def generate_id(name):
+    return get_generator(name).generate()
+
+
+def save_with_unique_id(save, assign, field, attempts=5):
+    """
+    Call `assign()` to set a new ID, then `save()`; when the insert hits the
+    unique constraint on `field`, assign another ID and try again.
+    """
+    for attempt in range(attempts):
+        assign()
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError as e:
+            if field not in str(e) or attempt == attempts - 1:
+                raise
@@ -0,0 +1,215 @@
+import io
+import logging
+import posixpath
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.dispatch import Signal
+from django.utils.crypto import md5
+from PIL import Image, ImageOps
+
+from .tasks import TaskQueue
+
+logger = logging.getLogger(__name__)
+
+image_queue = TaskQueue("image-derivatives")
+
+# Sent with `sender=<model>` and `pk` once an image's derivatives are saved.
+derivatives_ready = Signal()
+
+
+def derivatives_field(field_name):
+    return f"{field_name}_derivatives"
+
+
+def derivative_models():
+    """Models whose `derivative_fields` list image fields to process."""
+    return [
+        model
+        for model in apps.get_models()
+        if getattr(model, "derivative_fields", None)
+    ]
+
+
+def is_current(derivatives, name):
+    return bool(derivatives) and derivatives.get("source") == name
+
+
+def available_formats():
+    Image.init()
+    formats = []
+    for file_format in settings.IMAGE_DERIVATIVE_FORMATS:
+        if file_format.upper() in Image.SAVE:
+            formats.append(file_format)
+        else:
+            logger.warning("Pillow can't write %s images; skipped", file_format)
+    return formats
+
+
+def save_derivative(storage, name, suffix, image, file_format):
+    """
+    Save `image` next to `name` with a hash of its content in the name, as
+    ManifestStaticFilesStorage does, so it can be cached as immutable.
+    """
+    buffer = io.BytesIO()
+    image.save(
+        buffer,
+        format=file_format.upper(),
+        quality=settings.IMAGE_DERIVATIVE_QUALITY,
+    )
+    content = buffer.getvalue()
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    content_hash = md5(content, usedforsecurity=False).hexdigest()[:12]
+    return storage.save(
+        posixpath.join(
+            "derivatives", directory, f"{stem}-{suffix}.{content_hash}.{file_format}"
+        ),
+        ContentFile(content),
+    )
+
+
+def render_derivatives(file):
+    """
+    Save a square thumbnail and one copy per `IMAGE_DERIVATIVE_WIDTHS` width
+    (never upscaled) of the image `file` in each of `IMAGE_DERIVATIVE_FORMATS`
+    next to it in its storage, and return their names.
+    """
+    storage = file.storage
+    formats = available_formats()
+    widths = sorted(settings.IMAGE_DERIVATIVE_WIDTHS, reverse=True)
+    thumbnail_size = settings.IMAGE_THUMBNAIL_SIZE
+    with file.open("rb"), Image.open(file) as original:
+        # JPEGs are decoded at a reduced scale when that's still big enough.
+        original.draft("RGB", (widths[0], widths[0]))
+        image = ImageOps.exif_transpose(original)
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    source_width, source_height = image.size
+    derivatives = {
+        "source": file.name,
+        "width": source_width,
+        "height": source_height,
+        "thumbnail": {},
+        "widths": {file_format: {} for file_format in formats},
+    }
+    thumbnail = ImageOps.fit(image, (thumbnail_size, thumbnail_size), Image.LANCZOS)
+    for file_format in formats:
+        derivatives["thumbnail"][file_format] = save_derivative(
+            storage, file.name, "thumb", thumbnail, file_format
+        )
+
+    # Widest first, each scaled down from the previous one, which is cheaper
+    # than scaling the full-size image every time.
+    targets = [width for width in widths if width < source_width]
+    if source_width <= widths[0]:
+        targets.insert(0, source_width)
+    for width in targets:
+        if width < image.width:
+            height = max(1, round(source_height * width / source_width))
+            image = image.resize((width, height), Image.LANCZOS)
+        for file_format in formats:
+            derivatives["widths"][file_format][str(width)] = save_derivative(
+                storage, file.name, f"{width}w", image, file_format
+            )
+    return derivatives
+
+
+def derivative_names(derivatives):
+    names = list((derivatives or {}).get("thumbnail", {}).values())
+    for by_width in (derivatives or {}).get("widths", {}).values():
+        names.extend(by_width.values())
+    return names
+
+
+def delete_derivatives(storage, names):
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception:
+            logger.warning("Couldn't delete image derivative %s", name, exc_info=True)
+
+
+def generate_derivatives(model_label, pk, field_name, force=False):
+    """
+    Bring the derivatives of `field_name` on the object up to date with its
+    image. Returns True when they were (re)generated.
+    """
+    model = apps.get_model(model_label)
+    instance = model._base_manager.filter(pk=pk).first()
+    if instance is None:
+        return False
+    file = getattr(instance, field_name)
+    data_field = derivatives_field(field_name)
+    previous = getattr(instance, data_field)
+    if not force and (is_current(previous, file.name) or not (file or previous)):
+        return False
+
+    derivatives = {}
+    if file:
+        try:
+            derivatives = render_derivatives(file)
+        except Exception as e:
+            # Recorded so the same broken file isn't retried on every save.
+            logger.exception("Couldn't process image %s", file.name)
+            derivatives = {"source": file.name, "error": str(e)}
+
+    # The image may have been replaced meanwhile; that save queued its own task.
+    updated = model._base_manager.filter(pk=pk, **{field_name: file.name}).update(
+        **{data_field: derivatives}
+    )
+    if updated:
+        stale = set(derivative_names(previous)) - set(derivative_names(derivatives))
+    else:
+        stale = derivative_names(derivatives)
+    delete_derivatives(file.storage, stale)
+    if updated:
+        derivatives_ready.send(sender=model, pk=pk, field_name=field_name)
+    return bool(updated)
+
+
+def schedule_derivatives(instance):
+    """Queue the images of `instance` whose derivatives are out of date."""
+    for field_name in instance.derivative_fields:
+        file = getattr(instance, field_name)
+        derivatives = getattr(instance, derivatives_field(field_name))
+        if is_current(derivatives, file.name) or not (file or derivatives):
+            continue
+        image_queue.enqueue(
+            generate_derivatives, instance._meta.label, instance.pk, field_name
+        )
+
+
+def derivative_urls(derivatives, storage, build_url=None):
+    """
+    The public representation of `derivatives`: the thumbnail URL and a
+    `srcset` per format, plus each width's URL.
+    """
+    if not derivatives or "widths" not in derivatives:
+        return None
+    build_url = build_url or (lambda url: url)
+
+    def url(name):
+        return build_url(storage.url(name))
+
+    widths = {
+        file_format: {int(width): url(name) for width, name in by_width.items()}
+        for file_format, by_width in derivatives["widths"].items()
+    }
+    return {
+        "width": derivatives["width"],
+        "height": derivatives["height"],
+        "thumbnail": {
+            file_format: url(name)
+            for file_format, name in derivatives["thumbnail"].items()
+        },
+        "widths": widths,
+        "srcset": {
+            file_format: ", ".join(
+                f"{image_url} {width}w" for width, image_url in sorted(by_width.items())
+            )
+            for file_format, by_width in widths.items()
+        },
+    }
@@ -0,0 +1,228 @@
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+# Upper bounds (in milliseconds) of the latency histogram buckets.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_request_state = threading.local()
+
+
+class RequestMetrics:
+    """
+    Collects SQL queries and named timings for a single request.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+        self.timings = {}
+        self._depth = Counter()
+
+    def record_query(self, sql, duration):
+        self.query_count += 1
+        self.db_time += duration
+        self.statements[sql] += 1
+
+    def add_timing(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    @property
+    def duplicate_query_count(self):
+        """Number of queries that repeated an already executed statement."""
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def most_duplicated(self):
+        """Return `(count, sql)` for the most repeated statement, if any."""
+        if not self.statements:
+            return None
+        sql, count = self.statements.most_common(1)[0]
+        return (count, sql) if count > 1 else None
+
+    def elapsed(self):
+        return time.perf_counter() - self.started_at
+
+    def server_timing(self, total):
+        """Format the collected metrics as a `Server-Timing` header value."""
+        entries = [
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.query_count} queries, '
+            f'{self.duplicate_query_count} duplicate"'
+        ]
+        for name in ("serialize", "render"):
+            if name in self.timings:
+                entries.append(f"{name};dur={self.timings[name] * 1000:.2f}")
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+class QueryCollector:
+    """Database execute wrapper feeding executed statements into `RequestMetrics`."""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.metrics.record_query(sql, time.perf_counter() - start)
+
+
+def get_request_metrics():
+    return getattr(_request_state, "metrics", None)
+
+
+@contextmanager
+def instrument_request():
+    """
+    Collect queries from every configured database connection for the
+    duration of the block.
+    """
+    metrics = RequestMetrics()
+    _request_state.metrics = metrics
+    collector = QueryCollector(metrics)
+    try:
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(collector))
+            yield metrics
+    finally:
+        _request_state.metrics = None
+
+
+@contextmanager
+def timed(name):
+    """
+    Add the time spent in the block to the current request's `name` timing.
+    Nested blocks with the same name are only counted once.
+    """
+    metrics = get_request_metrics()
+    if metrics is None:
+        yield
+        return
+
+    metrics._depth[name] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._depth[name] -= 1
+        if metrics._depth[name] == 0:
+            metrics.add_timing(name, time.perf_counter() - start)
+
+
+class EndpointStats:
+    """
+    In-process aggregation of request metrics per endpoint.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, metrics, total):
+        total_ms = total * 1000
+        bucket = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS_MS) if total_ms <= bound),
+            len(LATENCY_BUCKETS_MS),
+        )
+        duplicates = metrics.duplicate_query_count
+        most_duplicated = metrics.most_duplicated()
+
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = {
+                    "count": 0,
+                    "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "queries": 0,
+                    "max_queries": 0,
+                    "duplicate_queries": 0,
+                    "requests_with_duplicates": 0,
+                    "worst_duplicate": None,
+                    "db_ms": 0.0,
+                    "serialize_ms": 0.0,
+                    "render_ms": 0.0,
+                }
+            stats["count"] += 1
+            stats["buckets"][bucket] += 1
+            stats["total_ms"] += total_ms
+            stats["max_ms"] = max(stats["max_ms"], total_ms)
+            stats["queries"] += metrics.query_count
+            stats["max_queries"] = max(stats["max_queries"], metrics.query_count)
+            stats["duplicate_queries"] += duplicates
+            stats["db_ms"] += metrics.db_time * 1000
+            stats["serialize_ms"] += metrics.timings.get("serialize", 0.0) * 1000
+            stats["render_ms"] += metrics.timings.get("render", 0.0) * 1000
+            if duplicates:
+                stats["requests_with_duplicates"] += 1
+                worst = stats["worst_duplicate"]
+                if most_duplicated and (worst is None or most_duplicated[0] > worst[0]):
+                    stats["worst_duplicate"] = (
+                        most_duplicated[0],
+                        most_duplicated[1][:500],
+                    )
+
+    def _percentile(self, stats, quantile):
+        threshold = quantile * stats["count"]
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, stats["buckets"]):
+            cumulative += count
+            if cumulative >= threshold:
+                return min(bound, round(stats["max_ms"], 2))
+        return round(stats["max_ms"], 2)
+
+    def snapshot(self):
+        """Return a JSON-serializable summary of every recorded endpoint."""
+        with self._lock:
+            endpoints = {name: dict(stats) for name, stats in self._endpoints.items()}
+
+        summary = {}
+        for name, stats in sorted(endpoints.items()):
+            count = stats["count"]
+            worst = stats["worst_duplicate"]
+            summary[name] = {
+                "count": count,
+                "latency_ms": {
+                    "avg": round(stats["total_ms"] / count, 2),
+                    "p50": self._percentile(stats, 0.5),
+                    "p95": self._percentile(stats, 0.95),
+                    "p99": self._percentile(stats, 0.99),
+                    "max": round(stats["max_ms"], 2),
+                },
+                "latency_histogram": {
+                    **{
+                        f"le_{bound}": stats["buckets"][i]
+                        for i, bound in enumerate(LATENCY_BUCKETS_MS)
+                    },
+                    "le_inf": stats["buckets"][-1],
+                },
+                "queries": {
+                    "avg": round(stats["queries"] / count, 2),
+                    "max": stats["max_queries"],
+                    "avg_duplicates": round(stats["duplicate_queries"] / count, 2),
+                    "requests_with_duplicates": stats["requests_with_duplicates"],
+                    "worst_duplicate": (
+                        {"count": worst[0], "sql": worst[1]} if worst else None
+                    ),
+                },
+                "avg_db_ms": round(stats["db_ms"] / count, 2),
+                "avg_serialize_ms": round(stats["serialize_ms"] / count, 2),
+                "avg_render_ms": round(stats["render_ms"] / count, 2),
+            }
+        return summary
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+endpoint_stats = EndpointStats()
@@ -0,0 +1,79 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+
+
+class LookupCache:
+    """
+    Per-process LRU mapping `(model, field, value)` to a primary key, so
+    repeated slug and UUID lookups become primary key fetches.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._keys_by_object = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            pk = self._entries.get(key)
+            if pk is not None:
+                self._entries.move_to_end(key)
+            return pk
+
+    def set(self, key, pk):
+        with self._lock:
+            self._entries[key] = pk
+            self._entries.move_to_end(key)
+            self._keys_by_object.setdefault((key[0], pk), set()).add(key)
+            if len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def discard(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        pk = self._entries.pop(key, None)
+        keys = self._keys_by_object.get((key[0], pk))
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_object[(key[0], pk)]
+
+    def invalidate(self, instance):
+        """Forget every lookup that resolved to `instance`."""
+        with self._lock:
+            keys = self._keys_by_object.get((instance._meta.label, instance.pk), ())
+            for key in list(keys):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_object.clear()
+
+
+lookup_cache = LookupCache(settings.LOOKUP_CACHE_SIZE)
+
+
+def get_object_by_lookup(queryset, field, value):
+    """
+    `get_object_or_404(queryset, **{field: value})`, fetching by primary key
+    when `lookup_cache` knows it. The object found is checked against
+    `value`, so an entry left stale by another process is only a miss.
+    """
+    key = (queryset.model._meta.label, field, value)
+    pk = lookup_cache.get(key)
+    if pk is not None:
+        obj = queryset.filter(pk=pk).first()
+        if obj is not None and getattr(obj, field) == value:
+            return obj
+        lookup_cache.discard(key)
+
+    obj = get_object_or_404(queryset, **{field: value})
+    lookup_cache.set(key, obj.pk)
+    return obj
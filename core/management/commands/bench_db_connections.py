@@ -0,0 +1,112 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+from core.benchmark import run_concurrently, summarize
+
+MODES = {
+    "fresh": {"DB_POOL": "false", "DB_CONN_MAX_AGE": "0"},
+    "persistent": {"DB_POOL": "false", "DB_CONN_MAX_AGE": "60"},
+    "pool": {"DB_POOL": "true"},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure request throughput with fresh, persistent and pooled database "
+        "connections. Each mode runs in its own process against the configured "
+        "database (PostgreSQL, or SQLite as a stand-in)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/api/faq/")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--modes", nargs="+", choices=list(MODES), default=list(MODES)
+        )
+        parser.add_argument("--json", action="store_true", help="Print raw JSON.")
+        # Internal: run a single mode in this process and print its result.
+        parser.add_argument("--run-mode", help="==SUPPRESS==")
+
+    def handle(self, *args, **options):
+        if options["run_mode"]:
+            self.stdout.write(json.dumps(self.run_mode(options)))
+            return
+
+        results = {}
+        for mode in options["modes"]:
+            if mode == "pool" and connection.vendor != "postgresql":
+                self.stderr.write(f"Skipping '{mode}': requires PostgreSQL.")
+                continue
+            results[mode] = self.spawn(mode, options)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            f"{options['requests']} x GET {options['path']} over "
+            f"{options['threads']} threads ({connection.vendor})"
+        )
+        self.stdout.write(
+            f"{'mode':<12}{'req/s':>10}{'avg ms':>10}{'p95 ms':>10}"
+            f"{'p99 ms':>10}{'connects':>10}"
+        )
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode:<12}{result['req_per_s']:>10}{result['avg_ms']:>10}"
+                f"{result['p95_ms']:>10}{result['p99_ms']:>10}"
+                f"{result['connections_opened']:>10}"
+            )
+
+    def spawn(self, mode, options):
+        command = [
+            sys.executable,
+            "-m",
+            "django",
+            "bench_db_connections",
+            "--run-mode",
+            mode,
+            "--path",
+            options["path"],
+            "--requests",
+            str(options["requests"]),
+            "--threads",
+            str(options["threads"]),
+        ]
+        env = {**os.environ, **MODES[mode]}
+        process = subprocess.run(
+            command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True
+        )
+        if process.returncode != 0:
+            raise CommandError(f"Mode '{mode}' failed:\n{process.stderr}")
+        return json.loads(process.stdout.strip().splitlines()[-1])
+
+    def run_mode(self, options):
+        opened = []
+        lock = threading.Lock()
+
+        def count_connection(sender, **kwargs):
+            with lock:
+                opened.append(sender)
+
+        connection_created.connect(count_connection, weak=False)
+        latencies, statuses, elapsed = run_concurrently(
+            lambda client: client.get(options["path"]),
+            options["requests"],
+            options["threads"],
+        )
+        return {
+            **summarize(latencies, elapsed),
+            "statuses": statuses,
+            "connections_opened": len(opened),
+            "engine": settings.DATABASES["default"]["ENGINE"],
+        }
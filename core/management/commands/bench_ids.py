@@ -0,0 +1,91 @@
+import json
+import random
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.ids import STRATEGIES
+from core.models import IdBlock
+
+FILLS = (0.5, 0.9, 0.99, 0.999)
+PASS_CODES = range(1000, 10000)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the ID strategies of core.ids, and compare the old "
+        "'random, exists(), retry' pass code generation with the free-list one "
+        "as the 4-digit space fills up."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=20000)
+        parser.add_argument("--json", action="store_true", help="Print raw JSON.")
+
+    def handle(self, *args, **options):
+        result = {
+            "strategies": self.bench_strategies(options["count"]),
+            "pass_codes": self.bench_pass_codes(),
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+
+        self.stdout.write(f"{options['count']} IDs per strategy:")
+        for name, stats in result["strategies"].items():
+            self.stdout.write(
+                f"  {name:<10}{stats['ids_per_s']:>12} IDs/s"
+                f"{stats['queries_per_1000']:>8} queries/1000"
+                f"{stats['duplicates']:>6} duplicates  e.g. {stats['example']}"
+            )
+        self.stdout.write("4-digit pass codes, queries per code:")
+        for fill, stats in result["pass_codes"].items():
+            self.stdout.write(
+                f"  {fill:>6} full: retry loop {stats['retry_queries']:>8}, "
+                f"free list {stats['free_list_queries']}"
+            )
+
+    def bench_strategies(self, count):
+        results = {}
+        for name, strategy_class in STRATEGIES.items():
+            counter = f"bench-{name}-{uuid.uuid4().hex[:8]}"
+            strategy = strategy_class(counter)
+            try:
+                with CaptureQueriesContext(connection) as queries:
+                    started_at = time.perf_counter()
+                    ids = [strategy.generate() for _ in range(count)]
+                    elapsed = time.perf_counter() - started_at
+            finally:
+                IdBlock.objects.filter(name=counter).delete()
+            results[name] = {
+                "ids_per_s": round(count / elapsed),
+                "queries_per_1000": round(
+                    len(queries.captured_queries) * 1000 / count, 2
+                ),
+                "duplicates": count - len(set(ids)),
+                "example": ids[-1],
+            }
+        return results
+
+    def bench_pass_codes(self, samples=2000):
+        """
+        Count the exists() queries the old loop runs per code at each fill
+        level; the free-list version always runs one query.
+        """
+        results = {}
+        for fill in FILLS:
+            used = set(random.sample(PASS_CODES, int(len(PASS_CODES) * fill)))
+            attempts = 0
+            for _ in range(samples):
+                while True:
+                    attempts += 1
+                    if random.choice(PASS_CODES) not in used:
+                        break
+            results[f"{fill:.1%}"] = {
+                "retry_queries": round(attempts / samples, 1),
+                "free_list_queries": 1,
+            }
+        return results
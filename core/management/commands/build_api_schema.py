@@ -0,0 +1,34 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.schema import build_schema, write_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema and write it gzip-compressed to "
+        "API_SCHEMA_FILE, from where /api/schema/ serves it without "
+        "regenerating it. Run once per deploy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.API_SCHEMA_FILE,
+            help="Destination file (defaults to API_SCHEMA_FILE).",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        schema = build_schema()
+        tmp_path = f"{output}.tmp"
+        write_schema(tmp_path, schema)
+        os.replace(tmp_path, output)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {len(schema.get('paths', {}))} paths to {output} "
+                f"({os.path.getsize(output) // 1024} KiB)"
+            )
+        )
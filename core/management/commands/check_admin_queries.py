@@ -0,0 +1,91 @@
+import json
+import re
+import time
+import uuid
+from collections import Counter
+
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from users.models import User
+
+# Literals are replaced so queries differing only by id count as repeats.
+LITERALS = re.compile(r"'[^']*'|\b\d+\b")
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the changelist of every registered admin model and report its "
+        "queries, repeated queries (N+1) and time. Fails when a changelist "
+        "runs more than --max-queries queries or repeats one more than "
+        "--max-repeats times."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-queries", type=int, default=20)
+        parser.add_argument("--max-repeats", type=int, default=2)
+        parser.add_argument(
+            "--model",
+            action="append",
+            help="Only check this model (app_label.model_name); repeatable.",
+        )
+        parser.add_argument("--json", action="store_true", help="Print raw JSON.")
+
+    def handle(self, *args, **options):
+        user = User(
+            email=f"admin-check-{uuid.uuid4().hex[:8]}@example.invalid",
+            is_staff=True,
+            is_superuser=True,
+        )
+        user.set_unusable_password()
+        user.save()
+        client = Client()
+        client.force_login(user)
+        try:
+            results = {
+                model._meta.label_lower: self.check_changelist(client, model)
+                for model in admin.site._registry
+                if not options["model"] or model._meta.label_lower in options["model"]
+            }
+        finally:
+            User._base_manager.filter(pk=user.pk).delete()
+
+        failures = [
+            label
+            for label, result in results.items()
+            if result["status"] != 200
+            or result["queries"] > options["max_queries"]
+            or result["max_repeats"] > options["max_repeats"]
+        ]
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            for label, result in sorted(results.items()):
+                self.stdout.write(
+                    f"{label:<40}{result['status']:>5}{result['queries']:>5} queries"
+                    f"{result['max_repeats']:>4} max repeats{result['ms']:>9} ms"
+                )
+        if failures:
+            raise CommandError(f"Changelists over budget: {', '.join(failures)}")
+
+    def check_changelist(self, client, model):
+        url = reverse(
+            f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist"
+        )
+        with CaptureQueriesContext(connection) as queries:
+            started_at = time.perf_counter()
+            response = client.get(url)
+            elapsed = time.perf_counter() - started_at
+        repeats = Counter(
+            LITERALS.sub("?", query["sql"]) for query in queries.captured_queries
+        )
+        return {
+            "status": response.status_code,
+            "queries": len(queries.captured_queries),
+            "max_repeats": max(repeats.values(), default=0),
+            "ms": round(elapsed * 1000, 1),
+        }
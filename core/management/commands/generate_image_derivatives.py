@@ -0,0 +1,78 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.images import (
+    derivative_models,
+    derivatives_field,
+    generate_derivatives,
+    is_current,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the thumbnails and responsive WebP copies of uploaded images "
+        "that don't have up-to-date ones, e.g. images uploaded before the "
+        "pipeline existed. New uploads are processed in the background."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            help="Only process this model (app_label.model_name); repeatable.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate every image, e.g. after changing the widths.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows read per query while looking for images to process.",
+        )
+
+    def handle(self, *args, **options):
+        models = derivative_models()
+        if options["model"]:
+            labels = {model._meta.label_lower: model for model in models}
+            unknown = set(options["model"]) - set(labels)
+            if unknown:
+                raise CommandError(
+                    f"No images to process on: {', '.join(sorted(unknown))}."
+                )
+            models = [labels[label] for label in options["model"]]
+
+        started_at = time.perf_counter()
+        total = 0
+        for model in models:
+            for field_name in model.derivative_fields:
+                count = self.process(model, field_name, options)
+                total += count
+                self.stdout.write(f"{model._meta.label_lower}.{field_name}: {count}")
+
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(
+            self.style.SUCCESS(f"Processed {total} images in {elapsed:.1f}s.")
+        )
+
+    def process(self, model, field_name, options):
+        rows = (
+            model._base_manager.exclude(**{field_name: ""})
+            .exclude(**{f"{field_name}__isnull": True})
+            .values_list("pk", field_name, derivatives_field(field_name))
+            .order_by("pk")
+            .iterator(chunk_size=options["batch_size"])
+        )
+        count = 0
+        for pk, name, derivatives in rows:
+            if not options["force"] and is_current(derivatives, name):
+                continue
+            if generate_derivatives(
+                model._meta.label, pk, field_name, force=options["force"]
+            ):
+                count += 1
+        return count
@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import summarize, temporary_api_key
+
+
+class Command(BaseCommand):
+    help = (
+        "Send concurrent HTTP requests to one or more running servers (e.g. "
+        "runserver and gunicorn) and compare their throughput and latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "targets",
+            nargs="+",
+            help="Base URLs to test, e.g. http://127.0.0.1:8000.",
+        )
+        parser.add_argument("--path", default="/api/faq/")
+        parser.add_argument("--method", default="GET")
+        parser.add_argument("--data", help="JSON request body.")
+        parser.add_argument(
+            "--header",
+            action="append",
+            default=[],
+            help="Extra 'Name: value' header, may be repeated.",
+        )
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--duration", type=float, default=10.0)
+        parser.add_argument(
+            "--api-key",
+            help="API key to send. A temporary key is created when omitted.",
+        )
+        parser.add_argument(
+            "--max-status",
+            action="append",
+            default=[],
+            metavar="STATUS=COUNT",
+            help="Fail when a target returns STATUS more than COUNT times, e.g. "
+            "200=10 to check a rate limit. May be repeated.",
+        )
+        parser.add_argument("--json", action="store_true", help="Print raw JSON.")
+
+    def handle(self, *args, **options):
+        headers = {}
+        for header in options["header"]:
+            name, sep, value = header.partition(":")
+            if not sep:
+                raise CommandError(
+                    f"Invalid header '{header}', expected 'Name: value'."
+                )
+            headers[name.strip()] = value.strip()
+        max_statuses = {}
+        for limit in options["max_status"]:
+            status, sep, count = limit.partition("=")
+            if not sep or not status.isdigit() or not count.isdigit():
+                raise CommandError(f"Invalid limit '{limit}', expected 'STATUS=COUNT'.")
+            max_statuses[int(status)] = int(count)
+        if options["data"]:
+            headers.setdefault("Content-Type", "application/json")
+
+        results = {}
+        if options["api_key"]:
+            headers["X-API-KEY"] = options["api_key"]
+            for target in options["targets"]:
+                results[target] = self.run(target, headers, options)
+        else:
+            with temporary_api_key("loadtest") as key:
+                headers["X-API-KEY"] = key
+                for target in options["targets"]:
+                    results[target] = self.run(target, headers, options)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self.report(results, options)
+
+        failures = [
+            f"{target} returned {status} {result['statuses'].get(status, 0)} "
+            f"times, expected at most {count}."
+            for target, result in results.items()
+            for status, count in max_statuses.items()
+            if result["statuses"].get(status, 0) > count
+        ]
+        if failures:
+            raise CommandError("\n".join(failures))
+
+    def report(self, results, options):
+
+        self.stdout.write(
+            f"{options['method'].upper()} {options['path']}, "
+            f"{options['concurrency']} concurrent clients for {options['duration']}s"
+        )
+        self.stdout.write(
+            f"{'target':<32}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'p99 ms':>10}{'errors':>8}  statuses"
+        )
+        for target, result in results.items():
+            self.stdout.write(
+                f"{target:<32}{result['req_per_s']:>10}{result['p50_ms']:>10}"
+                f"{result['p95_ms']:>10}{result['p99_ms']:>10}"
+                f"{result['errors']:>8}  {result['statuses']}"
+            )
+            if result["retry_after"]:
+                low, high = result["retry_after"]
+                self.stdout.write(f"{'':<32}Retry-After {low}-{high}s")
+
+    def run(self, target, headers, options):
+        url = target.rstrip("/") + options["path"]
+        method = options["method"].upper()
+        data = options["data"]
+        deadline = time.perf_counter() + options["duration"]
+        latencies = []
+        statuses = {}
+        retry_after = []
+        errors = []
+        lock = threading.Lock()
+
+        def worker():
+            # One keep-alive session per simulated client.
+            with requests.Session() as session:
+                while time.perf_counter() < deadline:
+                    started_at = time.perf_counter()
+                    try:
+                        response = session.request(
+                            method, url, data=data, headers=headers, timeout=30
+                        )
+                    except requests.RequestException as e:
+                        with lock:
+                            errors.append(str(e))
+                        continue
+                    latency = time.perf_counter() - started_at
+                    with lock:
+                        latencies.append(latency)
+                        statuses[response.status_code] = (
+                            statuses.get(response.status_code, 0) + 1
+                        )
+                        if "Retry-After" in response.headers:
+                            retry_after.append(int(response.headers["Retry-After"]))
+
+        threads = [
+            threading.Thread(target=worker) for _ in range(options["concurrency"])
+        ]
+        started_at = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started_at
+
+        if errors and not latencies:
+            raise CommandError(f"Every request to {url} failed: {errors[0]}")
+        return {
+            **summarize(latencies, elapsed),
+            "statuses": statuses,
+            "retry_after": (
+                [min(retry_after), max(retry_after)] if retry_after else None
+            ),
+            "errors": len(errors),
+        }
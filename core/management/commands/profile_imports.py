@@ -0,0 +1,164 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+TARGETS = {
+    "setup": "import django; django.setup()",
+    "urls": (
+        "import django; django.setup(); "
+        "from django.urls import get_resolver; get_resolver().url_patterns"
+    ),
+    "check": (
+        "import django; django.setup(); "
+        "from django.core.management import call_command; "
+        "call_command('check', verbosity=0)"
+    ),
+}
+
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def parse_importtime(output):
+    """
+    Parse `-X importtime` output into `(module, self_us, cumulative_us,
+    importer)` tuples, `importer` being the module whose import triggered it.
+    """
+    rows = []
+    for line in output.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            rows.append((match[4], int(match[1]), int(match[2]), len(match[3])))
+
+    # Children are printed before their parent, one level deeper.
+    modules = []
+    stack = []
+    for name, self_us, cumulative_us, depth in reversed(rows):
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        importer = stack[-1][1] if stack else None
+        modules.append((name, self_us, cumulative_us, importer))
+        stack.append((depth, name))
+    modules.reverse()
+    return modules
+
+
+class Command(BaseCommand):
+    requires_system_checks = []
+    help = (
+        "Profile the imports done while starting Django and report the "
+        "cumulative import cost per top-level package and per module. "
+        "--budget-ms and --forbid make it fail on regressions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            choices=list(TARGETS),
+            default="urls",
+            help="What to start: django.setup(), setup plus the URLconf, or "
+            "setup plus system checks.",
+        )
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Runs to take the median of (the first is usually cold).",
+        )
+        parser.add_argument(
+            "--budget-ms",
+            type=float,
+            help="Fail when the median total import time exceeds this.",
+        )
+        parser.add_argument(
+            "--forbid",
+            nargs="+",
+            default=[],
+            metavar="MODULE",
+            help="Fail when any of these modules is imported during startup.",
+        )
+
+    def handle(self, *args, **options):
+        runs = [self.run_once(options["target"]) for _ in range(options["repeat"])]
+        _, modules = min(runs, key=lambda run: sum(module[1] for module in run[1]))
+        totals = [sum(module[1] for module in run[1]) / 1000 for run in runs]
+        median_ms = statistics.median(totals)
+        median_wall_ms = statistics.median(run[0] for run in runs)
+
+        self.stdout.write(
+            f"target={options['target']}: {len(modules)} modules, "
+            f"import time {median_ms:.1f} ms, process {median_wall_ms:.1f} ms "
+            f"(median of {len(runs)})"
+        )
+        self.report_packages(modules, options["top"])
+        self.report_modules(modules, options["top"])
+
+        errors = []
+        importers = {module[0]: module[3] for module in modules}
+        for forbidden in options["forbid"]:
+            if forbidden in importers:
+                errors.append(
+                    f"'{forbidden}' is imported at startup "
+                    f"(via {self.import_chain(forbidden, importers)})."
+                )
+        if options["budget_ms"] and median_ms > options["budget_ms"]:
+            errors.append(
+                f"Import time {median_ms:.1f} ms exceeds the budget of "
+                f"{options['budget_ms']:.1f} ms."
+            )
+        if errors:
+            raise CommandError("\n".join(errors))
+
+    def import_chain(self, name, importers):
+        """Return the chain of modules that led to `name` being imported."""
+        chain = []
+        importer = importers.get(name)
+        while importer:
+            chain.append(importer)
+            importer = importers.get(importer)
+        return " <- ".join(chain) or "top level"
+
+    def run_once(self, target):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        started_at = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", TARGETS[target]],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        wall_ms = (time.perf_counter() - started_at) * 1000
+        if process.returncode != 0:
+            raise CommandError(process.stderr[-2000:])
+        return wall_ms, parse_importtime(process.stderr)
+
+    def report_packages(self, modules, top):
+        # Attribute each module's own time to the top-level package of the
+        # first import that pulled it in, so heavy dependencies show up under
+        # the app that imported them.
+        root_of = {}
+        packages = {}
+        for name, self_us, _, importer in reversed(modules):
+            root = root_of.get(importer) if importer else None
+            root_of[name] = root = root or name.split(".")[0]
+            packages[root] = packages.get(root, 0) + self_us
+
+        self.stdout.write("\nCumulative import time by top-level package:")
+        for package, total_us in sorted(packages.items(), key=lambda i: -i[1])[:top]:
+            marker = "*" if package in settings.INSTALLED_APPS else " "
+            self.stdout.write(f"  {total_us / 1000:>9.1f} ms {marker} {package}")
+        self.stdout.write("  (* = installed app)")
+
+    def report_modules(self, modules, top):
+        self.stdout.write("\nSlowest modules (cumulative):")
+        slowest = sorted(modules, key=lambda module: -module[2])[:top]
+        for name, _, cumulative_us, importer in slowest:
+            via = f"  <- {importer}" if importer else ""
+            self.stdout.write(f"  {cumulative_us / 1000:>9.1f} ms   {name}{via}")
@@ -0,0 +1,178 @@
+import mimetypes
+import os
+import posixpath
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_safe
+
+# Names with a content hash before the extension (`name.0123456789ab.webp`,
+# like ManifestStaticFilesStorage) never change and are cached for a year.
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.\w+$")
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+# Compressed files are served as what they are, like FileResponse does: a
+# Content-Encoding would make browsers decompress them on download.
+ENCODING_TYPES = {
+    "br": "application/x-brotli",
+    "bzip2": "application/x-bzip",
+    "compress": "application/x-compress",
+    "gzip": "application/gzip",
+    "xz": "application/x-xz",
+}
+
+
+class FileRange:
+    """
+    File-like object reading at most `length` bytes of `file` from its
+    current position. It has no `fileno` on purpose: WSGI servers sendfile
+    file wrappers from offset 0 (gunicorn does), not from the range start.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size) if size else b""
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def guess_content_type(path):
+    content_type, encoding = mimetypes.guess_type(path)
+    return ENCODING_TYPES.get(encoding, content_type) or "application/octet-stream"
+
+
+def media_etag(stat_result):
+    return quote_etag(f"{int(stat_result.st_mtime):x}-{stat_result.st_size:x}")
+
+
+def cache_control(path):
+    if HASHED_NAME.search(path):
+        return f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    return f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+
+
+def not_modified(request, etag, last_modified):
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        return if_none_match == "*" or etag in (
+            value.strip().removeprefix("W/") for value in if_none_match.split(",")
+        )
+    if_modified_since = parse_http_date_safe(
+        request.headers.get("If-Modified-Since", "")
+    )
+    return if_modified_since is not None and last_modified <= if_modified_since
+
+
+def parse_range(request, etag, last_modified, size):
+    """
+    The `(start, end)` (inclusive) of a single-range `Range` request, "416"
+    when it can't be satisfied, or None to send the whole file: no or an
+    unsupported (e.g. multipart) range, or a stale `If-Range`.
+    """
+    match = RANGE.match(request.headers.get("Range", "").replace(" ", ""))
+    if not match or not size:
+        return None
+    if_range = request.headers.get("If-Range")
+    if if_range is not None and if_range != etag:
+        if parse_http_date_safe(if_range) != last_modified:
+            return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        if not int(last):
+            return "416"
+        # A suffix range: the last `last` bytes.
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    if start >= size:
+        return "416"
+    end = min(int(last), size - 1) if last else size - 1
+    return (start, end) if start <= end else None
+
+
+def sendfile_response(path, full_path):
+    response = HttpResponse()
+    if settings.MEDIA_SENDFILE == "x-accel-redirect":
+        response["X-Accel-Redirect"] = quote(
+            posixpath.join(settings.MEDIA_ACCEL_REDIRECT_PREFIX, path)
+        )
+    else:
+        response["X-Sendfile"] = full_path
+    # The web server fills in the length, ranges and validators.
+    response["Content-Type"] = guess_content_type(full_path)
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serve a file from MEDIA_ROOT. With MEDIA_SENDFILE set the web server
+    sends it (X-Sendfile or nginx X-Accel-Redirect). Otherwise whole files
+    go out through the WSGI server's `wsgi.file_wrapper` (zero-copy
+    sendfile under gunicorn), with ETag/Last-Modified revalidation and
+    single `Range` requests.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        stat_result = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404("File not found.")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise Http404("File not found.")
+
+    if settings.MEDIA_SENDFILE:
+        response = sendfile_response(path, full_path)
+        response["Cache-Control"] = cache_control(path)
+        return response
+
+    etag = media_etag(stat_result)
+    last_modified = int(stat_result.st_mtime)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": cache_control(path),
+        "Accept-Ranges": "bytes",
+    }
+    if not_modified(request, etag, last_modified):
+        response = HttpResponseNotModified()
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+    size = stat_result.st_size
+    byte_range = parse_range(request, etag, last_modified, size)
+    if byte_range == "416":
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    file = open(full_path, "rb")
+    if byte_range is None:
+        response = FileResponse(file)
+        length = size
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        file.seek(start)
+        response = FileResponse(FileRange(file, length), status=206)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Content-Type"] = guess_content_type(full_path)
+    response["Content-Length"] = str(length)
+    for header, value in headers.items():
+        response[header] = value
+    return response
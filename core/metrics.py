@@ -0,0 +1,330 @@
+import atexit
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FILE_PREFIX = "metrics_"
+ARCHIVE_FILE = "metrics_archive.json"
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric '{self.name}' expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        with self._lock:
+            return [
+                [list(key), value.copy() if isinstance(value, list) else value]
+                for key, value in self._values.items()
+            ]
+
+    def describe(self):
+        return {
+            "kind": self.kind,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+        }
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, **kwargs
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, **kwargs)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            # Per-bucket counts followed by the running sum and count.
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 3)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def describe(self):
+        return {**super().describe(), "buckets": list(self.buckets)}
+
+
+class MetricsRegistry:
+    """
+    Holds the metrics of this process. When `METRICS_MULTIPROC_DIR` is set,
+    every process periodically writes its values to its own file in that
+    directory and scrapes merge the files of all processes, so counters are
+    aggregated across gunicorn workers.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered.")
+            self._metrics[metric.name] = metric
+
+    def snapshot(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: {**metric.describe(), "samples": metric.samples()}
+            for metric in metrics
+        }
+
+    @property
+    def directory(self):
+        return getattr(settings, "METRICS_MULTIPROC_DIR", None)
+
+    def _write(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{FILE_PREFIX}{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(self.snapshot(), fh)
+        os.replace(tmp_path, path)
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        """Write this process' values to its file in the multiprocess directory."""
+        directory = self.directory
+        if not directory:
+            return
+        with self._flush_lock:
+            self._write(directory)
+
+    def maybe_flush(self):
+        """Flush at most once per `METRICS_FLUSH_INTERVAL` seconds."""
+        interval = getattr(settings, "METRICS_FLUSH_INTERVAL", 1.0)
+        directory = self.directory
+        if not directory or time.monotonic() - self._last_flush < interval:
+            return
+        # Skip when another thread of this process is already writing the file.
+        if self._flush_lock.acquire(blocking=False):
+            try:
+                self._write(directory)
+            finally:
+                self._flush_lock.release()
+
+    def collect(self):
+        """Return the metrics of every process merged into a single snapshot."""
+        directory = self.directory
+        if not directory:
+            return self.snapshot()
+
+        self.flush()
+        merged = {}
+        for snapshot in _read_snapshots(directory):
+            _merge_snapshot(merged, snapshot)
+        return merged
+
+    def render(self):
+        """Render the collected metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, metric in sorted(self.collect().items()):
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['kind']}")
+            labelnames = metric["labelnames"]
+            for labels, value in sorted(metric["samples"], key=lambda s: s[0]):
+                pairs = list(zip(labelnames, labels))
+                if metric["kind"] == "histogram":
+                    lines.extend(
+                        _render_histogram(name, pairs, metric["buckets"], value)
+                    )
+                else:
+                    lines.append(
+                        f"{name}{_format_labels(pairs)} {_format_value(value)}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+def _read_snapshots(directory):
+    for filename in sorted(os.listdir(directory)):
+        if not (filename.startswith(FILE_PREFIX) and filename.endswith(".json")):
+            continue
+        try:
+            with open(os.path.join(directory, filename)) as fh:
+                yield json.load(fh)
+        except (OSError, ValueError):
+            # The file may be replaced or removed while reading it.
+            continue
+
+
+def _merge_snapshot(merged, snapshot):
+    for name, metric in snapshot.items():
+        target = merged.setdefault(name, {**metric, "samples": []})
+        values = {tuple(labels): value for labels, value in target["samples"]}
+        for labels, value in metric["samples"]:
+            key = tuple(labels)
+            current = values.get(key)
+            if current is None:
+                values[key] = value
+            elif isinstance(value, list):
+                values[key] = [a + b for a, b in zip(current, value)]
+            else:
+                values[key] = current + value
+        target["samples"] = [[list(key), value] for key, value in values.items()]
+
+
+def mark_process_dead(pid, directory=None):
+    """
+    Fold the counters and histograms of a dead process into the archive file
+    and drop its gauges. Called from the gunicorn `child_exit` hook.
+    """
+    directory = directory or getattr(settings, "METRICS_MULTIPROC_DIR", None)
+    if not directory:
+        return
+    path = os.path.join(directory, f"{FILE_PREFIX}{pid}.json")
+    try:
+        with open(path) as fh:
+            snapshot = json.load(fh)
+    except (OSError, ValueError):
+        return
+
+    archive_path = os.path.join(directory, ARCHIVE_FILE)
+    try:
+        with open(archive_path) as fh:
+            archive = json.load(fh)
+    except (OSError, ValueError):
+        archive = {}
+
+    _merge_snapshot(
+        archive,
+        {
+            name: metric
+            for name, metric in snapshot.items()
+            if metric["kind"] != "gauge"
+        },
+    )
+    tmp_path = f"{archive_path}.tmp"
+    with open(tmp_path, "w") as fh:
+        json.dump(archive, fh)
+    os.replace(tmp_path, archive_path)
+    os.remove(path)
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _render_histogram(name, pairs, buckets, state):
+    lines = []
+    cumulative = 0
+    for bound, count in zip(buckets, state):
+        cumulative += count
+        labels = _format_labels(pairs + [("le", _format_value(float(bound)))])
+        lines.append(f"{name}_bucket{labels} {cumulative}")
+    cumulative += state[len(buckets)]
+    lines.append(
+        f"{name}_bucket{_format_labels(pairs + [('le', '+Inf')])} {cumulative}"
+    )
+    lines.append(f"{name}_sum{_format_labels(pairs)} {_format_value(state[-2])}")
+    lines.append(f"{name}_count{_format_labels(pairs)} {state[-1]}")
+    return lines
+
+
+REGISTRY = MetricsRegistry()
+atexit.register(REGISTRY.flush)
+
+http_requests_total = Counter(
+    "http_requests_total",
+    "Total HTTP requests by route and status code.",
+    ["method", "route", "status"],
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds by route and status code.",
+    ["method", "route", "status"],
+)
+http_request_db_queries = Histogram(
+    "http_request_db_queries",
+    "SQL queries executed per HTTP request by route.",
+    ["method", "route"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+exchange_rate_cache_requests_total = Counter(
+    "exchange_rate_cache_requests_total",
+    "Exchange rate cache lookups by result (hit or miss).",
+    ["result"],
+)
+api_key_cache_requests_total = Counter(
+    "api_key_cache_requests_total",
+    "API key cache lookups by result (hit or miss).",
+    ["result"],
+)
+email_queue_depth = Gauge(
+    "email_queue_depth",
+    "Emails waiting to be sent by the background dispatcher.",
+)
+checkout_lock_wait_seconds = Histogram(
+    "checkout_lock_wait_seconds",
+    "Time spent waiting for product row locks while placing an order.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
@@ -1,6 +1,16 @@
+import time
+
+from django.conf import settings
 from django.http import JsonResponse
 
-from .models import APIKey
+from .authentication import get_active_api_key
+from .instrumentation import endpoint_stats, get_request_metrics, instrument_request
+from .metrics import (
+    REGISTRY,
+    http_request_db_queries,
+    http_request_duration_seconds,
+    http_requests_total,
+)
 from .utils import set_current_user
 
 
@@ -14,6 +24,49 @@ class CurrentUserMiddleware:
         return response
 
 
+class QueryInstrumentationMiddleware:
+    """
+    Middleware to record SQL query counts, duplicate queries and DB, serializer
+    and render timings per request. The numbers are aggregated per endpoint and
+    optionally exposed through the `Server-Timing` response header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with instrument_request() as metrics:
+            response = self.get_response(request)
+            total = metrics.elapsed()
+
+        route = self.get_route(request)
+        endpoint_stats.record(f"{request.method} {route}", metrics, total)
+        self.record_metrics(request.method, route, response.status_code, metrics, total)
+        if settings.SERVER_TIMING_HEADER:
+            response["Server-Timing"] = metrics.server_timing(total)
+        return response
+
+    def process_template_response(self, request, response):
+        metrics = get_request_metrics()
+        if metrics is not None:
+            started_at = time.perf_counter()
+            response.add_post_render_callback(
+                lambda _: metrics.add_timing("render", time.perf_counter() - started_at)
+            )
+        return response
+
+    def get_route(self, request):
+        match = request.resolver_match
+        return match.view_name if match else "unresolved"
+
+    def record_metrics(self, method, route, status_code, metrics, total):
+        labels = {"method": method, "route": route, "status": status_code}
+        http_requests_total.inc(**labels)
+        http_request_duration_seconds.observe(total, **labels)
+        http_request_db_queries.observe(metrics.query_count, method=method, route=route)
+        REGISTRY.maybe_flush()
+
+
 class APIKeyMiddleware:
     """
     Middleware to check for a valid API key in the request headers,
@@ -28,6 +81,9 @@ class APIKeyMiddleware:
         "/api/schema/redoc/",
         "/api/docs/",
         "/ckeditor/",
+        "/api/metrics/",
+        "/api/health/",
+        "/media/",
     ]
 
     def __init__(self, get_response):
@@ -46,9 +102,8 @@ class APIKeyMiddleware:
         if not api_key:
             return JsonResponse({"detail": "API key header missing."}, status=401)
 
-        try:
-            key_obj = APIKey.objects.get(key=api_key, is_active=True)
-        except APIKey.DoesNotExist:
+        key_obj = get_active_api_key(api_key)
+        if key_obj is None:
             return JsonResponse({"detail": "Invalid or inactive API key."}, status=403)
 
         request.api_key = key_obj
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_alter_apikey_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RateLimitCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=255)),
+                ("window", models.BigIntegerField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("expires_at", models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="ratelimitcounter",
+            constraint=models.UniqueConstraint(
+                fields=("key", "window"), name="unique_ratelimit_key_window"
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_ratelimitcounter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IdBlock",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("next_value", models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
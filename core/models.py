@@ -150,3 +150,26 @@ class APIKey(models.Model):
 
     def __str__(self):
         return f"{self.name} - {'Active' if self.is_active else 'Inactive'}"
+
+
+class RateLimitCounter(models.Model):
+    """Request count of one rate-limit key in one fixed window."""
+
+    key = models.CharField(max_length=255)
+    window = models.BigIntegerField()
+    count = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["key", "window"], name="unique_ratelimit_key_window"
+            )
+        ]
+
+
+class IdBlock(models.Model):
+    """Next unreserved value of a named ID counter."""
+
+    name = models.CharField(max_length=100, unique=True)
+    next_value = models.BigIntegerField(default=0)
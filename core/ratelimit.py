@@ -0,0 +1,205 @@
+import hashlib
+import ipaddress
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.throttling import BaseThrottle
+
+from .models import RateLimitCounter
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """Parse `"<requests>/<period>"`, e.g. `"5/m"` or `"100/15m"`."""
+    num_requests, period = rate.split("/")
+    multiplier = int(period[:-1] or 1)
+    return int(num_requests), multiplier * PERIODS[period[-1]]
+
+
+def is_trusted_proxy(address):
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(proxy, strict=False)
+        for proxy in settings.RATELIMIT_TRUSTED_PROXIES
+    )
+
+
+def client_ip(request):
+    """
+    The address requests are limited by: `REMOTE_ADDR`, or when that is one
+    of `RATELIMIT_TRUSTED_PROXIES`, the last `X-Forwarded-For` address that
+    isn't. Other headers are set by clients, so rotating them would reset
+    every per-IP limit.
+    """
+    remote_addr = request.META.get("REMOTE_ADDR")
+    if not is_trusted_proxy(remote_addr):
+        return remote_addr
+    forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR", "").split(",")
+    for address in reversed([address.strip() for address in forwarded_for]):
+        if address and not is_trusted_proxy(address):
+            return address
+    return remote_addr
+
+
+def user_or_ip(request):
+    if request.user and request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    return client_ip(request)
+
+
+def request_field(name):
+    """Key requests by a (case-insensitive) field of the request body."""
+
+    def key(request):
+        value = request.data.get(name) if hasattr(request.data, "get") else None
+        return str(value).strip().lower() if value else None
+
+    return key
+
+
+KEYS = {"ip": client_ip, "user": user_or_ip}
+
+
+class CacheStore:
+    """Counters in the `RATELIMIT_USE_CACHE` cache; atomic on Redis/Memcached."""
+
+    def __init__(self):
+        self.cache = caches[settings.RATELIMIT_USE_CACHE]
+
+    def _key(self, key, window):
+        return f"{key}:{window}"
+
+    def hit(self, key, window, period):
+        current_key = self._key(key, window)
+        # Previous window is still needed while the current one lasts.
+        self.cache.add(current_key, 0, period * 2)
+        current = self.cache.incr(current_key)
+        previous = self.cache.get(self._key(key, window - 1), 0)
+        return previous, current
+
+    def undo(self, key, window):
+        try:
+            self.cache.decr(self._key(key, window))
+        except ValueError:
+            pass
+
+
+class DatabaseStore:
+    """Counters in `RateLimitCounter` rows, shared by every worker."""
+
+    def hit(self, key, window, period):
+        counters = RateLimitCounter.objects.filter(key=key)
+        if not counters.filter(window=window).update(count=F("count") + 1):
+            try:
+                with transaction.atomic():
+                    RateLimitCounter.objects.create(
+                        key=key,
+                        window=window,
+                        count=1,
+                        expires_at=timezone.now()
+                        + timezone.timedelta(seconds=period * 2),
+                    )
+            except IntegrityError:
+                # Another worker opened the window first.
+                counters.filter(window=window).update(count=F("count") + 1)
+            else:
+                RateLimitCounter.objects.filter(expires_at__lt=timezone.now()).delete()
+
+        counts = dict(
+            counters.filter(window__in=[window - 1, window]).values_list(
+                "window", "count"
+            )
+        )
+        return counts.get(window - 1, 0), counts.get(window, 0)
+
+    def undo(self, key, window):
+        RateLimitCounter.objects.filter(key=key, window=window).update(
+            count=F("count") - 1
+        )
+
+
+def get_store():
+    if settings.RATELIMIT_STORE == "cache":
+        return CacheStore()
+    return DatabaseStore()
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Allow `rate` requests per period, counted over a sliding window: the
+    previous fixed window's count is weighted by how much of it still
+    overlaps the sliding window. Rejected requests are not counted.
+    """
+
+    def __init__(self, rate, key="ip"):
+        self.rate = rate
+        self.num_requests, self.period = parse_rate(rate)
+        self.key_func = KEYS.get(key, key)
+        self.retry_after = None
+
+    def get_cache_key(self, request, view):
+        ident = self.key_func(request)
+        if not ident:
+            return None
+        name = getattr(self.key_func, "__name__", "key")
+        digest = hashlib.blake2b(str(ident).encode(), digest_size=12).hexdigest()
+        return f"rl:{view.basename}:{view.action}:{self.rate}:{name}:{digest}"
+
+    def allow_request(self, request, view):
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        now = time.time()
+        window, offset = divmod(now, self.period)
+        window = int(window)
+        elapsed = offset / self.period
+
+        store = get_store()
+        previous, current = store.hit(key, window, self.period)
+        if previous * (1 - elapsed) + current <= self.num_requests:
+            return True
+
+        store.undo(key, window)
+        self.retry_after = self.get_retry_after(previous, current - 1, elapsed)
+        return False
+
+    def get_retry_after(self, previous, current, elapsed):
+        """Seconds until one more request fits in the sliding window."""
+        if current + 1 <= self.num_requests:
+            # Wait for enough of the previous window to slide out.
+            fraction = 1 - (self.num_requests - current - 1) / previous
+            wait = (fraction - elapsed) * self.period
+        else:
+            # Wait for the next window, then for this one to slide out.
+            fraction = max(0, 1 - (self.num_requests - 1) / max(current, 1))
+            wait = (1 - elapsed + fraction) * self.period
+        return max(1, math.ceil(wait))
+
+    def wait(self):
+        return self.retry_after
+
+
+class RateLimit:
+    """
+    A rate limit for `BaseViewSet.ratelimit_by_action`. `key` is `"ip"`,
+    `"user"` (the user, or the IP when anonymous) or a callable that takes the
+    request and returns what to count by, or None to skip the limit.
+    """
+
+    def __init__(self, rate, key="ip"):
+        parse_rate(rate)
+        self.rate = rate
+        self.key = key
+
+    def __call__(self):
+        return SlidingWindowThrottle(self.rate, self.key)
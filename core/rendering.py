@@ -0,0 +1,44 @@
+from urllib.parse import urljoin
+
+from django.http import HttpRequest
+
+# Responses cached for every request are rendered with URLs made absolute
+# against this origin, which `with_request_origin` swaps for the origin of
+# the request being served, as the serializer would have built them.
+RENDER_ORIGIN = "http://cached-render.invalid"
+
+
+class RenderRequest(HttpRequest):
+    """Stands in for a GET request while a cached response is rendered."""
+
+    def __init__(self):
+        super().__init__()
+        self.method = "GET"
+
+    def build_absolute_uri(self, location=None):
+        return urljoin(f"{RENDER_ORIGIN}/", location or "/")
+
+
+def request_origin(request):
+    return request.build_absolute_uri("/").rstrip("/")
+
+
+def with_request_origin(data, request):
+    """
+    `data` rendered with a `RenderRequest` (a serializer's data or rendered
+    JSON bytes) with its URLs absolute to the origin of `request`.
+    """
+    origin = request_origin(request)
+    if isinstance(data, bytes):
+        return data.replace(RENDER_ORIGIN.encode(), origin.encode())
+    return _replace_origin(data, origin)
+
+
+def _replace_origin(data, origin):
+    if isinstance(data, str):
+        return data.replace(RENDER_ORIGIN, origin) if RENDER_ORIGIN in data else data
+    if isinstance(data, dict):
+        return {key: _replace_origin(value, origin) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_replace_origin(value, origin) for value in data]
+    return data
@@ -0,0 +1,105 @@
+import gzip
+import hashlib
+import json
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+_lock = threading.Lock()
+_schema = None
+_rendered = {}
+
+
+def build_schema():
+    """Generate the OpenAPI schema of every public endpoint."""
+    return SchemaGenerator().get_schema(request=None, public=True)
+
+
+def write_schema(path, schema):
+    with gzip.open(path, "wt", encoding="utf-8") as fh:
+        json.dump(schema, fh)
+
+
+def load_schema(path):
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return None
+
+
+def get_schema():
+    """
+    Return the schema, loading it from `API_SCHEMA_FILE` when it was built
+    ahead of time and generating it otherwise. Either way this happens once
+    per process.
+    """
+    global _schema
+
+    if _schema is None:
+        with _lock:
+            if _schema is None:
+                _schema = load_schema(settings.API_SCHEMA_FILE) or build_schema()
+    return _schema
+
+
+def get_rendered_schema(renderer):
+    """Return `(body, gzipped_body, etag)` of the schema rendered by `renderer`."""
+    key = renderer.media_type
+    rendered = _rendered.get(key)
+    if rendered is None:
+        body = renderer.render(get_schema(), renderer_context={})
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+        rendered = _rendered[key] = (body, gzip.compress(body), etag)
+    return rendered
+
+
+def clear_schema_cache():
+    global _schema
+
+    with _lock:
+        _schema = None
+        _rendered.clear()
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    Serves the schema from memory with an ETag, gzip-compressed when the
+    client accepts it, instead of regenerating it on every request. Set
+    `API_SCHEMA_LIVE` to regenerate on every request while developing.
+    """
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if settings.API_SCHEMA_LIVE or {"lang", "version"} & set(request.GET):
+            return super().get(request, *args, **kwargs)
+
+        renderer, media_type = self.perform_content_negotiation(request)
+        body, gzipped, etag = get_rendered_schema(renderer)
+
+        if renderer.charset:
+            media_type = f"{media_type}; charset={renderer.charset}"
+        use_gzip = "gzip" in request.headers.get("Accept-Encoding", "")
+        if use_gzip:
+            # Each encoding is a different representation with its own tag.
+            etag = f'{etag[:-1]}-gzip"'
+
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponse(status=304)
+        elif use_gzip:
+            response = HttpResponse(gzipped, content_type=media_type)
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = HttpResponse(body, content_type=media_type)
+
+        response["ETag"] = etag
+        response["Vary"] = "Accept, Accept-Encoding"
+        response["Cache-Control"] = "public, max-age=0, must-revalidate"
+        response["Content-Disposition"] = (
+            f'inline; filename="{self._get_filename(request, None)}"'
+        )
+        return response
@@ -1,9 +1,12 @@
 from django.apps import apps
 from django.core.exceptions import FieldDoesNotExist
 from django.db.models import Q
-from drf_spectacular.utils import extend_schema_serializer
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field, extend_schema_serializer
 from rest_framework import serializers
 
+from .images import derivative_urls, derivatives_field
+from .instrumentation import timed
 from .models import APIKey
 
 
@@ -12,6 +15,31 @@ class GeoLocationSerializer(serializers.Serializer):
     longitude = serializers.FloatField()
 
 
+@extend_schema_field(OpenApiTypes.OBJECT)
+class ImageDerivativesField(serializers.Field):
+    """
+    Read-only URLs of the thumbnail and responsive widths generated for
+    `image_field` (see `core.images`), or None until they are ready.
+    """
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        kwargs.update(source="*", read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        file = getattr(instance, self.image_field)
+        derivatives = getattr(instance, derivatives_field(self.image_field))
+        if not file or not derivatives or derivatives.get("source") != file.name:
+            return None
+        request = self.context.get("request")
+        return derivative_urls(
+            derivatives,
+            file.storage,
+            request.build_absolute_uri if request is not None else None,
+        )
+
+
 @extend_schema_serializer(
     exclude_fields=[
         "uuid",
@@ -58,6 +86,10 @@ class BaseModelSerializer(serializers.ModelSerializer):
             for field in self.base_model_fields:
                 self.fields.pop(field, None)
 
+    def to_representation(self, instance):
+        with timed("serialize"):
+            return super().to_representation(instance)
+
     def get_fields(self):
         fields = super().get_fields()
         swagger = self.context.get("swagger_fake_view", False)
@@ -58,7 +58,6 @@ INSTALLED_APPS = [
     "django.contrib.contenttypes",
     "django.contrib.sessions",
     "django.contrib.messages",
-    "daphne",
     "django.contrib.staticfiles",
     "corsheaders",
     "rest_framework",
@@ -71,7 +70,6 @@ INSTALLED_APPS = [
     "bootstrap4",
     "cloudinary",
     "cloudinary_storage",
-    "cryptography",
     "ckeditor",
     # 'ckeditor_uploader',
     "core",
@@ -89,10 +87,12 @@ INSTALLED_APPS = [
     "privacy_policy",
     "return_policy",
     "payments",
+    "analytics",
 ]
 
 # MIDDLEWARES
 MIDDLEWARE = [
+    "core.middleware.QueryInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -104,6 +104,33 @@ MIDDLEWARE = [
     "core.middleware.APIKeyMiddleware",
 ]
 
+# Expose per-request DB/serializer/render timings in the `Server-Timing` header
+SERVER_TIMING_HEADER = (
+    os.environ.get("SERVER_TIMING_HEADER", str(DEBUG)).lower() == "true"
+)
+
+# PROMETHEUS METRICS
+# Directory where each worker process writes its metrics so that scrapes
+# aggregate all gunicorn workers. Unset keeps metrics in-process only.
+METRICS_MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", 1.0))
+# Bearer token required to scrape /api/metrics/; without one the endpoint
+# is only served when DEBUG is on
+METRICS_AUTH_TOKEN = os.environ.get("METRICS_AUTH_TOKEN")
+
+# HEALTH CHECKS
+# Seconds a readiness result is reused before the dependencies are probed again
+HEALTH_CHECK_CACHE_SECONDS = float(os.environ.get("HEALTH_CHECK_CACHE_SECONDS", 5))
+# Per-dependency probe timeouts in seconds
+HEALTH_CHECK_TIMEOUTS = {
+    "database": float(os.environ.get("HEALTH_CHECK_DB_TIMEOUT", 2)),
+    "cache": float(os.environ.get("HEALTH_CHECK_CACHE_TIMEOUT", 1)),
+    "storage": float(os.environ.get("HEALTH_CHECK_STORAGE_TIMEOUT", 3)),
+}
+# Also probe the media storage backend (a network call with Cloudinary)
+HEALTH_CHECK_STORAGE = os.environ.get("HEALTH_CHECK_STORAGE", "false").lower() == "true"
+HEALTH_CHECK_STORAGE_PATH = os.environ.get("HEALTH_CHECK_STORAGE_PATH", "health-check")
+
 # ROOT URLCONF
 ROOT_URLCONF = "core.urls"
 
@@ -137,7 +164,7 @@ X_FRAME_OPTIONS = "SAMEORIGIN"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.ClaimsJWTAuthentication",
         "core.authentication.APIKeyAuthentication",
     ),
     "DEFAULT_PAGINATION_CLASS": "core.pagination.CustomPageNumberPagination",
@@ -161,6 +188,30 @@ SIMPLE_JWT = {
     "TOKEN_TYPE_CLAIM": "token_type",
     "BLACKLIST_AFTER_ROTATION": True,
 }
+# Build request.user from the access token claims instead of querying it on
+# every request. Claim changes are tracked in the default cache, so enable
+# this only with a cache shared by all workers.
+JWT_STATELESS_USER = os.environ.get("JWT_STATELESS_USER", "false").lower() == "true"
+# Seconds a fully loaded user is cached for endpoints that need every field
+USER_CACHE_TIMEOUT = int(os.environ.get("USER_CACHE_TIMEOUT", 60))
+# Blacklisted token JTIs are kept in memory; new entries are pulled every
+# SYNC seconds and the set is rebuilt without expired tokens every REBUILD
+REVOKED_TOKENS_SYNC_INTERVAL = float(os.environ.get("REVOKED_TOKENS_SYNC_INTERVAL", 5))
+REVOKED_TOKENS_REBUILD_INTERVAL = float(
+    os.environ.get("REVOKED_TOKENS_REBUILD_INTERVAL", 3600)
+)
+# Seconds before the newest synced entry that are read again on every sync,
+# for entries whose transaction committed late
+REVOKED_TOKENS_SYNC_OVERLAP = float(os.environ.get("REVOKED_TOKENS_SYNC_OVERLAP", 60))
+
+# OPENAPI SCHEMA
+# Built by `manage.py build_api_schema` and served from memory; without the
+# file it is generated once per process. API_SCHEMA_LIVE regenerates it on
+# every request instead, which is handy while changing the API.
+API_SCHEMA_FILE = os.environ.get(
+    "API_SCHEMA_FILE", os.path.join(BASE_DIR, "api-schema.json.gz")
+)
+API_SCHEMA_LIVE = os.environ.get("API_SCHEMA_LIVE", str(DEBUG)).lower() == "true"
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "Kinamel Nepal API",
@@ -203,11 +254,100 @@ CACHES = {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
     },
 }
+# The default cache is per process, so an entry cleared by one worker stays
+# in the others until it expires. Point CACHE_URL at Redis (needs `redis`)
+# to share it, which every deployment with more than one worker should do.
+CACHE_URL = os.environ.get("CACHE_URL")
+if CACHE_URL:
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": CACHE_URL,
+    }
 RATELIMIT_USE_CACHE = "cache-for-ratelimiting"
 
+# Rate-limit counters must be shared by every worker: they live in the
+# database unless a Redis cache is configured for them (needs `redis`).
+RATELIMIT_CACHE_URL = os.environ.get("RATELIMIT_CACHE_URL")
+if RATELIMIT_CACHE_URL:
+    CACHES[RATELIMIT_USE_CACHE] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": RATELIMIT_CACHE_URL,
+    }
+RATELIMIT_STORE = os.environ.get(
+    "RATELIMIT_STORE", "cache" if RATELIMIT_CACHE_URL else "database"
+)
+# Proxies (addresses or networks) whose X-Forwarded-For is trusted to name
+# the client that rate limits apply to; otherwise REMOTE_ADDR is used
+RATELIMIT_TRUSTED_PROXIES = [
+    proxy.strip()
+    for proxy in os.environ.get("RATELIMIT_TRUSTED_PROXIES", "").split(",")
+    if proxy.strip()
+]
+# Set to false to turn rate limiting off, e.g. while load testing
+RATELIMIT_ENABLE = os.environ.get("RATELIMIT_ENABLE", "true").lower() == "true"
+
+# Seconds a validated API key is cached before it is looked up again. A
+# deactivated key is dropped from the cache, but with a per-process cache
+# only in the worker that saved it: the others accept it for up to this long.
+API_KEY_CACHE_TIMEOUT = int(os.environ.get("API_KEY_CACHE_TIMEOUT", 60))
+# Slug/UUID -> pk lookups remembered per process by MultiLookupMixin
+LOOKUP_CACHE_SIZE = int(os.environ.get("LOOKUP_CACHE_SIZE", 2048))
+# Admin changelists bigger than this (by the planner's estimate, PostgreSQL
+# only) show an estimated count instead of running COUNT(*)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(
+    os.environ.get("ADMIN_ESTIMATED_COUNT_THRESHOLD", 10000)
+)
+# Seconds the table sizes that decide when to estimate are cached
+ADMIN_TABLE_ROWS_CACHE_TIMEOUT = int(
+    os.environ.get("ADMIN_TABLE_ROWS_CACHE_TIMEOUT", 300)
+)
+# Seconds the public order tracking lookup is cached (cleared on changes, in
+# every worker only with a shared cache)
+ORDER_TRACKING_CACHE_TIMEOUT = int(os.environ.get("ORDER_TRACKING_CACHE_TIMEOUT", 300))
+# Longest the active banners by location are cached. They are also dropped
+# when a banner changes (in every worker only with a shared cache) and when
+# the next one starts or ends
+BANNER_CACHE_TIMEOUT = int(os.environ.get("BANNER_CACHE_TIMEOUT", 300))
+# Seconds the category menu is cached (cleared when categories or their
+# product counts change)
+CATEGORY_MENU_CACHE_TIMEOUT = int(os.environ.get("CATEGORY_MENU_CACHE_TIMEOUT", 300))
+# Seconds the category slug -> id map used by product filters is cached
+# (cleared when categories change; slugs missing from it are looked up)
+CATEGORY_SLUG_CACHE_TIMEOUT = int(os.environ.get("CATEGORY_SLUG_CACHE_TIMEOUT", 300))
+# Characters in the plain-text excerpt of blogs shown in blog lists
+BLOG_EXCERPT_LENGTH = int(os.environ.get("BLOG_EXCERPT_LENGTH", 300))
+# Reading speed used for the reading time of blogs
+BLOG_WORDS_PER_MINUTE = int(os.environ.get("BLOG_WORDS_PER_MINUTE", 200))
+# Products whose detail documents are rendered and written together by a
+# background rebuild (see products.documents)
+PRODUCT_DOCUMENT_BATCH_SIZE = int(os.environ.get("PRODUCT_DOCUMENT_BATCH_SIZE", 100))
+# Rows validated and written per transaction by product imports
+PRODUCT_IMPORT_CHUNK_SIZE = int(os.environ.get("PRODUCT_IMPORT_CHUNK_SIZE", 1000))
+# Row errors kept on a product import job (all of them are counted)
+PRODUCT_IMPORT_MAX_ERRORS = int(os.environ.get("PRODUCT_IMPORT_MAX_ERRORS", 1000))
+# A running import that saved no chunk for this many seconds lost its worker
+# and is resumed by the next one that starts (see products.imports)
+PRODUCT_IMPORT_STALE_AFTER = int(os.environ.get("PRODUCT_IMPORT_STALE_AFTER", 300))
+# Uploaded import files are kept on local disk: they are read by the
+# process that received them, and the media storage only takes images.
+PRODUCT_IMPORT_ROOT = os.environ.get(
+    "PRODUCT_IMPORT_ROOT", os.path.join(BASE_DIR, "imports")
+)
+# Responsive copies saved for uploaded images (see core.images), never
+# wider than the original; AVIF is used when Pillow is built with it
+IMAGE_DERIVATIVE_WIDTHS = [
+    int(width)
+    for width in os.environ.get("IMAGE_DERIVATIVE_WIDTHS", "320,640,1024,1600").split(
+        ","
+    )
+]
+IMAGE_DERIVATIVE_FORMATS = os.environ.get("IMAGE_DERIVATIVE_FORMATS", "webp").split(",")
+IMAGE_DERIVATIVE_QUALITY = int(os.environ.get("IMAGE_DERIVATIVE_QUALITY", 80))
+IMAGE_THUMBNAIL_SIZE = int(os.environ.get("IMAGE_THUMBNAIL_SIZE", 160))
 
-def ratelimit_ip_meta_key(r):
-    return r.request.META.get("HTTP_X_CLIENT_IP", r.request.META.get("REMOTE_ADDR"))
+
+def ratelimit_ip_meta_key(request):
+    return request.META.get("HTTP_X_CLIENT_IP", request.META.get("REMOTE_ADDR"))
 
 
 RATELIMIT_IP_META_KEY = ratelimit_ip_meta_key
@@ -240,14 +380,53 @@ else:
     import dj_database_url
 
     DATABASES = {"default": dj_database_url.parse(os.environ.get("DATABASE_URL"))}
+    # dj-database-url 0.5 still maps postgres:// to the removed psycopg2 alias
+    if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql_psycopg2":
+        DATABASES["default"]["ENGINE"] = "django.db.backends.postgresql"
+
+# CONNECTION MANAGEMENT
+# Keep connections open between requests for DB_CONN_MAX_AGE seconds and check
+# they are still usable before reusing them. With DB_POOL enabled, connections
+# are instead checked out of an in-process pool and returned at the end of
+# every request.
+DB_POOL = os.environ.get("DB_POOL", "false").lower() == "true"
+# Seconds PostgreSQL connection attempts wait for the server (at least 2)
+DB_CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", 5))
+for database in DATABASES.values():
+    database["CONN_MAX_AGE"] = int(os.environ.get("DB_CONN_MAX_AGE", 60))
+    database["CONN_HEALTH_CHECKS"] = True
+    if database["ENGINE"] == "django.db.backends.postgresql":
+        database.setdefault("OPTIONS", {}).setdefault(
+            "connect_timeout", DB_CONNECT_TIMEOUT
+        )
+    if DB_POOL and database["ENGINE"] == "django.db.backends.postgresql":
+        database["ENGINE"] = "core.backends.postgresql_pool"
+        database["CONN_MAX_AGE"] = 0
+        database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 0)),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+            "pre_ping": os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true",
+        }
 
 
+# How IDs are generated, by name (see core.ids.STRATEGIES)
+ID_STRATEGIES = {
+    # Random, so one tracking number says nothing about the others.
+    "order_tracking_number": {"strategy": "random", "length": 12},
+    "user_slug": {"strategy": "time"},
+}
+
+# Run background tasks (e.g. emails) inline instead of on a worker thread
+TASKS_EAGER = os.environ.get("TASKS_EAGER", "false").lower() == "true"
+
 # For testing purposes, use SQLite in memory
 if "test" in sys.argv:
     DATABASES["default"] = {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
     }
+    TASKS_EAGER = True
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -288,7 +467,16 @@ STATICFILES_DIRS = [BASE_DIR / "core/static", BASE_DIR / "media"]
 
 # Media Files (User Uploads)
 MEDIA_URL = "/media/"
-MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+MEDIA_ROOT = os.environ.get("MEDIA_ROOT", os.path.join(BASE_DIR, "media"))
+# Let the web server send media files: "x-sendfile" (Apache, lighttpd) or
+# "x-accel-redirect" (nginx, with an internal location at the prefix that
+# aliases MEDIA_ROOT). Empty streams them from the WSGI server.
+MEDIA_SENDFILE = os.environ.get("MEDIA_SENDFILE", "").lower()
+MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get(
+    "MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/"
+)
+# Seconds browsers may cache media without content-hashed names
+MEDIA_CACHE_MAX_AGE = int(os.environ.get("MEDIA_CACHE_MAX_AGE", 3600))
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -405,9 +593,6 @@ UNFOLD = {
 STATICFILES_FINDERS = [
     "django.contrib.staticfiles.finders.FileSystemFinder",
     "django.contrib.staticfiles.finders.AppDirectoriesFinder",
-    "django_plotly_dash.finders.DashAssetFinder",
-    "django_plotly_dash.finders.DashComponentFinder",
-    "django_plotly_dash.finders.DashAppDirectoryFinder",
 ]
 
 # ASGI APPLICATION
@@ -420,7 +605,11 @@ CLOUDINARY_STORAGE = {
     "API_SECRET": os.environ.get("CLOUDINARY_API_SECRET"),
 }
 
-DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
+# Set to django.core.files.storage.FileSystemStorage to keep uploads in
+# MEDIA_ROOT, e.g. in development or without Cloudinary credentials
+DEFAULT_FILE_STORAGE = os.environ.get(
+    "DEFAULT_FILE_STORAGE", "cloudinary_storage.storage.MediaCloudinaryStorage"
+)
 
 
 EXCHANGE_RATE_API_KEY = os.environ.get("EXCHANGE_RATE_API_KEY")
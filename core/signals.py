@@ -0,0 +1,27 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import api_key_cache_key
+from .images import schedule_derivatives
+from .lookups import lookup_cache
+from .models import APIKey, BaseModel
+
+
+@receiver([post_save, post_delete], sender=APIKey)
+def invalidate_api_key_cache(sender, instance, **kwargs):
+    key = api_key_cache_key(instance.key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver([post_save, post_delete])
+def invalidate_lookup_cache(sender, instance, **kwargs):
+    if isinstance(instance, BaseModel):
+        lookup_cache.invalidate(instance)
+
+
+@receiver(post_save)
+def queue_image_derivatives(sender, instance, raw=False, **kwargs):
+    if getattr(sender, "derivative_fields", None) and not raw:
+        schedule_derivatives(instance)
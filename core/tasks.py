@@ -0,0 +1,90 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_queues = []
+
+
+class TaskQueue:
+    """
+    In-process queue of callables run one at a time by a background thread,
+    so slow side effects (SMTP, third-party calls) stay off the request.
+    Tasks are lost if the process is killed; use it for best-effort work.
+    """
+
+    def __init__(self, name, depth_gauge=None):
+        self.name = name
+        self.depth_gauge = depth_gauge
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        _queues.append(self)
+
+    def enqueue(self, func, *args, **kwargs):
+        """
+        Run `func(*args, **kwargs)` once the current transaction commits: in
+        the background, or right away when `TASKS_EAGER` is set (tests).
+        """
+        transaction.on_commit(lambda: self.submit(func, *args, **kwargs))
+
+    def submit(self, func, *args, **kwargs):
+        if settings.TASKS_EAGER:
+            func(*args, **kwargs)
+            return
+        self._start()
+        self._queue.put((func, args, kwargs))
+        self._report_depth()
+
+    def _start(self):
+        with self._lock:
+            # Threads don't survive a fork, so each worker starts its own.
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(
+                target=self._run, name=f"tasks-{self.name}", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            task = self._queue.get()
+            if task is None:
+                break
+            func, args, kwargs = task
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                logger.exception("Task %s failed in queue %s", func, self.name)
+            finally:
+                close_old_connections()
+                self._queue.task_done()
+                self._report_depth()
+
+    def _report_depth(self):
+        if self.depth_gauge is not None:
+            self.depth_gauge.set(self._queue.qsize())
+
+    def drain(self, timeout=None):
+        """Run the queued tasks, then stop the thread."""
+        if self._pid != os.getpid() or not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+def drain_all(timeout=None):
+    for task_queue in _queues:
+        task_queue.drain(timeout)
+
+
+atexit.register(drain_all, timeout=10)
@@ -0,0 +1,34 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from products.models import Product
+
+from .models import APIKey
+
+
+def create_product(sku=1001, **fields):
+    """Create a product with the required fields filled in."""
+    fields = {
+        "title": f"Product {sku}",
+        "new_price": 10,
+        "brand": "Acme",
+        **fields,
+    }
+    return Product.objects.create(sku=sku, **fields)
+
+
+@override_settings(
+    RATELIMIT_ENABLE=False,
+    DEFAULT_FILE_STORAGE="django.core.files.storage.FileSystemStorage",
+)
+class APITestCase(TestCase):
+    """
+    A test case for API requests: `self.client` sends an API key, rate
+    limits are off, media URLs are local and the cache starts out empty.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.api_key = APIKey.objects.create(name="tests")
+        self.client.defaults["HTTP_X_API_KEY"] = self.api_key.key
@@ -1 +1,307 @@
-# Create your tests here.
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib import admin
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from categories.models import Category
+from orders.models import Order, OrderItem
+from products.models import Product
+from users.models import User
+
+from .authentication import get_active_api_key
+from .checks import (
+    INVALIDATED_CACHE_TIMEOUTS,
+    check_metrics_token,
+    check_shared_cache,
+)
+from .health import run_checks
+from .ids import BlockAllocator, RandomStrategy, SequenceStrategy, get_generator
+from .media import serve_media
+from .models import APIKey, IdBlock
+from .pagination import EstimatedCountPaginator
+from .ratelimit import client_ip
+
+
+class APIKeyCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.api_key = APIKey.objects.create(name="tests")
+
+    def test_active_key_is_cached(self):
+        self.assertEqual(get_active_api_key(self.api_key.key), self.api_key)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_active_api_key(self.api_key.key), self.api_key)
+
+    def test_deactivated_key_is_dropped_on_commit(self):
+        get_active_api_key(self.api_key.key)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.api_key.is_active = False
+            self.api_key.save()
+        self.assertIsNone(get_active_api_key(self.api_key.key))
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_per_process_cache_is_reported(self):
+        self.assertEqual(
+            [error.id for error in check_shared_cache(None)], ["core.W001"]
+        )
+        with override_settings(**dict.fromkeys(INVALIDATED_CACHE_TIMEOUTS, 0)):
+            self.assertEqual(check_shared_cache(None), [])
+
+
+class ReadinessTests(TestCase):
+    def test_database_is_probed_on_the_calling_thread(self):
+        with CaptureQueriesContext(connection) as queries:
+            result = run_checks()
+        self.assertEqual(result["status"], "ready")
+        self.assertEqual(result["checks"]["database"]["status"], "ok")
+        self.assertIn("SELECT 1", [query["sql"] for query in queries])
+
+    def test_broken_database_connection_is_unavailable(self):
+        with (
+            mock.patch.object(
+                connection, "cursor", side_effect=DatabaseError("connection lost")
+            ),
+            mock.patch.object(connection, "close"),
+            self.assertLogs("core.health", "ERROR") as logs,
+        ):
+            result = run_checks()
+        self.assertEqual(result["status"], "unavailable")
+        # The error is logged, never returned by the public endpoint.
+        self.assertEqual(result["checks"]["database"], {"status": "error"})
+        self.assertIn("connection lost", logs.output[0])
+
+
+class ClientIPTests(SimpleTestCase):
+    def get(self, remote_addr, **headers):
+        return RequestFactory().get("/", REMOTE_ADDR=remote_addr, **headers)
+
+    def test_client_supplied_headers_are_ignored(self):
+        request = self.get(
+            "203.0.113.7",
+            HTTP_X_CLIENT_IP="198.51.100.1",
+            HTTP_X_FORWARDED_FOR="1.2.3.4",
+        )
+        self.assertEqual(client_ip(request), "203.0.113.7")
+
+    @override_settings(RATELIMIT_TRUSTED_PROXIES=["10.0.0.0/8"])
+    def test_forwarded_for_is_read_behind_trusted_proxies(self):
+        request = self.get(
+            "10.0.0.2", HTTP_X_FORWARDED_FOR="1.2.3.4, 203.0.113.7, 10.0.0.9"
+        )
+        # The client can prepend anything; the last untrusted hop is the one
+        # the proxies saw.
+        self.assertEqual(client_ip(request), "203.0.113.7")
+
+    @override_settings(RATELIMIT_TRUSTED_PROXIES=["10.0.0.0/8"])
+    def test_untrusted_peer_forwarded_for_is_ignored(self):
+        request = self.get("203.0.113.7", HTTP_X_FORWARDED_FOR="1.2.3.4")
+        self.assertEqual(client_ip(request), "203.0.113.7")
+
+
+class BlockAllocatorTests(TestCase):
+    def setUp(self):
+        self.allocator = BlockAllocator("tests", block_size=10)
+
+    def counter(self):
+        return IdBlock.objects.get(name="tests").next_value
+
+    def test_reserves_on_the_callers_connection_inside_a_transaction(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            values = [self.allocator.next() for _ in range(3)]
+        self.assertEqual(values, [0, 1, 2])
+        # Once committed, the rest of the block is used without a query.
+        with self.assertNumQueries(0):
+            self.assertEqual(self.allocator.next(), 3)
+        self.assertEqual(self.counter(), 10)
+
+    def test_block_of_a_rolled_back_transaction_is_dropped(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.assertEqual(self.allocator.next(), 0)
+            raise RuntimeError
+        self.assertFalse(IdBlock.objects.filter(name="tests").exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.allocator.next(), 0)
+        self.assertEqual(self.counter(), 10)
+
+    def test_blocks_follow_each_other(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            values = [self.allocator.next() for _ in range(25)]
+        self.assertEqual(values, list(range(25)))
+        self.assertEqual(self.counter(), 30)
+
+
+class AdminChangelistTests(TestCase):
+    # Queries of one changelist page, whatever the number of rows.
+    MAX_QUERIES = 8
+
+    def setUp(self):
+        self.client.force_login(
+            User.objects.create_superuser(
+                email="admin@example.com",
+                password="Passw0rd!x",
+                first_name="Ad",
+                last_name="Min",
+            )
+        )
+
+    def add_rows(self, start, count):
+        for sku in range(start, start + count):
+            category = Category.objects.create(name=f"Category {sku}")
+            product = Product.objects.create(
+                title=f"Product {sku}",
+                sku=sku,
+                new_price=10,
+                brand="Acme",
+                category=category,
+            )
+            order = Order.objects.create()
+            OrderItem.objects.create(order=order, product=product, quantity=1, price=10)
+
+    def changelist_queries(self, model):
+        url = reverse(
+            f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist"
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(queries)
+
+    def test_changelists_run_a_fixed_number_of_queries(self):
+        self.add_rows(1000, 1)
+        before = {
+            model: self.changelist_queries(model) for model in admin.site._registry
+        }
+        self.add_rows(2000, 3)
+        for model, queries in before.items():
+            with self.subTest(model=model._meta.label):
+                self.assertLessEqual(queries, self.MAX_QUERIES)
+                self.assertEqual(self.changelist_queries(model), queries)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        for name in ("one", "two", "three"):
+            APIKey.objects.create(name=name)
+        vendor = mock.patch.object(connection, "vendor", "postgresql")
+        vendor.start()
+        self.addCleanup(vendor.stop)
+
+    def count(self, table_rows, plan_rows=None):
+        plan = json.dumps([{"Plan": {"Plan Rows": plan_rows}}])
+        with (
+            mock.patch("core.pagination.estimated_table_rows", return_value=table_rows),
+            mock.patch(
+                "django.db.models.QuerySet.explain", return_value=plan
+            ) as explain,
+        ):
+            count = EstimatedCountPaginator(APIKey.objects.order_by("pk"), 10).count
+        return count, explain.called
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1000)
+    def test_small_tables_are_counted_without_explain(self):
+        self.assertEqual(self.count(table_rows=500), (3, False))
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1000)
+    def test_big_tables_use_the_planner_estimate(self):
+        self.assertEqual(self.count(table_rows=10**6, plan_rows=50000), (50000, True))
+        # A filter that leaves few rows is counted exactly.
+        self.assertEqual(self.count(table_rows=10**6, plan_rows=20), (3, True))
+
+
+class MediaTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for name in ("notes.txt", "backup.tar.gz"):
+            with open(os.path.join(directory, name), "wb") as file:
+                file.write(b"0123456789")
+        media_root = override_settings(MEDIA_ROOT=directory, MEDIA_SENDFILE="")
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+
+    def get(self, path="notes.txt", **headers):
+        response = serve_media(RequestFactory().get(f"/media/{path}", **headers), path)
+        if response.streaming:
+            return response, b"".join(response.streaming_content)
+        return response, response.content
+
+    def test_byte_ranges(self):
+        for header, content in [
+            ("bytes=2-5", b"2345"),
+            ("bytes=7-", b"789"),
+            ("bytes=-3", b"789"),
+            ("bytes=8-100", b"89"),
+        ]:
+            with self.subTest(header):
+                response, body = self.get(HTTP_RANGE=header)
+                self.assertEqual((response.status_code, body), (206, content))
+                self.assertEqual(response["Content-Length"], str(len(content)))
+
+    def test_unsatisfiable_ranges(self):
+        for header in ("bytes=10-", "bytes=-0"):
+            with self.subTest(header):
+                response, _ = self.get(HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response["Content-Range"], "bytes */10")
+
+    def test_unsupported_or_stale_ranges_send_the_whole_file(self):
+        for headers in [
+            {"HTTP_RANGE": "bytes=0-1,4-5"},
+            {"HTTP_RANGE": "bytes=5-2"},
+            {"HTTP_RANGE": "bytes=2-5", "HTTP_IF_RANGE": '"stale"'},
+        ]:
+            with self.subTest(headers):
+                response, body = self.get(**headers)
+                self.assertEqual((response.status_code, body), (200, b"0123456789"))
+
+    def test_compressed_files_are_not_content_encoded(self):
+        response, body = self.get("backup.tar.gz")
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(body, b"0123456789")
+
+
+@override_settings(RATELIMIT_ENABLE=False)
+class MetricsTests(TestCase):
+    def scrape(self, **headers):
+        return self.client.get("/api/metrics/", **headers).status_code
+
+    @override_settings(METRICS_AUTH_TOKEN=None, DEBUG=False)
+    def test_metrics_need_a_token(self):
+        self.assertEqual(self.scrape(), 403)
+        self.assertEqual(check_metrics_token(None)[0].id, "core.W002")
+
+    @override_settings(METRICS_AUTH_TOKEN="scrape-token")
+    def test_metrics_are_served_with_the_token(self):
+        self.assertEqual(self.scrape(HTTP_AUTHORIZATION="Bearer wrong"), 403)
+        self.assertEqual(self.scrape(HTTP_AUTHORIZATION="Bearer scrape-token"), 200)
+        self.assertEqual(check_metrics_token(None), [])
+
+
+class SequenceStrategyTests(SimpleTestCase):
+    def test_permutes_the_whole_space(self):
+        strategy = SequenceStrategy("tests", length=3)
+        values = [strategy.permute(value) for value in range(strategy.space)]
+        self.assertEqual(sorted(values), list(range(strategy.space)))
+        # Consecutive values aren't a fixed distance apart.
+        steps = {(b - a) % strategy.space for a, b in zip(values, values[1:])}
+        self.assertGreater(len(steps), strategy.space // 2)
+
+    def test_permutation_is_keyed_with_the_secret_key(self):
+        permuted = SequenceStrategy("tests").permute(1)
+        with override_settings(SECRET_KEY="another secret key"):
+            self.assertNotEqual(SequenceStrategy("tests").permute(1), permuted)
+        self.assertNotEqual(SequenceStrategy("others").permute(1), permuted)
+
+    def test_tracking_numbers_are_random(self):
+        self.assertIsInstance(get_generator("order_tracking_number"), RandomStrategy)
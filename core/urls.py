@@ -1,19 +1,25 @@
-from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path, re_path
-from django.views.static import serve
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularSwaggerView
 from rest_framework.routers import DefaultRouter
 
-from .views import APIKeyViewSet, HealthCheckView
+from .media import serve_media
+from .schema import CachedSpectacularAPIView
+from .views import (
+    APIKeyViewSet,
+    HealthCheckView,
+    LivenessView,
+    MetricsView,
+    ReadinessView,
+    RequestStatsView,
+)
 
 router = DefaultRouter()
 router.register(r"keys", APIKeyViewSet, basename="api-key")
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("api/schema/", SpectacularAPIView.as_view(), name="api-schema"),
+    path("api/schema/", CachedSpectacularAPIView.as_view(), name="api-schema"),
     path(
         "api/docs/",
         SpectacularSwaggerView.as_view(url_name="api-schema"),
@@ -21,6 +27,10 @@ urlpatterns = [
     ),
     path("ckeditor/", include("ckeditor_uploader.urls")),
     path("api/health-check/", HealthCheckView.as_view(), name="health-check"),
+    path("api/health/live/", LivenessView.as_view(), name="health-live"),
+    path("api/health/ready/", ReadinessView.as_view(), name="health-ready"),
+    path("api/request-stats/", RequestStatsView.as_view(), name="request-stats"),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
     path("api/user/", include("users.urls"), name="user-apis"),
     path("api/category/", include("categories.urls"), name="category-apis"),
     path("api/product/", include("products.urls"), name="product-apis"),
@@ -37,6 +47,7 @@ urlpatterns = [
         name="terms-and-conditions-apis",
     ),
     path("api/", include("orders.urls"), name="order-apis"),
+    path("api/analytics/", include("analytics.urls"), name="analytics-apis"),
     path(
         "api/privacy-policy/",
         include("privacy_policy.urls"),
@@ -49,11 +60,7 @@ urlpatterns = [
 ]
 
 
-# Serve media files when DEBUG=False (production)
-if not settings.DEBUG:
-    urlpatterns += [
-        re_path(r"^media/(?P<path>.*)$", serve, {"document_root": settings.MEDIA_ROOT}),
-    ]
-
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Media files in MEDIA_ROOT, when they aren't served by the web server or a CDN
+urlpatterns += [
+    re_path(r"^media/(?P<path>.*)$", serve_media, name="media"),
+]
@@ -8,11 +8,15 @@ from rest_framework import serializers
 
 
 def generate_4_digit_unique_pass_code(model):
-
-    while True:
-        pass_code = random.randint(1000, 9999)
-        if not model.objects.filter(pass_code=pass_code).exists():
-            return pass_code
+    """
+    Pick a random pass code not used by `model`, with one query however
+    full the 4-digit space is.
+    """
+    used = set(model.objects.values_list("pass_code", flat=True))
+    free = [code for code in range(1000, 10000) if code not in used]
+    if not free:
+        raise ValueError("Every 4-digit pass code is in use.")
+    return random.choice(free)
 
 
 _thread_locals = threading.local()
@@ -1,162 +1,299 @@
-from django_countries import countries
-from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
-from geopy.geocoders import Nominatim
-from rest_framework import filters, status, viewsets
-from rest_framework.decorators import action
-from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
-from rest_framework.response import Response
-from rest_framework.views import APIView
-
-from core.mixins import BulkOperationsMixin, MultiLookupMixin
-from core.utils import generate_bulk_schema_view, generate_crud_schema_view
-
-from .models import APIKey
-from .serializers import APIKeySerializer, GeoLocationSerializer
-
-
-@extend_schema(
-    responses={200: OpenApiResponse(description="List of countries")}, tags=["Core"]
-)
-class CountryListView(APIView):
-    def get(self, request):
-        country_choices = [(code, name) for code, name in countries]
-        return Response(country_choices)
-
-
-@extend_schema(
-    tags=["Core"],
-    parameters=[
-        OpenApiParameter(
-            name="address",
-            description="The address to geocode",
-            required=True,
-            type=str,
-            location=OpenApiParameter.QUERY,
-        )
-    ],
-    responses={
-        200: GeoLocationSerializer,
-        400: OpenApiResponse(description="Bad request - Missing address parameter"),
-        404: OpenApiResponse(description="Address not found"),
-    },
-)
-class GeoLocationView(APIView):
-    def get(self, request):
-        address = request.GET.get("address", "")
-        if not address:
-            return Response({"error": "No address provided"}, status=400)
-
-        geolocator = Nominatim(user_agent="my_django_app (contact@yourdomain.com)")
-
-        location = geolocator.geocode(address)
-        if location:
-            return Response(
-                {"latitude": location.latitude, "longitude": location.longitude}
-            )
-
-        return Response({"error": "Address not found"}, status=404)
-
-
-class BaseViewSet(viewsets.ModelViewSet):
-    permission_classes_by_action = {
-        "list": [AllowAny],
-        "retrieve": [AllowAny],
-        "default": [IsAdminUser],
-    }
-
-    lookup_field = "pk"
-    lookup_url_kwarg = "pk"
-
-    filter_backends = [
-        DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
-    ]
-    ordering = ["-created_at"]
-
-    def get_permissions(self):
-        return [
-            permission()
-            for permission in self.permission_classes_by_action.get(
-                self.action, self.permission_classes_by_action["default"]
-            )
-        ]
-
-    def paginate_queryset(self, queryset):
-        all_param = self.request.query_params.get("all")
-        if all_param == "true":
-            return None
-        return super().paginate_queryset(queryset)
-
-
-@generate_bulk_schema_view("API Key", APIKeySerializer)
-@generate_crud_schema_view("API Key")
-class APIKeyViewSet(MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
-    """
-    ViewSet restricted to superusers only for managing API keys.
-    """
-
-    queryset = APIKey.objects.all().order_by("-created_at")
-    serializer_class = APIKeySerializer
-    permission_classes = [IsAuthenticated, IsAdminUser]
-    bulk_schema_tag = "API Key"
-
-    def create(self, request, *args, **kwargs):
-        """
-        Create API Key (auto-generated).
-        """
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
-
-    @extend_schema(
-        tags=["API Key"],
-        summary="Deactivate API Key",
-        description="Deactivate a specific API key by setting its `is_active` field to `False`.",
-        responses={200: OpenApiTypes.OBJECT},
-    )
-    @action(
-        detail=True,
-        methods=["post"],
-        permission_classes=[IsAuthenticated, IsAdminUser],
-    )
-    def deactivate(self, request, pk=None):
-        """
-        Deactivate an API key.
-        """
-        api_key = self.get_object()
-        api_key.is_active = False
-        api_key.save()
-        return Response({"status": "API key deactivated"}, status=status.HTTP_200_OK)
-
-
-class HealthCheckView(APIView):
-    """
-    A simple health-check endpoint to verify the API's availability.
-    """
-
-    @extend_schema(
-        summary="Health Check API",
-        tags=["Test"],
-        description="Returns the health status of the API.",
-        responses={
-            200: {
-                "type": "object",
-                "properties": {
-                    "status": {"type": "string", "example": "healthy"},
-                    "message": {
-                        "type": "string",
-                        "example": "The API is running smoothly.",
-                    },
-                },
-            }
-        },
-    )
-    def get(self, request):
-        return Response(
-            {"status": "healthy", "message": "The API is running smoothly."},
-            status=status.HTTP_200_OK,
-        )
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
+from django_countries import countries
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework import filters, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.health import get_readiness
+from core.instrumentation import endpoint_stats
+from core.metrics import REGISTRY
+from core.mixins import BulkOperationsMixin, MultiLookupMixin
+from core.utils import generate_bulk_schema_view, generate_crud_schema_view
+
+from .models import APIKey
+from .serializers import APIKeySerializer, GeoLocationSerializer
+
+
+@extend_schema(
+    responses={200: OpenApiResponse(description="List of countries")}, tags=["Core"]
+)
+class CountryListView(APIView):
+    def get(self, request):
+        country_choices = [(code, name) for code, name in countries]
+        return Response(country_choices)
+
+
+@extend_schema(
+    tags=["Core"],
+    parameters=[
+        OpenApiParameter(
+            name="address",
+            description="The address to geocode",
+            required=True,
+            type=str,
+            location=OpenApiParameter.QUERY,
+        )
+    ],
+    responses={
+        200: GeoLocationSerializer,
+        400: OpenApiResponse(description="Bad request - Missing address parameter"),
+        404: OpenApiResponse(description="Address not found"),
+    },
+)
+class GeoLocationView(APIView):
+    def get(self, request):
+        address = request.GET.get("address", "")
+        if not address:
+            return Response({"error": "No address provided"}, status=400)
+
+        # geopy is only needed here, so it is imported on first use.
+        from geopy.geocoders import Nominatim
+
+        geolocator = Nominatim(user_agent="my_django_app (contact@yourdomain.com)")
+
+        location = geolocator.geocode(address)
+        if location:
+            return Response(
+                {"latitude": location.latitude, "longitude": location.longitude}
+            )
+
+        return Response({"error": "Address not found"}, status=404)
+
+
+class BaseViewSet(viewsets.ModelViewSet):
+    permission_classes_by_action = {
+        "list": [AllowAny],
+        "retrieve": [AllowAny],
+        "default": [IsAdminUser],
+    }
+    # Action -> [RateLimit, ...]; actions not listed are not limited.
+    ratelimit_by_action = {}
+
+    lookup_field = "pk"
+    lookup_url_kwarg = "pk"
+
+    filter_backends = [
+        DjangoFilterBackend,
+        filters.SearchFilter,
+        filters.OrderingFilter,
+    ]
+    ordering = ["-created_at"]
+
+    def get_permissions(self):
+        return [
+            permission()
+            for permission in self.permission_classes_by_action.get(
+                self.action, self.permission_classes_by_action["default"]
+            )
+        ]
+
+    def get_throttles(self):
+        if not settings.RATELIMIT_ENABLE:
+            return []
+        return [
+            ratelimit()
+            for ratelimit in self.ratelimit_by_action.get(
+                self.action, self.ratelimit_by_action.get("default", [])
+            )
+        ]
+
+    def check_throttles(self, request):
+        # Stop at the first limit hit so rejected requests don't count
+        # against the remaining limits.
+        for throttle in self.get_throttles():
+            if not throttle.allow_request(request, self):
+                self.throttled(request, throttle.wait())
+
+    def paginate_queryset(self, queryset):
+        all_param = self.request.query_params.get("all")
+        if all_param == "true":
+            return None
+        return super().paginate_queryset(queryset)
+
+
+@generate_bulk_schema_view("API Key", APIKeySerializer)
+@generate_crud_schema_view("API Key")
+class APIKeyViewSet(MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
+    """
+    ViewSet restricted to superusers only for managing API keys.
+    """
+
+    queryset = APIKey.objects.all().order_by("-created_at")
+    serializer_class = APIKeySerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    bulk_schema_tag = "API Key"
+
+    def create(self, request, *args, **kwargs):
+        """
+        Create API Key (auto-generated).
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        tags=["API Key"],
+        summary="Deactivate API Key",
+        description="Deactivate a specific API key by setting its `is_active` field to `False`.",
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[IsAuthenticated, IsAdminUser],
+    )
+    def deactivate(self, request, pk=None):
+        """
+        Deactivate an API key.
+        """
+        api_key = self.get_object()
+        api_key.is_active = False
+        api_key.save()
+        return Response({"status": "API key deactivated"}, status=status.HTTP_200_OK)
+
+
+class HealthCheckView(APIView):
+    """
+    A simple health-check endpoint to verify the API's availability.
+    """
+
+    @extend_schema(
+        summary="Health Check API",
+        tags=["Test"],
+        description="Returns the health status of the API.",
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "status": {"type": "string", "example": "healthy"},
+                    "message": {
+                        "type": "string",
+                        "example": "The API is running smoothly.",
+                    },
+                },
+            }
+        },
+    )
+    def get(self, request):
+        return Response(
+            {"status": "healthy", "message": "The API is running smoothly."},
+            status=status.HTTP_200_OK,
+        )
+
+
+class LivenessView(APIView):
+    """
+    Liveness probe: the process is up and serving requests. It does not touch
+    any dependency, so a slow database never gets the worker restarted.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        summary="Liveness Probe",
+        tags=["Test"],
+        description="Returns 200 while the worker process is able to serve requests.",
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        return Response({"status": "alive"}, status=status.HTTP_200_OK)
+
+
+class ReadinessView(APIView):
+    """
+    Readiness probe: times a database round trip, a cache set/get and
+    optionally the media storage backend. Returns 503 when any of them fails
+    or exceeds its timeout.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        summary="Readiness Probe",
+        tags=["Test"],
+        description="Checks the database, cache and (optionally) media storage, returning per-dependency latencies. Results are cached for `HEALTH_CHECK_CACHE_SECONDS`.",
+        responses={
+            200: OpenApiTypes.OBJECT,
+            503: OpenApiResponse(description="A dependency is unavailable"),
+        },
+    )
+    def get(self, request):
+        result = get_readiness()
+        response_status = (
+            status.HTTP_200_OK
+            if result["status"] == "ready"
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        return Response(result, status=response_status)
+
+
+class RequestStatsView(APIView):
+    """
+    Per-endpoint request statistics (latency, query counts, duplicate queries
+    and DB/serializer/render time) aggregated by this worker process.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        summary="Request Statistics",
+        tags=["Test"],
+        description="Returns per-endpoint latency histograms, query counts, duplicate-query (N+1) statistics and DB, serializer and render timings collected by this process.",
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        return Response(endpoint_stats.snapshot(), status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Reset Request Statistics",
+        tags=["Test"],
+        description="Clears the request statistics collected by this process.",
+        responses={204: None},
+    )
+    def delete(self, request):
+        endpoint_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class MetricsView(APIView):
+    """
+    Prometheus scrape endpoint. Whitelisted in `APIKeyMiddleware`, so the
+    scraper must send `METRICS_AUTH_TOKEN` as a bearer token; without a
+    token it is only served when DEBUG is on.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        summary="Prometheus Metrics",
+        tags=["Test"],
+        description="Request throughput, latency, query counts and cache hit ratios in the Prometheus text exposition format, aggregated across worker processes.",
+        responses={
+            200: OpenApiTypes.STR,
+            403: OpenApiResponse(description="Missing or invalid metrics token"),
+        },
+    )
+    def get(self, request):
+        token = settings.METRICS_AUTH_TOKEN
+        if token:
+            provided = request.headers.get("Authorization", "").removeprefix("Bearer ")
+            if not hmac.compare_digest(provided.encode(), token.encode()):
+                return HttpResponse("Invalid metrics token.", status=403)
+        elif not settings.DEBUG:
+            return HttpResponse("Set METRICS_AUTH_TOKEN to serve metrics.", status=403)
+
+        return HttpResponse(
+            REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
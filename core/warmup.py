@@ -0,0 +1,69 @@
+import time
+from contextlib import contextmanager
+
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+@contextmanager
+def _step(timings, name):
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round((time.perf_counter() - started_at) * 1000, 2)
+
+
+def _iter_views(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _iter_views(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, "cls", None)
+            if view_class is not None:
+                yield view_class
+
+
+def warm_urlconf():
+    resolver = get_resolver()
+    # Populates the reverse lookup tables as well as importing every view.
+    resolver.reverse_dict
+    return resolver
+
+
+def warm_serializers(resolver):
+    """Build the fields of every serializer used by a routed view."""
+    serializer_classes = {
+        view_class.serializer_class
+        for view_class in _iter_views(resolver.url_patterns)
+        if getattr(view_class, "serializer_class", None) is not None
+    }
+    for serializer_class in serializer_classes:
+        try:
+            serializer_class().fields
+        except Exception:
+            # Serializers that need request context are built on first use.
+            continue
+    return len(serializer_classes)
+
+
+def warm_schema():
+    from core.schema import get_schema
+
+    return get_schema()
+
+
+def warm_up(schema=True):
+    """
+    Import and initialise the lazily built parts of the application so the
+    first requests served by a new worker don't pay for them. Returns the
+    time spent on each step in milliseconds.
+    """
+    timings = {}
+    with _step(timings, "urlconf"):
+        resolver = warm_urlconf()
+    with _step(timings, "serializers"):
+        warm_serializers(resolver)
+    if schema:
+        with _step(timings, "schema"):
+            warm_schema()
+    return timings
@@ -0,0 +1,100 @@
+import glob
+import multiprocessing
+import os
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+# Gunicorn reads this file automatically when started from the project root:
+#   gunicorn
+# Every value can be overridden with the matching environment variable. To
+# serve the ASGI application instead, install uvicorn and set
+# GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker.
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+
+# Requests mostly wait on PostgreSQL, so a few threads per process serve
+# concurrent requests without the memory cost of extra processes.
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+wsgi_app = (
+    "core.asgi:application" if "uvicorn" in worker_class else "core.wsgi:application"
+)
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Import the application once in the master so workers fork with the code
+# already loaded and share its memory.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Recycle workers after a jittered number of requests so slow leaks can't
+# accumulate and workers don't all restart at once.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+# Warm the schema as well as the URLconf and serializers in each worker.
+warmup_schema = os.environ.get("GUNICORN_WARMUP_SCHEMA", "true").lower() == "true"
+
+
+def on_starting(server):
+    # Metric files left by a previous run would be merged into the new one.
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        for path in glob.glob(os.path.join(directory, "metrics_*.json")):
+            os.remove(path)
+
+
+def when_ready(server):
+    # With the app preloaded, import the URLconf, build serializers and load
+    # the schema once in the master so every forked worker shares them.
+    if server.cfg.preload_app:
+        from core.warmup import warm_up
+
+        server.log.info("Master warmed up: %s", warm_up(schema=warmup_schema))
+
+
+def post_fork(server, worker):
+    # Connections opened by the master while preloading must not be shared.
+    if server.cfg.preload_app:
+        from django.db import connections
+
+        connections.close_all()
+
+
+def post_worker_init(worker):
+    from core.warmup import warm_up
+
+    timings = warm_up(schema=warmup_schema)
+    worker.log.info("Worker %s warmed up: %s", worker.pid, timings)
+
+    # Pick up the product imports that recycled or killed workers left.
+    from products.imports import resume_imports
+
+    try:
+        job_ids = resume_imports()
+    except Exception:
+        worker.log.exception("Product imports could not be resumed")
+    else:
+        if job_ids:
+            worker.log.info("Resuming product imports %s", job_ids)
+
+
+def worker_exit(server, worker):
+    # Hand running imports back after their current chunk, then send the
+    # emails still queued before the worker goes away.
+    from core.tasks import drain_all
+    from products.imports import stop_imports
+
+    stop_imports()
+    drain_all(timeout=graceful_timeout)
+
+
+def child_exit(server, worker):
+    from core.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
@@ -2,14 +2,18 @@ from django import forms
 from django.contrib import admin
 from django.utils.html import format_html
 from unfold.admin import ModelAdmin
+from unfold.contrib.filters.admin import RangeNumericFilter
 
-from core.admin import SoftDeleteAdmin
-from core.mixins import FormatBaseModelFieldsMixin, HideBaseModelFieldsMixin
+from analytics.rollups import invalidate_day
+from core.admin import AutocompleteFilter, SoftDeleteAdmin
+from core.mixins import (
+    ExportActionsMixin,
+    FormatBaseModelFieldsMixin,
+    HideBaseModelFieldsMixin,
+)
 
 from .models import Order, OrderItem
 
-DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
-
 
 # Custom form for Order model
 class OrderAdminForm(forms.ModelForm):
@@ -20,7 +24,11 @@ class OrderAdminForm(forms.ModelForm):
 
 @admin.register(Order)
 class OrderAdmin(
-    HideBaseModelFieldsMixin, FormatBaseModelFieldsMixin, SoftDeleteAdmin, ModelAdmin
+    ExportActionsMixin,
+    HideBaseModelFieldsMixin,
+    FormatBaseModelFieldsMixin,
+    SoftDeleteAdmin,
+    ModelAdmin,
 ):
     form = OrderAdminForm
     list_display = (
@@ -48,21 +56,20 @@ class OrderAdmin(
         "order_status",
         "payment_method",
         "payment_status",
-        "shipping_address",
-        "billing_address",
+        ("shipping_address", AutocompleteFilter),
+        ("billing_address", AutocompleteFilter),
     )
+    list_filter_submit = True
     ordering = ("-created_at", "order_status")
     readonly_fields = ("created_at", "updated_at")
 
-    def formatted_created_at(self, obj):
-        return obj.created_at.strftime(DATE_FORMAT)
-
-    formatted_created_at.short_description = "Created At"
-
-    def formatted_updated_at(self, obj):
-        return obj.updated_at.strftime(DATE_FORMAT)
-
-    formatted_updated_at.short_description = "Updated At"
+    def perform_bulk_update(self, queryset, **changes):
+        days = list(queryset.datetimes("created_at", "day"))
+        updated = super().perform_bulk_update(queryset, **changes)
+        # Soft deletes and restores change the rollups of those days.
+        for day in days:
+            invalidate_day(day)
+        return updated
 
     def shipping_address_display(self, obj):
         if obj.shipping_address:
@@ -88,7 +95,11 @@ class OrderItemAdminForm(forms.ModelForm):
 
 @admin.register(OrderItem)
 class OrderItemAdmin(
-    HideBaseModelFieldsMixin, FormatBaseModelFieldsMixin, SoftDeleteAdmin, ModelAdmin
+    ExportActionsMixin,
+    HideBaseModelFieldsMixin,
+    FormatBaseModelFieldsMixin,
+    SoftDeleteAdmin,
+    ModelAdmin,
 ):
     list_display = (
         "id",
@@ -103,20 +114,26 @@ class OrderItemAdmin(
         "total_display",
         "product_image",
     )
+    list_select_related = ("order", "product")
     search_fields = ("order__id", "product__title", "quantity")
-    list_filter = ("order", "product", "quantity", "price", "discount")
+    list_filter = (
+        ("order", AutocompleteFilter),
+        ("product", AutocompleteFilter),
+        ("quantity", RangeNumericFilter),
+        ("price", RangeNumericFilter),
+        ("discount", RangeNumericFilter),
+    )
+    list_filter_submit = True
     ordering = ("-created_at", "product__title")
     readonly_fields = ("created_at", "updated_at")
 
-    def formatted_created_at(self, obj):
-        return obj.created_at.strftime(DATE_FORMAT)
-
-    formatted_created_at.short_description = "Created At"
-
-    def formatted_updated_at(self, obj):
-        return obj.updated_at.strftime(DATE_FORMAT)
-
-    formatted_updated_at.short_description = "Updated At"
+    def perform_bulk_update(self, queryset, **changes):
+        # Items are rolled up on the day of their order.
+        days = list(queryset.datetimes("order__created_at", "day"))
+        updated = super().perform_bulk_update(queryset, **changes)
+        for day in days:
+            invalidate_day(day)
+        return updated
 
     def total_display(self, obj):
         return f"Rs {obj.total:.2f}"
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:49
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def dedupe_tracking_numbers(apps, schema_editor):
+    Order = apps.get_model("orders", "Order")
+    Order._base_manager.filter(tracking_number="").update(tracking_number=None)
+    duplicates = (
+        Order._base_manager.values("tracking_number")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .values_list("tracking_number", flat=True)
+    )
+    for order in Order._base_manager.filter(tracking_number__in=list(duplicates)):
+        order.tracking_number = f"{order.tracking_number}-{order.pk}"
+        order.save(update_fields=["tracking_number"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0009_alter_order_created_by_alter_order_deleted_by_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_tracking_numbers, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="order",
+            name="tracking_number",
+            field=models.CharField(
+                blank=True, editable=False, max_length=255, null=True, unique=True
+            ),
+        ),
+    ]
@@ -76,7 +76,7 @@ class Order(BaseModel):
     is_shipped = models.BooleanField(default=False)
     shipped_at = models.DateTimeField(blank=True, null=True)
     tracking_number = models.CharField(
-        max_length=255, blank=True, null=True, editable=False
+        max_length=255, blank=True, null=True, editable=False, unique=True
     )
     delivery_estimate = models.DateTimeField(blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
@@ -92,6 +92,27 @@ class Order(BaseModel):
     )
     is_completed = models.BooleanField(default=False)
 
+    export_fields = [
+        ("ID", "id"),
+        ("Tracking Number", "tracking_number"),
+        ("Created At", "created_at"),
+        ("Customer", "full_name"),
+        ("Email", "email"),
+        ("Phone Number", "phone_number"),
+        ("User ID", "user_id"),
+        ("Order Status", "order_status"),
+        ("Payment Method", "payment_method"),
+        ("Payment Status", "payment_status"),
+        ("Paid At", "paid_at"),
+        ("Subtotal", "subtotal"),
+        ("Shipping Cost", "shipping_cost"),
+        ("Tax", "tax"),
+        ("Discount", "discount"),
+        ("Total", "total"),
+        ("Shipped At", "shipped_at"),
+        ("Completed", "is_completed"),
+    ]
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name_plural = "Orders"
@@ -115,6 +136,20 @@ class OrderItem(BaseModel):
     discount = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     total = models.DecimalField(max_digits=10, decimal_places=2)
 
+    export_fields = [
+        ("ID", "id"),
+        ("Order ID", "order_id"),
+        ("Order Created At", "order__created_at"),
+        ("Order Status", "order__order_status"),
+        ("Product ID", "product_id"),
+        ("Product", "product__title"),
+        ("SKU", "product__sku"),
+        ("Quantity", "quantity"),
+        ("Price", "price"),
+        ("Discount", "discount"),
+        ("Total", "total"),
+    ]
+
     class Meta:
         verbose_name_plural = "Order Items"
 
@@ -1,17 +1,20 @@
 import os
+import time
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
 from django.template.loader import render_to_string
 from django.utils import timezone
-from django.utils.crypto import get_random_string
 from rest_framework import serializers
 
 from accounts.models import Address
 from accounts.serializers import AddressSerializer
 from carts.models import Cart
 from carts.serializers import CartSerializer
+from core.ids import generate_id, save_with_unique_id
+from core.metrics import checkout_lock_wait_seconds
 from core.serializers import BaseModelSerializer
 from payments.serializers import PaymentSerializer
 from products.models import Product
@@ -232,20 +235,41 @@ class OrderSerializer(BaseModelSerializer):
 
         validated_data["subtotal"] = subtotal
         validated_data["total"] = total
-        validated_data["tracking_number"] = self.generate_unique_tracking_number()
         validated_data["cart"] = cart
-        order = super().create(validated_data)
-
-        for item in cart_items:
-            OrderItem.objects.create(
-                order=order,
-                product=item.product,
-                quantity=item.quantity,
-                price=item.product.new_price,
-                discount=0,
+        create = super().create
+        # The order, its items and the stock updates commit together.
+        with transaction.atomic():
+            order = save_with_unique_id(
+                lambda: create(validated_data),
+                lambda: validated_data.update(
+                    tracking_number=self.generate_unique_tracking_number()
+                ),
+                "tracking_number",
             )
-            item.product.quantity -= item.quantity
-            item.product.save()
+
+            # Lock the ordered products so concurrent checkouts can't
+            # overwrite each other's stock updates, in pk order so two
+            # checkouts of the same products can't deadlock.
+            lock_started_at = time.perf_counter()
+            products = {
+                product.pk: product
+                for product in Product._base_manager.select_for_update()
+                .filter(pk__in=[item.product_id for item in cart_items])
+                .order_by("pk")
+            }
+            checkout_lock_wait_seconds.observe(time.perf_counter() - lock_started_at)
+
+            for item in cart_items:
+                product = products.get(item.product_id, item.product)
+                OrderItem.objects.create(
+                    order=order,
+                    product=product,
+                    quantity=item.quantity,
+                    price=product.new_price,
+                    discount=0,
+                )
+                product.quantity -= item.quantity
+                product.save()
 
         self.send_order_confirmation_email(order)
 
@@ -268,15 +292,10 @@ class OrderSerializer(BaseModelSerializer):
 
     def generate_unique_tracking_number(self):
         """
-        Generate a unique tracking number using a mix of uppercase letters and digits.
-        Ensures no conflict with existing orders.
+        Generate a 12 character tracking number of uppercase letters and
+        digits from the ID service; see `ID_STRATEGIES`.
         """
-        while True:
-            tracking_number = get_random_string(
-                length=12, allowed_chars="ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
-            )
-            if not Order.objects.filter(tracking_number=tracking_number).exists():
-                return tracking_number
+        return generate_id("order_tracking_number")
 
     def update_product_stock(self, products_data):
         """
@@ -355,6 +374,13 @@ class OrderSerializer(BaseModelSerializer):
             product.save()
 
 
+class OrderTrackingSerializer(serializers.Serializer):
+    tracking_number = serializers.CharField()
+    order_status = serializers.CharField()
+    shipped_at = serializers.DateTimeField(allow_null=True)
+    delivery_estimate = serializers.DateTimeField(allow_null=True)
+
+
 class OrderItemSerializer(BaseModelSerializer):
     order = OrderSerializer(read_only=True)
     order_id = serializers.PrimaryKeyRelatedField(
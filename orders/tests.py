@@ -1 +1,72 @@
-# Create your tests here.
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import RequestFactory, TestCase
+
+from carts.models import Cart, CartItem
+from core.testing import APITestCase, create_product
+from products.models import Product
+from users.models import User
+
+from .models import Order, OrderItem
+from .serializers import OrderSerializer
+
+
+class OrderTrackingTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.order = Order.objects.create(tracking_number="TRACK0000001")
+
+    def track(self, tracking_number="TRACK0000001"):
+        return self.client.get(f"/api/order/track/{tracking_number}/")
+
+    def test_tracking_is_cached(self):
+        self.assertEqual(self.track().json()["order_status"], "Pending")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.track().json()["order_status"], "Pending")
+
+    def test_status_change_clears_the_cache_on_commit(self):
+        self.track()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.order.order_status = "Shipped"
+            self.order.save()
+            # Still cached until the change is committed.
+            self.assertEqual(self.track().json()["order_status"], "Pending")
+        self.assertEqual(self.track().json()["order_status"], "Shipped")
+
+    def test_unknown_tracking_number(self):
+        self.assertEqual(self.track("UNKNOWN").status_code, 404)
+
+
+class CheckoutTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="buyer@example.com",
+            password="Passw0rd!x",
+            first_name="Bu",
+            last_name="Yer",
+        )
+        self.product = create_product(title="Kettle", quantity=5)
+        self.cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=self.cart, product=self.product, quantity=2)
+
+    def checkout(self):
+        request = RequestFactory().post("/api/order/")
+        request.data = {}
+        serializer = OrderSerializer(context={"request": request})
+        return serializer.create(
+            {"cart": self.cart, "user": self.user, "full_name": "Bu Yer"}
+        )
+
+    def test_checkout_takes_the_ordered_stock(self):
+        order = self.checkout()
+        self.assertEqual(order.order_items.get().quantity, 2)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 3)
+
+    def test_failed_stock_update_leaves_no_order(self):
+        with mock.patch.object(Product, "save", side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.checkout()
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(OrderItem.objects.exists())
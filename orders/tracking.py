@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Order
+
+TRACKING_FIELDS = ("tracking_number", "order_status", "shipped_at", "delivery_estimate")
+
+
+def _tracking_key(tracking_number):
+    return f"orders:tracking:{tracking_number}"
+
+
+def get_order_tracking(tracking_number):
+    """
+    Return the public tracking fields of the order with `tracking_number`, or
+    None, cached for `ORDER_TRACKING_CACHE_TIMEOUT` seconds and dropped when
+    the order changes. Other workers only see it dropped with a shared cache
+    (`CACHE_URL`).
+    """
+    key = _tracking_key(tracking_number)
+    tracking = cache.get(key)
+    if tracking is None:
+        tracking = (
+            Order.objects.filter(tracking_number=tracking_number)
+            .values(*TRACKING_FIELDS)
+            .first()
+        )
+        if tracking is None:
+            return None
+        cache.set(key, tracking, settings.ORDER_TRACKING_CACHE_TIMEOUT)
+    return tracking
+
+
+def invalidate_order_tracking(tracking_number):
+    # After the commit, so a concurrent read can't cache the old status.
+    key = _tracking_key(tracking_number)
+    transaction.on_commit(lambda: cache.delete(key))
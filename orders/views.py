@@ -1,17 +1,28 @@
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiResponse,
+    extend_schema,
+    extend_schema_view,
+)
 from rest_framework import filters, status
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-from core.mixins import BulkOperationsMixin, MultiLookupMixin
+from core.mixins import BulkOperationsMixin, ExportMixin, MultiLookupMixin
+from core.ratelimit import RateLimit
 from core.utils import generate_bulk_schema_view, generate_crud_schema_view
 from core.views import BaseViewSet
 
 from .filters import OrderFilter, OrderItemFilter
 from .models import Order, OrderItem
-from .serializers import OrderItemSerializer, OrderSerializer
+from .serializers import (
+    OrderItemSerializer,
+    OrderSerializer,
+    OrderTrackingSerializer,
+)
+from .tracking import get_order_tracking
 
 
 @generate_bulk_schema_view("Order", OrderSerializer)
@@ -39,7 +50,7 @@ from .serializers import OrderItemSerializer, OrderSerializer
         description="Fetch all orders available in the system.",
     )
 )
-class OrderViewSet(MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
+class OrderViewSet(ExportMixin, MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     filter_backends = [
@@ -60,8 +71,14 @@ class OrderViewSet(MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
         "update": [IsAuthenticated],
         "partial_update": [IsAuthenticated],
         "destroy": [IsAuthenticated],
+        "track": [AllowAny],
         "default": [IsAuthenticated],
     }
+    ratelimit_by_action = {
+        "create": [RateLimit("10/m", key="user")],
+        "bulk_insert": [RateLimit("10/m", key="user")],
+        "track": [RateLimit("60/m")],
+    }
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -91,6 +108,28 @@ class OrderViewSet(MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
             status=status.HTTP_201_CREATED,
         )
 
+    @extend_schema(
+        tags=["Order"],
+        summary="Track an order",
+        description="Public lookup of an order's status by its tracking number.",
+        responses={
+            200: OrderTrackingSerializer,
+            404: OpenApiResponse(description="No order with this tracking number."),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"track/(?P<tracking_number>[A-Za-z0-9-]+)",
+    )
+    def track(self, request, tracking_number=None):
+        tracking = get_order_tracking(tracking_number.upper())
+        if tracking is None:
+            return Response(
+                {"detail": "Order not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(OrderTrackingSerializer(tracking).data)
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(
             data=request.data, context={"request": request}
@@ -105,7 +144,7 @@ class OrderViewSet(MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
 
 @generate_bulk_schema_view("Order Item", OrderItemSerializer)
 @generate_crud_schema_view("Order Item")
-class OrderItemViewSet(MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
+class OrderItemViewSet(ExportMixin, MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
     queryset = OrderItem.objects.all()
     serializer_class = OrderItemSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
@@ -1,8 +1,7 @@
 import os
 import sys
 
-from app.wsgi import application  # type: ignore
-
 # Add project path
 sys.path.insert(0, os.path.dirname(__file__))
-print(application)
+
+from core.wsgi import application  # noqa: E402, F401
@@ -6,7 +6,11 @@ from django.utils.html import format_html
 from unfold.admin import ModelAdmin
 
 from core.admin import SoftDeleteAdmin
-from core.mixins import FormatBaseModelFieldsMixin, HideBaseModelFieldsMixin
+from core.mixins import (
+    ExportActionsMixin,
+    FormatBaseModelFieldsMixin,
+    HideBaseModelFieldsMixin,
+)
 
 from .models import Payment
 
@@ -20,7 +24,11 @@ class PaymentAdminForm(forms.ModelForm):
 
 @admin.register(Payment)
 class PaymentAdmin(
-    HideBaseModelFieldsMixin, FormatBaseModelFieldsMixin, SoftDeleteAdmin, ModelAdmin
+    ExportActionsMixin,
+    HideBaseModelFieldsMixin,
+    FormatBaseModelFieldsMixin,
+    SoftDeleteAdmin,
+    ModelAdmin,
 ):
     form = PaymentAdminForm
     list_display = (
@@ -54,11 +62,11 @@ class PaymentAdmin(
     readonly_fields = ("created_at", "updated_at", "paid_at")
 
     def order_link(self, obj):
-        if obj.order:
+        if obj.order_id:
             return format_html(
                 '<a href="/admin/orders/order/{}/change/">{}</a>',
-                obj.order.id,
-                f"Order #{obj.order.id}",
+                obj.order_id,
+                f"Order #{obj.order_id}",
             )
         return "-"
 
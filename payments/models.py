@@ -47,6 +47,22 @@ class Payment(BaseModel):
 
     notes = models.TextField(blank=True, null=True)
 
+    export_fields = [
+        ("ID", "id"),
+        ("Order ID", "order_id"),
+        ("Tracking Number", "order__tracking_number"),
+        ("Method", "method"),
+        ("Status", "payment_status"),
+        ("Amount", "amount"),
+        ("Tax Amount", "tax_amount"),
+        ("Total Amount", "total_amount"),
+        ("Transaction ID", "transaction_id"),
+        ("Card Brand", "card_brand"),
+        ("Card Last 4", "card_last4"),
+        ("Paid At", "paid_at"),
+        ("Created At", "created_at"),
+    ]
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name_plural = "Payments"
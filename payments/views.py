@@ -2,7 +2,7 @@
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework.permissions import IsAuthenticated
 
-from core.mixins import BulkOperationsMixin, MultiLookupMixin
+from core.mixins import BulkOperationsMixin, ExportMixin, MultiLookupMixin
 from core.utils import generate_bulk_schema_view, generate_crud_schema_view
 from core.views import BaseViewSet
 
@@ -54,7 +54,7 @@ from .serializers import PaymentSerializer
         description="Fetch all payments available in the system.",
     )
 )
-class PaymentViewSet(MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
+class PaymentViewSet(ExportMixin, MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
     filterset_class = PaymentFilter
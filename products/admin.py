@@ -3,11 +3,22 @@ from django import forms
 from django.contrib import admin
 from django.utils.html import format_html
 from unfold.admin import ModelAdmin
+from unfold.contrib.filters.admin import (
+    FieldTextFilter,
+    RangeNumericFilter,
+    SingleNumericFilter,
+)
 
+from categories.counts import recount_categories
 from core.admin import SoftDeleteAdmin
-from core.mixins import FormatBaseModelFieldsMixin, HideBaseModelFieldsMixin
+from core.mixins import (
+    ExportActionsMixin,
+    FormatBaseModelFieldsMixin,
+    HideBaseModelFieldsMixin,
+)
 
-from .models import Product
+from .documents import invalidate_products
+from .models import Product, ProductImportJob
 
 
 # Custom form for rich text support
@@ -23,7 +34,11 @@ class ProductAdminForm(forms.ModelForm):
 
 @admin.register(Product)
 class ProductAdmin(
-    HideBaseModelFieldsMixin, FormatBaseModelFieldsMixin, SoftDeleteAdmin, ModelAdmin
+    ExportActionsMixin,
+    HideBaseModelFieldsMixin,
+    FormatBaseModelFieldsMixin,
+    SoftDeleteAdmin,
+    ModelAdmin,
 ):
     form = ProductAdminForm  # <-- Inject the custom form here
     list_display = (
@@ -39,21 +54,33 @@ class ProductAdmin(
         "formatted_created_at",
         "is_deleted_display",
     )
+    list_select_related = ("category",)
     search_fields = ("title", "category__name", "brand")
+    # Filters on free-form and numeric columns take typed values instead of
+    # listing every distinct value of the table.
     list_filter = (
         "status",
         "category",
-        "brand",
+        ("brand", FieldTextFilter),
         "sale",
         "location",
-        "rating",
-        "sku",
-        "new_price",
-        "old_price",
+        ("rating", RangeNumericFilter),
+        ("sku", SingleNumericFilter),
+        ("new_price", RangeNumericFilter),
+        ("old_price", RangeNumericFilter),
     )
+    list_filter_submit = True
     ordering = ("-created_at", "category", "brand")
     readonly_fields = ("created_at", "updated_at")
 
+    def perform_bulk_update(self, queryset, **changes):
+        products = dict(queryset.values_list("pk", "category_id"))
+        updated = super().perform_bulk_update(queryset, **changes)
+        # Soft deletes and restores change the counts and the documents.
+        invalidate_products(products)
+        recount_categories(set(products.values()))
+        return updated
+
     def product_image(self, obj):
         if obj.image:
             return format_html(
@@ -73,3 +100,27 @@ class ProductAdmin(
         return "No Image"
 
     product_image_two.short_description = "Second Image"
+
+
+@admin.register(ProductImportJob)
+class ProductImportJobAdmin(ModelAdmin):
+    list_display = (
+        "id",
+        "format",
+        "status",
+        "processed_rows",
+        "created_count",
+        "updated_count",
+        "error_count",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+    list_select_related = ("created_by",)
+    list_filter = ("status", "format")
+    readonly_fields = [
+        field.name for field in ProductImportJob._meta.fields if field.name != "id"
+    ]
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,171 @@
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from categories.counts import get_category_document
+from core.rendering import RenderRequest, with_request_origin
+from core.tasks import TaskQueue
+
+from .models import Product, ProductDocument
+from .serializers import ProductSerializer
+from .utils.currency import CURRENCY_TO_SYMBOL_MAPPING, get_exchange_rate
+
+CURRENCIES = tuple(CURRENCY_TO_SYMBOL_MAPPING)
+
+document_queue = TaskQueue("product-documents")
+
+# Stored in place of the nested category, which `serve_document` fills in
+# from the category menu: category names and product counts then change
+# without rebuilding the documents of every product in the category.
+CATEGORY_PLACEHOLDER = "@category"
+CATEGORY_FIELD = b'"category":"@category"'
+
+_pending_products = set()
+_pending_lock = threading.Lock()
+
+
+def render_product(product, currency):
+    """Render `product` as `ProductSerializer` does for a detail request."""
+    # Rendered without a request; `serve_document` makes the URLs absolute
+    # to the request being served.
+    context = {"currency": currency, "request": RenderRequest()}
+    data = ProductSerializer(product, context=context).data
+    if product.category_id is not None:
+        data["category"] = CATEGORY_PLACEHOLDER
+    return JSONRenderer().render(data)
+
+
+def serve_document(body, category_id, request):
+    """
+    The document `body` with its category merged in and URLs absolute to
+    the origin of `request`, or None when the category isn't available.
+    """
+    if CATEGORY_FIELD in body:
+        category = get_category_document(category_id)
+        if category is None:
+            return None
+        body = body.replace(CATEGORY_FIELD, b'"category":' + category, 1)
+    return with_request_origin(body, request)
+
+
+def build_documents(products, currencies=CURRENCIES):
+    documents = []
+    for currency in currencies:
+        rate = get_exchange_rate(currency)
+        for product in products:
+            documents.append(
+                ProductDocument(
+                    product=product,
+                    currency=currency,
+                    slug=product.slug,
+                    uuid=product.uuid,
+                    exchange_rate=rate,
+                    body=render_product(product, currency),
+                    product_updated_at=product.updated_at,
+                )
+            )
+    return documents
+
+
+def rebuild_product_documents(product_ids, currencies=CURRENCIES):
+    """
+    (Re)build the documents of the given products, at most
+    `PRODUCT_DOCUMENT_BATCH_SIZE` products at a time; returns how many.
+    """
+    product_ids = list(product_ids)
+    size = settings.PRODUCT_DOCUMENT_BATCH_SIZE
+    return sum(
+        _rebuild_batch(product_ids[i : i + size], currencies)
+        for i in range(0, len(product_ids), size)
+    )
+
+
+def _rebuild_batch(product_ids, currencies):
+    products = list(
+        Product.objects.filter(pk__in=product_ids).select_related("category")
+    )
+    documents = build_documents(products, currencies)
+    # Rebuilds run on each worker's own queue, so an older one can finish
+    # last. Documents of products saved while rendering aren't written; one
+    # that still slips through is never served, as reads compare
+    # `product_updated_at`, and that read queues a rebuild.
+    current = dict(
+        Product.objects.filter(pk__in=product_ids).values_list("pk", "updated_at")
+    )
+    documents = [
+        document
+        for document in documents
+        if current.get(document.product_id) == document.product_updated_at
+    ]
+    with transaction.atomic():
+        # Documents of products that are gone or soft-deleted are dropped.
+        ProductDocument.objects.filter(product_id__in=product_ids).exclude(
+            product_id__in=current
+        ).delete()
+        ProductDocument.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=["product", "currency"],
+            update_fields=[
+                "slug",
+                "uuid",
+                "exchange_rate",
+                "body",
+                "product_updated_at",
+                "updated_at",
+            ],
+        )
+    return len(documents)
+
+
+def _rebuild_pending(product_ids):
+    with _pending_lock:
+        _pending_products.difference_update(product_ids)
+    rebuild_product_documents(product_ids)
+
+
+def _queue_rebuild(product_ids):
+    with _pending_lock:
+        product_ids = sorted(set(product_ids) - _pending_products)
+        _pending_products.update(product_ids)
+    if product_ids:
+        document_queue.submit(_rebuild_pending, product_ids)
+
+
+def invalidate_products(product_ids):
+    """
+    Rebuild the products' documents in the background once the transaction
+    commits. Until then reads see that the documents are older than the
+    products and fall back to the serializer.
+    """
+    product_ids = list(product_ids)
+    transaction.on_commit(lambda: _queue_rebuild(product_ids))
+
+
+def invalidate_product(product_id):
+    invalidate_products([product_id])
+
+
+def get_product_document(field, value, currency):
+    """
+    Return `(product_id, body, product_updated_at)` of the JSON document of
+    the product whose `field` is `value` rendered in `currency`, or None
+    when there is no document with current prices for it.
+    """
+    if field == "pk":
+        field = "product_id"
+    rows = list(
+        ProductDocument.objects.filter(
+            **{field: value, "currency": currency}
+        ).values_list("product_id", "body", "exchange_rate", "product_updated_at")[:2]
+    )
+    if len(rows) != 1:
+        return None
+    product_id, body, rate, product_updated_at = rows[0]
+    if rate != get_exchange_rate(currency):
+        # Prices changed with the exchange rate.
+        invalidate_product(product_id)
+        return None
+    return product_id, bytes(body), product_updated_at
@@ -1,22 +1,20 @@
 import django_filters
-from django.db.models import Q
+
+from categories.lookups import resolve_category_ids
 
 from .models import Product
 
 
 class SlugOrIdInFilter(django_filters.BaseInFilter):
+    """
+    Categories by id or slug, resolved to ids up front so the products are
+    filtered on the `category_id` column without joining categories.
+    """
+
     def filter(self, qs, value):
         if not value:
             return qs
-
-        q_objects = Q()
-        for v in value:
-            if str(v).isdigit():
-                q_objects |= Q(category__id=v)
-            else:
-                q_objects |= Q(category__slug=v)
-
-        return qs.filter(q_objects)
+        return qs.filter(category_id__in=resolve_category_ids(value))
 
 
 class ProductFilter(django_filters.FilterSet):
@@ -37,13 +35,12 @@ class ProductFilter(django_filters.FilterSet):
     weight_range = django_filters.RangeFilter(field_name="weight")
     sku_range = django_filters.RangeFilter(field_name="sku")
     rating_range = django_filters.RangeFilter(field_name="rating")
-    categories = django_filters.BaseInFilter(field_name="category", lookup_expr="in")
     currency = django_filters.CharFilter(method="filter_currency")
 
     categories = SlugOrIdInFilter()
 
     def filter_category(self, queryset, name, value):
-        return queryset.filter(Q(category__slug=value) | Q(category__id=value))
+        return queryset.filter(category_id__in=resolve_category_ids([value]))
 
     def filter_currency(self, queryset, name, value):
         return queryset
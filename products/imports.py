@@ -0,0 +1,366 @@
+import codecs
+import csv
+import itertools
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.text import slugify
+from rest_framework import serializers
+
+from categories.counts import recount_categories
+from categories.models import Category
+from core.tasks import TaskQueue
+
+from .documents import invalidate_products
+from .models import Product, ProductImportJob
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ("title", "sku", "new_price", "brand")
+
+import_queue = TaskQueue("product-imports")
+
+# Set when the worker is shutting down: running imports stop after their
+# current chunk and are handed back to be resumed by another worker.
+stopping = threading.Event()
+
+
+class ImportFileError(Exception):
+    """The file can't be imported at all, e.g. a required column is missing."""
+
+
+class ImportInterrupted(Exception):
+    """The import stopped between two chunks and can be resumed."""
+
+
+class ProductImportRowSerializer(serializers.ModelSerializer):
+    """
+    Validates one imported row. Uniqueness and the category are checked for
+    a whole chunk at once by `ProductImporter`, not per row.
+    """
+
+    category = serializers.CharField(required=False)
+
+    class Meta:
+        model = Product
+        fields = [
+            "title",
+            "sku",
+            "new_price",
+            "old_price",
+            "brand",
+            "category",
+            "sale",
+            "status",
+            "location",
+            "rating",
+            "quantity",
+            "weight",
+            "dimensions",
+            "short_description",
+            "description",
+        ]
+        extra_kwargs = {"sku": {"validators": []}}
+
+
+IMPORT_FIELDS = ProductImportRowSerializer.Meta.fields
+
+
+def clean_row(header, values):
+    return {
+        column: value.strip() if isinstance(value, str) else value
+        for column, value in zip(header, values)
+        if column in IMPORT_FIELDS and value not in (None, "")
+    }
+
+
+def read_header(values):
+    return [str(value or "").strip().lower() for value in values]
+
+
+@contextmanager
+def read_csv(file):
+    reader = csv.reader(codecs.iterdecode(file, "utf-8-sig"))
+    header = read_header(next(reader, []))
+    yield header, None, (
+        (number, clean_row(header, values))
+        for number, values in enumerate(reader, start=2)
+        if any(values)
+    )
+
+
+@contextmanager
+def read_xlsx(file):
+    # openpyxl is only needed for imports, so it is imported on first use.
+    from openpyxl import load_workbook
+
+    # Read-only mode streams the sheet instead of loading it into memory.
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = read_header(next(rows, ()))
+        total = sheet.max_row - 1 if sheet.max_row else None
+        yield header, total, (
+            (number, clean_row(header, values))
+            for number, values in enumerate(rows, start=2)
+            if any(value not in (None, "") for value in values)
+        )
+    finally:
+        workbook.close()
+
+
+READERS = {"csv": read_csv, "xlsx": read_xlsx}
+
+
+def error_messages(detail):
+    """`ValidationError.detail` as plain JSON-serializable values."""
+    if isinstance(detail, dict):
+        return {key: error_messages(value) for key, value in detail.items()}
+    if isinstance(detail, list):
+        return [error_messages(value) for value in detail]
+    return str(detail)
+
+
+class ProductImporter:
+    """
+    Streams the rows of a `ProductImportJob` file and writes them in chunks
+    of `PRODUCT_IMPORT_CHUNK_SIZE`: each chunk is validated with one query
+    for its categories, SKUs and titles, then created or updated by SKU with
+    one `bulk_create`. Progress and row errors are saved in the same
+    transaction as each chunk, so an interrupted job resumes after the last
+    chunk it wrote.
+    """
+
+    def __init__(self, job, chunk_size=None):
+        self.job = job
+        self.chunk_size = chunk_size or settings.PRODUCT_IMPORT_CHUNK_SIZE
+        self.serializer = ProductImportRowSerializer()
+        self.errors = []
+        self.category_ids = set()
+
+    def run(self):
+        job = self.job
+        if stopping.is_set():
+            return job
+        now = timezone.now()
+        # Claimed with a conditional update, so a job queued twice runs once.
+        if not ProductImportJob.objects.filter(pk=job.pk, status="Pending").update(
+            status="Running",
+            started_at=Coalesce("started_at", now),
+            heartbeat_at=now,
+        ):
+            return job
+        job.refresh_from_db()
+        self.errors = list(job.errors)
+        try:
+            with job.file.open("rb") as file:
+                self.import_file(file)
+            job.status = "Completed"
+        except ImportInterrupted:
+            job.status = "Pending"
+            job.save(update_fields=["status"])
+            return job
+        except ImportFileError as e:
+            job.status = "Failed"
+            job.message = str(e)
+        except Exception as e:
+            logger.exception("Product import %s failed", job.pk)
+            job.status = "Failed"
+            job.message = str(e)
+        finally:
+            # bulk_create sends no signals, so the counts (and the category
+            # menu) are refreshed here, once for the chunks this run wrote.
+            recount_categories(self.category_ids)
+        job.finished_at = timezone.now()
+        job.errors = self.errors
+        job.save()
+        return job
+
+    def import_file(self, file):
+        with READERS[self.job.format](file) as (header, total, rows):
+            missing = [column for column in REQUIRED_COLUMNS if column not in header]
+            if missing:
+                raise ImportFileError(f"Missing columns: {', '.join(missing)}.")
+            self.job.total_rows = total
+            # Columns absent from the file are left alone on update.
+            self.update_fields = [
+                field for field in IMPORT_FIELDS if field in header and field != "sku"
+            ]
+            if "title" in header:
+                self.update_fields.append("slug")
+            self.update_fields += ["is_deleted", "deleted_at", "updated_at"]
+
+            # Rows written before the job was interrupted are skipped.
+            rows = itertools.islice(rows, self.job.processed_rows, None)
+            while chunk := list(itertools.islice(rows, self.chunk_size)):
+                if stopping.is_set():
+                    raise ImportInterrupted
+                with transaction.atomic():
+                    self.process_chunk(chunk)
+                    self.job.processed_rows += len(chunk)
+                    self.save_progress()
+
+    def add_error(self, number, errors):
+        self.job.error_count += 1
+        if len(self.errors) < settings.PRODUCT_IMPORT_MAX_ERRORS:
+            self.errors.append({"row": number, "errors": errors})
+
+    def save_progress(self):
+        job = self.job
+        ProductImportJob.objects.filter(pk=job.pk).update(
+            total_rows=job.total_rows,
+            processed_rows=job.processed_rows,
+            created_count=job.created_count,
+            updated_count=job.updated_count,
+            error_count=job.error_count,
+            errors=self.errors,
+            heartbeat_at=timezone.now(),
+        )
+
+    def process_chunk(self, chunk):
+        rows = {}
+        for number, row in chunk:
+            try:
+                data = self.serializer.run_validation(row)
+            except serializers.ValidationError as e:
+                self.add_error(number, error_messages(e.detail))
+                continue
+            # A SKU repeated in the file is imported from its last row.
+            rows.pop(data["sku"], None)
+            rows[data["sku"]] = (number, data)
+
+        rows = self.resolve_categories(rows)
+        rows = self.check_existing(rows)
+        if rows:
+            self.write(rows)
+
+    def resolve_categories(self, rows):
+        references = {
+            data["category"] for _, data in rows.values() if "category" in data
+        }
+        if not references:
+            return rows
+        ids = {int(ref) for ref in references if ref.isdigit()}
+        slugs = references - {str(pk) for pk in ids}
+        categories = {}
+        for pk, slug in Category.objects.filter(
+            Q(pk__in=ids) | Q(slug__in=slugs)
+        ).values_list("pk", "slug"):
+            categories[str(pk)] = categories[slug] = pk
+
+        resolved = {}
+        for sku, (number, data) in rows.items():
+            if "category" in data:
+                reference = data.pop("category")
+                if reference not in categories:
+                    self.add_error(
+                        number, {"category": [f"Unknown category '{reference}'."]}
+                    )
+                    continue
+                data["category_id"] = categories[reference]
+            resolved[sku] = (number, data)
+        return resolved
+
+    def check_existing(self, rows):
+        existing = dict(
+            Product._base_manager.filter(sku__in=rows).values_list("sku", "category_id")
+        )
+        titles = dict(
+            Product.objects.filter(
+                title__in=[data["title"] for _, data in rows.values()]
+            ).values_list("title", "sku")
+        )
+        checked = {}
+        for sku, (number, data) in rows.items():
+            if sku in existing and not self.job.update_existing:
+                self.add_error(
+                    number, {"sku": [f"A product with SKU {sku} already exists."]}
+                )
+                continue
+            if titles.setdefault(data["title"], sku) != sku:
+                self.add_error(
+                    number,
+                    {
+                        "title": [
+                            f"Title '{data['title']}' already exists in 'Product'."
+                        ]
+                    },
+                )
+                continue
+            checked[sku] = (number, data, sku in existing)
+        # Updated products may move out of these categories.
+        self.previous_categories = {existing[sku] for sku in checked if sku in existing}
+        return checked
+
+    def write(self, rows):
+        products = [
+            Product(
+                **data,
+                slug=slugify(data["title"]),
+                created_by=self.job.created_by,
+            )
+            for _, data, _ in rows.values()
+        ]
+        updated = [sku for sku, (_, _, exists) in rows.items() if exists]
+        try:
+            with transaction.atomic():
+                Product.objects.bulk_create(
+                    products,
+                    update_conflicts=True,
+                    unique_fields=["sku"],
+                    update_fields=self.update_fields,
+                )
+                # Only the documents of this chunk's products are rebuilt.
+                invalidate_products(
+                    Product._base_manager.filter(sku__in=rows).values_list(
+                        "pk", flat=True
+                    )
+                )
+        except DatabaseError as e:
+            for number, _, _ in rows.values():
+                self.add_error(number, {"non_field_errors": [str(e)]})
+            return
+        self.job.updated_count += len(updated)
+        self.job.created_count += len(rows) - len(updated)
+        self.category_ids |= self.previous_categories | {
+            data.get("category_id") for _, data, _ in rows.values()
+        }
+
+
+def run_import(job_id):
+    return ProductImporter(ProductImportJob.objects.get(pk=job_id)).run()
+
+
+def queue_import(job):
+    import_queue.enqueue(run_import, job.pk)
+
+
+def resume_imports():
+    """
+    Queue the imports left by workers that went away: jobs handed back as
+    "Pending" and "Running" jobs that saved no chunk for
+    `PRODUCT_IMPORT_STALE_AFTER` seconds. Called when a worker starts.
+    """
+    stale = timezone.now() - timedelta(seconds=settings.PRODUCT_IMPORT_STALE_AFTER)
+    ProductImportJob.objects.filter(status="Running", heartbeat_at__lt=stale).update(
+        status="Pending"
+    )
+    job_ids = list(
+        ProductImportJob.objects.filter(status="Pending").values_list("pk", flat=True)
+    )
+    for job_id in reversed(job_ids):
+        import_queue.enqueue(run_import, job_id)
+    return job_ids
+
+
+def stop_imports():
+    """Stop the imports of this process after their current chunk."""
+    stopping.set()
@@ -0,0 +1,163 @@
+import json
+import statistics
+import time
+import uuid
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max, Q
+
+from categories.lookups import CATEGORY_SLUGS_KEY, resolve_category_ids
+from categories.models import Category
+from products.models import Product
+
+
+def legacy_filter(queryset, values):
+    """The filter before category ids were resolved up front."""
+    q_objects = Q()
+    for value in values:
+        if str(value).isdigit():
+            q_objects |= Q(category__id=value)
+        else:
+            q_objects |= Q(category__slug=value)
+    return queryset.filter(q_objects)
+
+
+def resolved_filter(queryset, values):
+    return queryset.filter(category_id__in=resolve_category_ids(values))
+
+
+FILTERS = {"join": legacy_filter, "category_id": resolved_filter}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare filtering products by category slugs/ids through a join to "
+        "categories with the `category_id IN (...)` filter on a synthetic "
+        "catalog. Everything is created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=100000)
+        parser.add_argument("--categories", type=int, default=200)
+        parser.add_argument(
+            "--values", type=int, default=3, help="Categories per filter."
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--explain", action="store_true", help="Print the query plans."
+        )
+        parser.add_argument("--json", action="store_true", help="Print raw JSON.")
+
+    def handle(self, *args, **options):
+        if options["values"] > options["categories"]:
+            raise CommandError("--values can't exceed --categories.")
+        with transaction.atomic():
+            started_at = time.perf_counter()
+            categories = self.create_catalog(options["products"], options["categories"])
+            created_in = time.perf_counter() - started_at
+            cases = {
+                "slugs": [
+                    category.slug for category in categories[: options["values"]]
+                ],
+                "ids": [
+                    str(category.pk) for category in categories[: options["values"]]
+                ],
+            }
+            result = {
+                "products": options["products"],
+                "categories": options["categories"],
+                "database": connection.vendor,
+                "cases": {
+                    name: self.bench_case(values, options)
+                    for name, values in cases.items()
+                },
+            }
+            transaction.set_rollback(True)
+        # The cached slug map may have picked up the rolled back categories.
+        cache.delete(CATEGORY_SLUGS_KEY)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        self.stdout.write(
+            f"{options['products']} products in {options['categories']} categories "
+            f"on {connection.vendor} (created in {created_in:.1f}s), "
+            f"median of {options['repeat']} runs:"
+        )
+        for name, stats in result["cases"].items():
+            for filter_name, timings in stats.items():
+                if filter_name == "plans":
+                    continue
+                self.stdout.write(
+                    f"  by {name:<6}{filter_name:<13}"
+                    f"count {timings['count_ms']:>9} ms"
+                    f"   first page {timings['page_ms']:>9} ms"
+                    f"   {timings['matches']} matches"
+                )
+            for filter_name, plan in stats.get("plans", {}).items():
+                self.stdout.write(f"  plan ({name}, {filter_name}):\n{plan}")
+
+    def create_catalog(self, products, categories):
+        run = uuid.uuid4().hex[:8]
+        Category.objects.bulk_create(
+            [
+                Category(name=f"bench-{run}-{i}", slug=f"bench-{run}-{i}")
+                for i in range(categories)
+            ]
+        )
+        # Not every backend sets the primary keys on bulk created objects.
+        created = list(
+            Category.objects.filter(slug__startswith=f"bench-{run}-").order_by("pk")
+        )
+        first_sku = (Product._base_manager.aggregate(sku=Max("sku"))["sku"] or 0) + 1
+        batch = []
+        for i in range(products):
+            batch.append(
+                Product(
+                    title=f"bench-{run}-{i}",
+                    sku=first_sku + i,
+                    new_price=10,
+                    brand="bench",
+                    category_id=created[i % categories].pk,
+                )
+            )
+            if len(batch) == 5000:
+                Product.objects.bulk_create(batch)
+                batch = []
+        Product.objects.bulk_create(batch)
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE products_product, categories_category")
+        return created
+
+    def bench_case(self, values, options):
+        stats = {}
+        plans = {}
+        for name, filter_products in FILTERS.items():
+            count_times = []
+            page_times = []
+            matches = 0
+            for _ in range(options["repeat"]):
+                started_at = time.perf_counter()
+                matches = filter_products(Product.objects.all(), values).count()
+                count_times.append(time.perf_counter() - started_at)
+
+                started_at = time.perf_counter()
+                list(
+                    filter_products(Product.objects.all(), values)
+                    .order_by("-created_at")
+                    .values_list("pk", flat=True)[:20]
+                )
+                page_times.append(time.perf_counter() - started_at)
+            stats[name] = {
+                "count_ms": round(statistics.median(count_times) * 1000, 2),
+                "page_ms": round(statistics.median(page_times) * 1000, 2),
+                "matches": matches,
+            }
+            if options["explain"]:
+                plans[name] = filter_products(Product.objects.all(), values).explain()
+        if plans:
+            stats["plans"] = plans
+        return stats
@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.documents import CURRENCIES, rebuild_product_documents
+from products.models import Product, ProductDocument
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the prebuilt product detail documents of every product, e.g. "
+        "after a deploy that changes ProductSerializer or after bulk updates "
+        "that bypass signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--currency",
+            action="append",
+            choices=CURRENCIES,
+            help="Only rebuild this currency; may be repeated.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete every document first.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        currencies = tuple(options["currency"] or CURRENCIES)
+        if options["clear"]:
+            ProductDocument.objects.all().delete()
+
+        started_at = time.perf_counter()
+        product_ids = list(Product.objects.values_list("pk", flat=True).order_by("pk"))
+        built = 0
+        for start in range(0, len(product_ids), options["batch_size"]):
+            batch = product_ids[start : start + options["batch_size"]]
+            built += rebuild_product_documents(batch, currencies)
+
+        # Documents of soft-deleted products are left behind by bulk updates.
+        stale, _ = ProductDocument.objects.exclude(
+            product__in=Product.objects.all()
+        ).delete()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built {built} documents for {len(product_ids)} products in "
+                f"{', '.join(currencies)} ({time.perf_counter() - started_at:.1f}s), "
+                f"removed {stale} stale."
+            )
+        )
@@ -0,0 +1,63 @@
+import os
+import time
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from products.imports import READERS, ProductImporter
+from products.models import ProductImportJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Import products from a CSV or XLSX file in this process, creating "
+        "or updating them by SKU, and report progress and row errors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--no-update",
+            action="store_true",
+            help="Report rows whose SKU already exists as errors.",
+        )
+        parser.add_argument("--chunk-size", type=int)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        extension = path.rsplit(".", 1)[-1].lower()
+        if extension not in READERS:
+            raise CommandError("Expected a .csv or .xlsx file.")
+
+        with open(path, "rb") as file:
+            job = ProductImportJob.objects.create(
+                file=File(file, name=os.path.basename(path)),
+                format=extension,
+                update_existing=not options["no_update"],
+            )
+
+        importer = ProductImporter(job, chunk_size=options["chunk_size"])
+        save_progress = importer.save_progress
+        started_at = time.perf_counter()
+
+        def report_progress():
+            save_progress()
+            elapsed = time.perf_counter() - started_at
+            self.stdout.write(
+                f"{job.processed_rows} rows ({job.processed_rows / elapsed:.0f}/s): "
+                f"{job.created_count} created, {job.updated_count} updated, "
+                f"{job.error_count} errors"
+            )
+
+        importer.save_progress = report_progress
+        importer.run()
+
+        for error in job.errors[:20]:
+            self.stdout.write(f"  row {error['row']}: {error['errors']}")
+        if job.status == "Failed":
+            raise CommandError(f"Import #{job.pk} failed: {job.message}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Import #{job.pk} completed in {time.perf_counter() - started_at:.1f}s."
+            )
+        )
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0007_alter_product_created_by_alter_product_deleted_by_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("currency", models.CharField(max_length=3)),
+                ("slug", models.SlugField(blank=True, max_length=255, null=True)),
+                ("uuid", models.UUIDField(db_index=True)),
+                ("exchange_rate", models.FloatField()),
+                ("body", models.BinaryField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="documents",
+                        to="products.product",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="productdocument",
+            constraint=models.UniqueConstraint(
+                fields=("product", "currency"), name="unique_product_document"
+            ),
+        ),
+    ]
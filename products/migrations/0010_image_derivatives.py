@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-19 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0009_productimportjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="image_derivatives",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="image_two_derivatives",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
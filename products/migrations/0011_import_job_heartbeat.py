@@ -0,0 +1,20 @@
+# Generated by Django 4.2.23 on 2026-10-19 19:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0010_image_derivatives"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productimportjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(
+                blank=True, help_text="When the last chunk was saved.", null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 20:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0011_import_job_heartbeat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productdocument",
+            name="product_updated_at",
+            field=models.DateTimeField(null=True),
+        ),
+    ]
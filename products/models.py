@@ -1,4 +1,6 @@
 from ckeditor.fields import RichTextField
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 from django.utils.text import slugify
 
@@ -57,11 +59,13 @@ class Product(BaseModel):
         blank=True,
         verbose_name="Product Image 2",
     )
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
+    image_two_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     new_price = models.DecimalField(max_digits=10, decimal_places=2)
     old_price = models.DecimalField(
         max_digits=10, decimal_places=2, null=True, blank=True
     )
-    title = models.CharField(max_length=255)
+    title = models.CharField(max_length=255, db_index=True)
     rating = models.IntegerField(default=0)
     status = models.CharField(
         max_length=50, choices=STATUS_CHOICES, default="Available"
@@ -90,6 +94,25 @@ class Product(BaseModel):
     )
 
     unique_fields = ["title"]
+    derivative_fields = ["image", "image_two"]
+    export_fields = [
+        ("ID", "id"),
+        ("SKU", "sku"),
+        ("Title", "title"),
+        ("Brand", "brand"),
+        ("Category", "category__name"),
+        ("New Price", "new_price"),
+        ("Old Price", "old_price"),
+        ("Quantity", "quantity"),
+        ("Status", "status"),
+        ("Sale", "sale"),
+        ("Location", "location"),
+        ("Rating", "rating"),
+        ("Weight", "weight"),
+        ("Dimensions", "dimensions"),
+        ("Created At", "created_at"),
+        ("Updated At", "updated_at"),
+    ]
 
     class Meta:
         ordering = ["-created_at", "quantity"]
@@ -98,7 +121,98 @@ class Product(BaseModel):
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # What the category's product count was based on, so saves that
+        # move or (un)delete the product can update the counts.
+        instance._counted_as = (
+            instance.__dict__.get("category_id"),
+            instance.__dict__.get("is_deleted"),
+        )
+        return instance
+
     def save(self, *args, **kwargs):
         if not self.slug and self.title:
             self.slug = slugify(self.title)
         super().save(*args, **kwargs)
+
+
+class ProductDocument(models.Model):
+    """
+    A product rendered by `ProductSerializer` in one currency, stored as JSON
+    so detail requests don't serialize it again. The nested category is left
+    out and merged in when the document is served; `product_updated_at` is
+    the version of the product it was rendered from. See `products.documents`.
+    """
+
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="documents"
+    )
+    currency = models.CharField(max_length=3)
+    slug = models.SlugField(max_length=255, null=True, blank=True)
+    uuid = models.UUIDField(db_index=True)
+    exchange_rate = models.FloatField()
+    body = models.BinaryField()
+    product_updated_at = models.DateTimeField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "currency"], name="unique_product_document"
+            )
+        ]
+
+
+def import_storage():
+    return FileSystemStorage(location=settings.PRODUCT_IMPORT_ROOT)
+
+
+class ProductImportJob(models.Model):
+    """A CSV or XLSX file of products imported in the background."""
+
+    FORMAT_CHOICES = [
+        ("csv", "CSV"),
+        ("xlsx", "XLSX"),
+    ]
+    STATUS_CHOICES = [
+        ("Pending", "Pending"),
+        ("Running", "Running"),
+        ("Completed", "Completed"),
+        ("Failed", "Failed"),
+    ]
+
+    file = models.FileField(upload_to="products/", storage=import_storage)
+    format = models.CharField(max_length=4, choices=FORMAT_CHOICES)
+    update_existing = models.BooleanField(
+        default=True, help_text="Update products whose SKU already exists."
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="Pending")
+    message = models.TextField(blank=True)
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    created_by = models.ForeignKey(
+        "users.User",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="product_import_jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        null=True, blank=True, help_text="When the last chunk was saved."
+    )
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name_plural = "Product Import Jobs"
+
+    def __str__(self):
+        return f"Import #{self.pk} ({self.status})"
@@ -2,9 +2,9 @@ from rest_framework import serializers
 
 from categories.models import Category
 from categories.serializers import CategorySerializer
-from core.serializers import BaseModelSerializer
+from core.serializers import BaseModelSerializer, ImageDerivativesField
 
-from .models import Product
+from .models import Product, ProductImportJob
 from .utils.currency import CURRENCY_TO_SYMBOL_MAPPING, get_exchange_rate
 
 
@@ -17,6 +17,8 @@ class ProductSerializer(BaseModelSerializer):
     old_price = serializers.SerializerMethodField()
     currency = serializers.SerializerMethodField()
     currency_symbol = serializers.SerializerMethodField()
+    image_derivatives = ImageDerivativesField("image")
+    image_two_derivatives = ImageDerivativesField("image_two")
 
     class Meta:
         model = Product
@@ -28,6 +30,8 @@ class ProductSerializer(BaseModelSerializer):
             "sale",
             "image",
             "image_two",
+            "image_derivatives",
+            "image_two_derivatives",
             "new_price",
             "old_price",
             "new_price",
@@ -68,3 +72,42 @@ class ProductSerializer(BaseModelSerializer):
     def get_currency_symbol(self, obj):
         currency = self.context.get("currency", "NPR").upper()
         return CURRENCY_TO_SYMBOL_MAPPING.get(currency, "Rs")
+
+
+class ProductImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProductImportJob
+        fields = [
+            "id",
+            "file",
+            "format",
+            "update_existing",
+            "status",
+            "message",
+            "total_rows",
+            "processed_rows",
+            "created_count",
+            "updated_count",
+            "error_count",
+            "errors",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = [
+            field for field in fields if field not in ("file", "update_existing")
+        ]
+        # Import files are kept on local disk, not served.
+        extra_kwargs = {"file": {"write_only": True}}
+
+    def validate_file(self, file):
+        extension = file.name.rsplit(".", 1)[-1].lower()
+        if extension not in dict(ProductImportJob.FORMAT_CHOICES):
+            raise serializers.ValidationError("Upload a .csv or .xlsx file.")
+        return file
+
+    def create(self, validated_data):
+        validated_data["format"] = (
+            validated_data["file"].name.rsplit(".", 1)[-1].lower()
+        )
+        return super().create(validated_data)
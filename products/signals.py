@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from categories.counts import recount_categories
+from core.images import derivatives_ready
+
+from .documents import invalidate_product
+from .models import Product
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, created, **kwargs):
+    invalidate_product(instance.pk)
+    # Product counts change when a product is added, moved, deleted or
+    # restored. Documents take the category from the menu, which the
+    # recount drops.
+    counted_as = (instance.category_id, instance.is_deleted)
+    previous = getattr(instance, "_counted_as", (None, True))
+    if counted_as != previous:
+        instance._counted_as = counted_as
+        recount_categories({previous[0], instance.category_id})
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    if instance.category_id:
+        recount_categories([instance.category_id])
+
+
+@receiver(derivatives_ready, sender=Product)
+def product_images_ready(sender, pk, **kwargs):
+    invalidate_product(pk)
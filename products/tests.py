@@ -1 +1,287 @@
-# Create your tests here.
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from categories.models import Category
+from core.testing import APITestCase, create_product
+
+from . import documents, imports
+from .documents import rebuild_product_documents
+from .imports import ProductImporter, resume_imports
+from .models import Product, ProductDocument, ProductImportJob
+
+
+class ProductDocumentTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name="Kitchen")
+        self.product = create_product(title="Kettle", category=self.category)
+        rebuild_product_documents([self.product.pk])
+
+    def retrieve(self):
+        return self.client.get(f"/api/product/{self.product.pk}/")
+
+    def serialized(self):
+        """The product as rendered without a document."""
+        with mock.patch.object(documents, "get_product_document", return_value=None):
+            return self.retrieve().json()
+
+    def test_detail_is_served_from_the_document(self):
+        with (
+            mock.patch.object(
+                documents, "render_product", wraps=documents.render_product
+            ) as render,
+            mock.patch("products.views.ProductSerializer", side_effect=AssertionError),
+        ):
+            response = self.retrieve()
+        self.assertEqual(response.status_code, 200)
+        render.assert_not_called()
+        self.assertEqual(response.json(), self.serialized())
+        self.assertEqual(response.json()["category"]["name"], "Kitchen")
+
+    def test_category_is_merged_in_when_served(self):
+        body = ProductDocument.objects.get(product=self.product, currency="NPR").body
+        self.assertIn(documents.CATEGORY_FIELD, bytes(body))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = "Cookware"
+            self.category.save()
+            create_product(title="Toaster", sku=1002, category=self.category)
+        # Only the new product was rebuilt.
+        self.assertEqual(
+            ProductDocument.objects.get(product=self.product, currency="NPR").body,
+            body,
+        )
+        category = self.retrieve().json()["category"]
+        self.assertEqual(
+            (category["name"], category["products_count"]), ("Cookware", 2)
+        )
+
+    def test_outdated_document_is_not_served(self):
+        self.product.title = "Kettle v2"
+        self.product.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.retrieve().json()["title"], "Kettle v2")
+        # The read queued a rebuild.
+        self.assertIn(
+            b"Kettle v2",
+            bytes(
+                ProductDocument.objects.get(product=self.product, currency="NPR").body
+            ),
+        )
+
+    def test_saving_a_product_rebuilds_only_that_product(self):
+        other = create_product(title="Toaster", sku=1002, category=self.category)
+        with (
+            mock.patch.object(
+                documents,
+                "rebuild_product_documents",
+                wraps=documents.rebuild_product_documents,
+            ) as rebuild,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            # Moving it changes the category's count, not the documents of
+            # the other products in it.
+            other.category = None
+            other.save()
+        rebuild.assert_called_once_with([other.pk])
+
+    @override_settings(PRODUCT_DOCUMENT_BATCH_SIZE=2)
+    def test_rebuild_runs_in_batches(self):
+        product_ids = [self.product.pk] + [
+            create_product(title=f"Kettle {sku}", sku=sku).pk
+            for sku in range(1002, 1006)
+        ]
+        with mock.patch.object(
+            documents, "build_documents", wraps=documents.build_documents
+        ) as build:
+            self.assertEqual(rebuild_product_documents(product_ids), 15)
+        self.assertEqual(
+            [len(call.args[0]) for call in build.call_args_list], [2, 2, 1]
+        )
+
+    def test_document_is_held_to_the_queryset(self):
+        # Soft-deleted without signals, so the document is still there.
+        Product.objects.filter(pk=self.product.pk).update(is_deleted=True)
+        self.assertTrue(ProductDocument.objects.filter(product=self.product).exists())
+        self.assertEqual(self.retrieve().status_code, 404)
+
+    def test_rebuild_of_an_older_version_is_not_written(self):
+        ProductDocument.objects.all().delete()
+
+        def build_then_save(products, currencies):
+            built = build_documents(products, currencies)
+            # Saved by another worker while this rebuild was rendering.
+            Product.objects.filter(pk=self.product.pk).update(
+                title="Kettle v2", updated_at=timezone.now()
+            )
+            return built
+
+        build_documents = documents.build_documents
+        with mock.patch.object(documents, "build_documents", build_then_save):
+            self.assertEqual(rebuild_product_documents([self.product.pk]), 0)
+        self.assertFalse(ProductDocument.objects.exists())
+
+        rebuild_product_documents([self.product.pk])
+        self.assertIn(b"Kettle v2", self.retrieve().content)
+
+    def test_document_urls_are_absolute_to_the_request(self):
+        self.product.image = "products/images/kettle.jpg"
+        self.product.save()
+        rebuild_product_documents([self.product.pk])
+        self.assertEqual(
+            self.retrieve().json()["image"],
+            "http://testserver/media/products/images/kettle.jpg",
+        )
+        response = self.client.get(
+            f"/api/product/{self.product.pk}/", HTTP_HOST="shop.example.com"
+        )
+        self.assertEqual(
+            response.json()["image"],
+            "http://shop.example.com/media/products/images/kettle.jpg",
+        )
+        # The same as the serializer renders it without a document.
+        ProductDocument.objects.all().delete()
+        self.assertEqual(
+            self.client.get(
+                f"/api/product/{self.product.pk}/", HTTP_HOST="shop.example.com"
+            ).json(),
+            response.json(),
+        )
+
+
+class ProductImportTests(TestCase):
+    ROWS = [
+        "title,sku,new_price,brand",
+        "Kettle,1001,10,Acme",
+        "Toaster,1002,25,Acme",
+        "Blender,1003,,Acme",
+        "Mixer,1004,40,Acme",
+        "Grill,1005,55,Acme",
+    ]
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        storage = mock.patch.object(
+            ProductImportJob._meta.get_field("file"),
+            "storage",
+            FileSystemStorage(location=directory),
+        )
+        storage.start()
+        self.addCleanup(storage.stop)
+        self.addCleanup(imports.stopping.clear)
+        self.job = ProductImportJob.objects.create(
+            file=ContentFile("\n".join(self.ROWS).encode(), name="products.csv"),
+            format="csv",
+        )
+
+    def titles(self):
+        return list(Product.objects.order_by("sku").values_list("title", flat=True))
+
+    def test_rows_are_imported_in_chunks(self):
+        importer = ProductImporter(self.job, chunk_size=2)
+        with mock.patch.object(
+            importer, "save_progress", wraps=importer.save_progress
+        ) as save_progress:
+            job = importer.run()
+
+        self.assertEqual(save_progress.call_count, 3)
+        self.assertEqual(job.status, "Completed")
+        self.assertEqual(
+            (job.processed_rows, job.created_count, job.error_count), (5, 4, 1)
+        )
+        self.assertEqual(job.errors[0]["row"], 4)
+        self.assertEqual(self.titles(), ["Kettle", "Toaster", "Mixer", "Grill"])
+
+    def test_chunks_rebuild_their_products_and_counts_refresh_once(self):
+        kitchen = Category.objects.create(name="Kitchen")
+        garden = Category.objects.create(name="Garden")
+        self.job.file.save(
+            "products.csv",
+            ContentFile(
+                "\n".join(
+                    [
+                        "title,sku,new_price,brand,category",
+                        f"Kettle,1001,10,Acme,{kitchen.pk}",
+                        f"Toaster,1002,25,Acme,{kitchen.pk}",
+                        f"Grill,1003,55,Acme,{garden.pk}",
+                    ]
+                ).encode()
+            ),
+        )
+        with (
+            mock.patch.object(
+                imports, "invalidate_products", wraps=imports.invalidate_products
+            ) as invalidate,
+            mock.patch.object(
+                imports, "recount_categories", wraps=imports.recount_categories
+            ) as recount,
+        ):
+            ProductImporter(self.job, chunk_size=2).run()
+
+        skus = dict(Product.objects.values_list("pk", "sku"))
+        self.assertEqual(
+            [
+                sorted(skus[pk] for pk in call.args[0])
+                for call in invalidate.call_args_list
+            ],
+            [[1001, 1002], [1003]],
+        )
+        recount.assert_called_once_with({kitchen.pk, garden.pk})
+        self.assertEqual(
+            dict(Category.objects.values_list("name", "item")),
+            {"Kitchen": 2, "Garden": 1},
+        )
+
+    def test_stopped_import_resumes_after_its_last_chunk(self):
+        importer = ProductImporter(self.job, chunk_size=2)
+        save_progress = importer.save_progress
+
+        def stop_after_first_chunk():
+            save_progress()
+            imports.stopping.set()
+
+        importer.save_progress = stop_after_first_chunk
+        job = importer.run()
+        self.assertEqual((job.status, job.processed_rows), ("Pending", 2))
+        self.assertEqual(self.titles(), ["Kettle", "Toaster"])
+
+        imports.stopping.clear()
+        # Products written before the stop are not imported again.
+        Product.objects.filter(sku=1001).update(title="Kettle v2")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(resume_imports(), [self.job.pk])
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, "Completed")
+        self.assertEqual(
+            (self.job.processed_rows, self.job.created_count, self.job.error_count),
+            (5, 4, 1),
+        )
+        self.assertEqual(self.titles(), ["Kettle v2", "Toaster", "Mixer", "Grill"])
+
+    def test_only_stale_running_imports_are_resumed(self):
+        ProductImportJob.objects.filter(pk=self.job.pk).update(
+            status="Running", heartbeat_at=timezone.now()
+        )
+        self.assertEqual(resume_imports(), [])
+
+        ProductImportJob.objects.filter(pk=self.job.pk).update(
+            heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(resume_imports(), [self.job.pk])
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, "Completed")
+
+    def test_claimed_import_is_not_run_twice(self):
+        ProductImportJob.objects.filter(pk=self.job.pk).update(status="Running")
+        self.assertEqual(ProductImporter(self.job).run().processed_rows, 0)
+        self.assertFalse(Product.objects.exists())
@@ -1,9 +1,11 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import ProductViewSet
+from .views import ProductImportJobViewSet, ProductViewSet
 
 router = DefaultRouter()
+# Registered first so "imports/" isn't taken for a product lookup.
+router.register(r"imports", ProductImportJobViewSet, basename="product-import")
 router.register(r"", ProductViewSet, basename="product")
 urlpatterns = [
     path("", include(router.urls)),
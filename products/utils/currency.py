@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.core.cache import cache
 
+from core.metrics import exchange_rate_cache_requests_total
+
 CURRENCY_TO_SYMBOL_MAPPING = {"NPR": "Rs", "USD": "$", "EUR": "€"}
 
 API_KEY = settings.EXCHANGE_RATE_API_KEY
@@ -13,8 +15,11 @@ def get_exchange_rate(target_currency):
     print(target_currency, "target currency")
 
     if rate is not None:
+        exchange_rate_cache_requests_total.inc(result="hit")
         return rate
 
+    exchange_rate_cache_requests_total.inc(result="miss")
+
     # url = f'https://v6.exchangerate-api.com/v6/{API_KEY}/latest/{BASE_CURRENCY}'
     # response = requests.get(url)
     # print(response,'the response')
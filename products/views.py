@@ -1,14 +1,26 @@
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 
-from core.mixins import BulkOperationsMixin, MultiLookupMixin
+from categories.counts import recount_categories
+from core.mixins import BulkOperationsMixin, ExportMixin, MultiLookupMixin
 from core.utils import generate_bulk_schema_view, generate_crud_schema_view
 from core.views import BaseViewSet
 
 from .actions import bulk_insert
+from .documents import (
+    get_product_document,
+    invalidate_product,
+    invalidate_products,
+    serve_document,
+)
 from .filters import ProductFilter
-from .models import Product
-from .serializers import ProductSerializer
+from .imports import queue_import
+from .models import Product, ProductImportJob
+from .serializers import ProductImportJobSerializer, ProductSerializer
+from .utils.currency import CURRENCY_TO_SYMBOL_MAPPING
 
 
 @generate_bulk_schema_view("Product", ProductSerializer)
@@ -36,9 +48,10 @@ from .serializers import ProductSerializer
         description="Fetch all orders available in the system.",
     )
 )
-class ProductViewSet(MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
+class ProductViewSet(ExportMixin, MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    cache_lookups = True
     filterset_class = ProductFilter
     search_fields = ["title", "brand"]
     ordering_fields = [
@@ -79,5 +92,66 @@ class ProductViewSet(MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
         context["currency"] = currency
         return context
 
+    def retrieve(self, request, *args, **kwargs):
+        # Serve the prebuilt document when there is one for this currency.
+        currency = request.query_params.get("currency", "NPR").upper()
+        if (
+            currency in CURRENCY_TO_SYMBOL_MAPPING
+            and request.accepted_renderer.format == "json"
+        ):
+            field, value = self.get_lookup_filter(kwargs["pk"])
+            document = get_product_document(field, value, currency)
+            if document is not None:
+                product_id, body, product_updated_at = document
+                # Hold the product to the same queryset and object
+                # permissions as `get_object()`; by pk, that's cheap.
+                product = get_object_or_404(
+                    self.get_queryset().only("pk", "category_id", "updated_at"),
+                    pk=product_id,
+                )
+                self.check_object_permissions(request, product)
+                if product.updated_at != product_updated_at:
+                    # Saved since it was rendered; a rebuild is queued.
+                    invalidate_product(product_id)
+                else:
+                    body = serve_document(body, product.category_id, request)
+                    if body is not None:
+                        return HttpResponse(body, content_type="application/json")
+        return super().retrieve(request, *args, **kwargs)
+
+    def perform_bulk_create(self, objects):
+        super().perform_bulk_create(objects)
+        invalidate_products(product.pk for product in objects if product.pk)
+        recount_categories({product.category_id for product in objects})
+
     # ✅ Assign custom action
     bulk_insert = bulk_insert
+
+
+@extend_schema_view(
+    list=extend_schema(tags=["Product"], summary="List product import jobs"),
+    retrieve=extend_schema(
+        tags=["Product"],
+        summary="Product import job progress",
+        description="Rows processed so far, products created and updated, and the first row errors.",
+    ),
+    create=extend_schema(
+        tags=["Product"],
+        summary="Import products from a file",
+        description="Upload a CSV or XLSX file whose header names product fields (`title`, `sku`, `new_price` and `brand` are required; `category` is an id or slug). Rows are imported in the background, creating products or updating them by SKU.",
+    ),
+)
+class ProductImportJobViewSet(BaseViewSet):
+    queryset = ProductImportJob.objects.all()
+    serializer_class = ProductImportJobSerializer
+    parser_classes = [MultiPartParser, FormParser]
+    http_method_names = ["get", "post", "head", "options"]
+    filter_backends = []
+
+    permission_classes_by_action = {
+        "default": [IsAuthenticated, IsAdminUser],
+    }
+
+    def perform_create(self, serializer):
+        job = serializer.save(created_by=self.request.user)
+        queue_import(job)
@@ -5,6 +5,7 @@ from datetime import timedelta
 
 from django.contrib.auth import authenticate
 from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.template.loader import render_to_string
 from django.utils import timezone
@@ -14,8 +15,9 @@ from rest_framework.decorators import action
 from rest_framework.parsers import JSONParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken
 
+from .emails import VERIFY_EMAIL_TEMPLATE, queue_verification_email
 from .models import EmailVerificationToken, PasswordResetToken, User
 from .serializers import (
     ChangePasswordSerializer,
@@ -26,9 +28,9 @@ from .serializers import (
     UserSerializer,
     VerifyEmailSerializer,
 )
+from .tokens import ClaimsRefreshToken, get_full_user, revoke_token
 
 EMAIL_CONTENT_TYPE = "text/html"
-VERIFY_EMAIL_TEMPLATE = "emails/verify_email.html"
 
 
 @extend_schema(
@@ -66,32 +68,14 @@ def register(self, request):
     """Custom endpoint for user registration and email verification."""
     serializer = self.get_serializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    user = serializer.save()
-    user.is_active = False
-    user.save()
-    token = EmailVerificationToken.objects.create(user=user)
-    verify_link = f"{os.environ.get('FRONTEND_URL', 'http://localhost:3000')}/verify-email?token={token.token}"
-    html_content = render_to_string(
-        VERIFY_EMAIL_TEMPLATE,
-        {
-            "full_name": f"{user.first_name} {user.last_name}",
-            "verify_link": verify_link,
-        },
-    )
-
-    verification_email = EmailMultiAlternatives(
-        subject="Verify Your Email Address",
-        body="",
-        from_email=os.environ.get("EMAIL_HOST_USER"),
-        to=[user.email],
-    )
-    verification_email.attach_alternative(html_content, EMAIL_CONTENT_TYPE)
-    try:
-        verification_email.send(fail_silently=False)
-    except Exception:
-        pass
+    # One commit for the user and its outstanding refresh token.
+    with transaction.atomic():
+        user = serializer.save()
+        refresh = ClaimsRefreshToken.for_user(user)
+        # The verification token and email are created in the background
+        # after the commit; resend-verification-token covers a lost email.
+        queue_verification_email(user)
 
-    refresh = RefreshToken.for_user(user)
     return Response(
         {
             "message": "User registered successfully! Please check your email to verify your account.",
@@ -173,7 +157,7 @@ def login(self, request):
             status=status.HTTP_401_UNAUTHORIZED,
         )
 
-    refresh = RefreshToken.for_user(user)
+    refresh = ClaimsRefreshToken.for_user(user)
     return Response(
         {
             "access": str(refresh.access_token),
@@ -222,11 +206,11 @@ def logout(self, request):
     """Custom logout endpoint."""
     try:
         refresh_token = request.data.get("refresh")
-        print(request.user)
-        print(refresh_token)
-        token = RefreshToken(refresh_token)
-        print("token", token)
+        token = ClaimsRefreshToken(refresh_token)
         token.blacklist()
+        # Also reject the access token used for this request.
+        if isinstance(request.auth, AccessToken):
+            revoke_token(request.auth)
         return Response({"message": "Logout successful."}, status=status.HTTP_200_OK)
     except Exception:
         return Response({"error": "Invalid token."}, status=status.HTTP_400_BAD_REQUEST)
@@ -240,7 +224,7 @@ def logout(self, request):
 )
 @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
 def profile(self, request):
-    user = request.user
+    user = get_full_user(request.user)
     serializer = self.get_serializer(user)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -254,7 +238,7 @@ def profile(self, request):
 )
 @action(detail=False, methods=["put", "patch"], permission_classes=[IsAuthenticated])
 def update_profile(self, request):
-    user = request.user
+    user = get_full_user(request.user)
     serializer = self.get_serializer(user, data=request.data, partial=True)
     serializer.is_valid(raise_exception=True)
     serializer.save()
@@ -270,7 +254,7 @@ def update_profile(self, request):
 )
 @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated])
 def change_password(self, request):
-    user = request.user
+    user = get_full_user(request.user)
     serializer = ChangePasswordSerializer(
         data=request.data, context={"request": request}
     )
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from .tokens import USER_CLAIMS, claims_are_current, is_token_revoked, user_from_claims
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that rejects revoked tokens and, with
+    `JWT_STATELESS_USER` enabled, builds `request.user` from the token claims
+    instead of loading it on every request. Tokens without the claims, or
+    issued before the user's claimed fields changed, still load the user.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if is_token_revoked(token):
+            raise InvalidToken(_("Token has been revoked"))
+        return token
+
+    def get_user(self, validated_token):
+        if (
+            settings.JWT_STATELESS_USER
+            and all(claim in validated_token for claim in USER_CLAIMS)
+            and claims_are_current(validated_token)
+        ):
+            return user_from_claims(validated_token)
+        return super().get_user(validated_token)
@@ -0,0 +1,27 @@
+import os
+
+from core.emails import email_queue, send_templated_email
+
+from .models import EmailVerificationToken, User
+
+VERIFY_EMAIL_TEMPLATE = "emails/verify_email.html"
+
+
+def send_verification_email(user_id):
+    """Create an email verification token for the user and email it."""
+    user = User.objects.get(pk=user_id)
+    token = EmailVerificationToken.objects.create(user=user)
+    frontend_url = os.environ.get("FRONTEND_URL", "http://localhost:3000")
+    send_templated_email(
+        "Verify Your Email Address",
+        VERIFY_EMAIL_TEMPLATE,
+        {
+            "full_name": f"{user.first_name} {user.last_name}",
+            "verify_link": f"{frontend_url}/verify-email?token={token.token}",
+        },
+        [user.email],
+    )
+
+
+def queue_verification_email(user):
+    email_queue.enqueue(send_verification_email, user.pk)
@@ -0,0 +1,91 @@
+import itertools
+import json
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from core.benchmark import benchmark_client, run_concurrently, summarize
+from core.tasks import drain_all
+from users.models import User
+
+EMAIL_DOMAIN = "bench.invalid"
+
+
+class Command(BaseCommand):
+    help = (
+        "Register users through the API concurrently and report registrations "
+        "per second, latency and the queries a registration runs. The users "
+        "are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--eager",
+            action="store_true",
+            help="Send the verification email inline, as before it was deferred.",
+        )
+        parser.add_argument("--json", action="store_true", help="Print raw JSON.")
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        numbers = itertools.count()
+
+        def register(client):
+            return client.post(
+                "/api/user/register/",
+                {
+                    "first_name": "Bench",
+                    "last_name": "User",
+                    "email": f"{run_id}-{next(numbers)}@{EMAIL_DOMAIN}",
+                    "password": f"Bench-{run_id}-password",
+                },
+                content_type="application/json",
+            )
+
+        try:
+            with override_settings(
+                RATELIMIT_ENABLE=False, TASKS_EAGER=options["eager"]
+            ):
+                with benchmark_client("bench_registration") as client:
+                    with CaptureQueriesContext(connection) as queries:
+                        register(client)
+                        drain_all()
+                latencies, statuses, elapsed = run_concurrently(
+                    register, options["requests"], options["threads"]
+                )
+                drain_all()
+        finally:
+            users = User._base_manager.filter(email__startswith=f"{run_id}-")
+            OutstandingToken.objects.filter(user__in=users).delete()
+            users.delete()
+
+        writes = [
+            query["sql"].split()[0]
+            for query in queries.captured_queries
+            if query["sql"].split()[0] in ("INSERT", "UPDATE", "DELETE")
+        ]
+        result = {
+            **summarize(latencies, elapsed),
+            "statuses": statuses,
+            "queries": len(queries.captured_queries),
+            "writes": writes,
+            "email": "inline" if options["eager"] else "deferred",
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        self.stdout.write(
+            f"{result['requests']} registrations ({result['email']} email), "
+            f"{options['threads']} threads: {result['req_per_s']} req/s, "
+            f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, "
+            f"p99 {result['p99_ms']} ms, statuses {statuses}"
+        )
+        self.stdout.write(
+            f"Queries per registration: {result['queries']} "
+            f"(writes: {', '.join(writes) or 'none'})"
+        )
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from users.models import (
+    EMAIL_VERIFICATION_TOKEN_LIFETIME,
+    EmailVerificationToken,
+    PasswordResetToken,
+)
+
+
+def delete_in_chunks(queryset, chunk_size):
+    """
+    Delete the rows of `queryset` `chunk_size` primary keys at a time so no
+    single statement holds locks on a large part of the table.
+    """
+    model = queryset.model
+    deleted = 0
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return deleted
+        model._base_manager.filter(pk__in=pks).delete()
+        deleted += len(pks)
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired JWT outstanding tokens (and their blacklist entries), "
+        "expired or used email verification tokens and password reset tokens."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many rows would be deleted.",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        querysets = {
+            # Blacklist entries are removed with their outstanding token.
+            "outstanding tokens": OutstandingToken.objects.filter(expires_at__lt=now),
+            "email verification tokens": EmailVerificationToken.objects.filter(
+                Q(created_at__lt=now - EMAIL_VERIFICATION_TOKEN_LIFETIME)
+                | Q(is_deleted=True)
+            ),
+            "password reset tokens": PasswordResetToken._base_manager.filter(
+                Q(expires_at__lt=now) | Q(is_deleted=True)
+            ),
+        }
+
+        for label, queryset in querysets.items():
+            if options["dry_run"]:
+                self.stdout.write(f"{label}: {queryset.count()} to delete")
+                continue
+            deleted = delete_in_chunks(queryset, options["chunk_size"])
+            self.stdout.write(self.style.SUCCESS(f"{label}: {deleted} deleted"))
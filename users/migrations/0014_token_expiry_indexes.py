@@ -0,0 +1,36 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0013_alter_passwordresettoken_created_by_and_more"),
+        ("token_blacklist", "0012_alter_outstandingtoken_user"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="emailverificationtoken",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="passwordresettoken",
+            name="expires_at",
+            field=models.DateTimeField(db_index=True),
+        ),
+        # The token_blacklist tables belong to simplejwt, so their indexes
+        # for expiry purges and blacklist syncs are added here.
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS token_blacklist_outstandingtoken_expires_at "
+            "ON token_blacklist_outstandingtoken (expires_at)",
+            reverse_sql="DROP INDEX IF EXISTS token_blacklist_outstandingtoken_expires_at",
+        ),
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS token_blacklist_blacklistedtoken_blacklisted_at "
+            "ON token_blacklist_blacklistedtoken (blacklisted_at)",
+            reverse_sql="DROP INDEX IF EXISTS token_blacklist_blacklistedtoken_blacklisted_at",
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:49
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def dedupe_slugs(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    duplicates = (
+        User._base_manager.values("slug")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .values_list("slug", flat=True)
+    )
+    for user in User._base_manager.filter(slug__in=list(duplicates)):
+        user.slug = f"{user.slug}-{user.uuid.hex[:12]}".lstrip("-")
+        user.save(update_fields=["slug"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0014_token_expiry_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="user",
+            name="slug",
+            field=models.SlugField(
+                blank=True, editable=False, max_length=255, null=True, unique=True
+            ),
+        ),
+    ]
@@ -7,18 +7,21 @@ from django.db import models
 from django.utils import timezone
 from django.utils.text import slugify
 
+from core.ids import generate_id, save_with_unique_id
 from core.managers import BaseModelManager
 from core.models import BaseModel
 
+EMAIL_VERIFICATION_TOKEN_LIFETIME = timezone.timedelta(hours=24)
+
 
 class EmailVerificationToken(models.Model):
     user = models.ForeignKey("users.User", on_delete=models.CASCADE)
     token = models.UUIDField(default=uuid.uuid4, unique=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     is_deleted = models.BooleanField(default=False)
 
     def is_expired(self):
-        return self.created_at + timezone.timedelta(hours=24) < timezone.now()
+        return self.created_at + EMAIL_VERIFICATION_TOKEN_LIFETIME < timezone.now()
 
 
 class PasswordResetToken(BaseModel):
@@ -27,7 +30,7 @@ class PasswordResetToken(BaseModel):
     )
     token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
-    expires_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
 
     def is_expired(self):
         return timezone.now() > self.expires_at
@@ -94,6 +97,9 @@ class User(AbstractBaseUser, BaseModel):
     groups = models.ManyToManyField("auth.Group", related_name="users", blank=True)
     objects = UserManager()
     email_verified = models.BooleanField(default=False)
+    slug = models.SlugField(
+        blank=True, null=True, editable=False, max_length=255, unique=True
+    )
     USERNAME_FIELD = "email"
     unique_fields = ["email"]
 
@@ -114,11 +120,16 @@ class User(AbstractBaseUser, BaseModel):
 
     def save(self, *args, **kwargs):
         """Generate slug if not provided"""
-        if not self.slug:
-            self.slug = slugify(
-                self.first_name + "-" + self.last_name
-            )  # More meaningful slug
-            # Ensure uniqueness
-            while User.objects.filter(slug=self.slug).exists():
-                self.slug = f"{self.slug}-{uuid.uuid4().hex[:8]}"
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        # The name keeps it readable and the time-ordered ID unique; the
+        # unique constraint catches the rare conflict.
+        name = slugify(f"{self.first_name}-{self.last_name}")[:240]
+
+        def assign_slug():
+            self.slug = f"{name}-{generate_id('user_slug')}".lstrip("-")
+
+        return save_with_unique_id(
+            lambda: super(User, self).save(*args, **kwargs), assign_slug, "slug"
+        )
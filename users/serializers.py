@@ -76,6 +76,26 @@ class UserRegisterSerializer(serializers.ModelSerializer):
             "post_code",
             "phone_number",
         ]
+        extra_kwargs = {"password": {"write_only": True}}
+
+    def validate(self, attrs):
+        password = attrs.get("password")
+        if password:
+            user = User(**{k: v for k, v in attrs.items() if k != "password"})
+            try:
+                validate_password(password, user)
+            except ValidationError as e:
+                raise serializers.ValidationError({"password": list(e.messages)})
+        return attrs
+
+    def create(self, validated_data):
+        # Hash before the INSERT so the user is written once.
+        password = validated_data.pop("password", None)
+        user = User(**validated_data)
+        if password:
+            user.set_password(password)
+        user.save()
+        return user
 
 
 class ChangePasswordSerializer(serializers.Serializer):
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import User
+from .tokens import USER_CLAIMS, invalidate_cached_user, mark_claims_changed
+
+
+@receiver(pre_save, sender=User)
+def detect_claims_change(sender, instance, **kwargs):
+    if instance._state.adding or instance.pk is None:
+        return
+    fields = [*USER_CLAIMS, "is_deleted"]
+    previous = sender._base_manager.filter(pk=instance.pk).values(*fields).first()
+    instance._claims_changed = previous is not None and any(
+        previous[field] != getattr(instance, field) for field in fields
+    )
+
+
+@receiver(post_save, sender=User)
+def refresh_user_caches(sender, instance, created, **kwargs):
+    invalidate_cached_user(instance.pk)
+    if getattr(instance, "_claims_changed", False):
+        mark_claims_changed(instance.pk)
+        instance._claims_changed = False
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+    mark_claims_changed(instance.pk)
@@ -1 +1,72 @@
-# Create your tests here.
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from core.models import APIKey
+
+from .models import User
+from .tokens import ClaimsRefreshToken, revoked_tokens
+
+
+class RevokedTokenTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="tokens@example.com",
+            password="Passw0rd!x",
+            first_name="To",
+            last_name="Ken",
+        )
+        revoked_tokens.sync(force=True)
+
+    def test_blacklist_checks_cost_no_query(self):
+        revoked = ClaimsRefreshToken.for_user(self.user)
+        revoked.blacklist()
+        valid = ClaimsRefreshToken.for_user(self.user)
+        with self.assertNumQueries(0):
+            with self.assertRaises(TokenError):
+                revoked.check_blacklist()
+            valid.check_blacklist()
+
+    def test_sync_picks_up_entries_committed_late(self):
+        token = ClaimsRefreshToken.for_user(self.user)
+        revoked_tokens.sync(force=True)
+        # Blacklisted by another process whose transaction committed after
+        # later entries were already synced.
+        entry = BlacklistedToken.objects.create(
+            token=OutstandingToken.objects.get(jti=token["jti"])
+        )
+        BlacklistedToken.objects.filter(pk=entry.pk).update(
+            blacklisted_at=revoked_tokens._synced_at - timedelta(seconds=30)
+        )
+        revoked_tokens.sync(force=True)
+        with self.assertRaises(TokenError):
+            token.check_blacklist()
+
+
+@override_settings(RATELIMIT_ENABLE=False)
+class UserLookupPermissionTests(TestCase):
+    def setUp(self):
+        self.user, self.other = (
+            User.objects.create_user(
+                email=f"{name}@example.com",
+                password="Passw0rd!x",
+                first_name=name.title(),
+                last_name="User",
+            )
+            for name in ("self", "other")
+        )
+        self.client = APIClient(HTTP_X_API_KEY=APIKey.objects.create(name="tests").key)
+        self.client.force_authenticate(self.user)
+
+    def test_users_are_looked_up_by_any_key_but_only_by_themselves(self):
+        for user, status in ((self.user, 200), (self.other, 403)):
+            for lookup in (user.pk, user.uuid, user.slug):
+                with self.subTest(user=user.email, lookup=lookup):
+                    response = self.client.get(f"/api/user/{lookup}/")
+                    self.assertEqual(response.status_code, status)
@@ -0,0 +1,198 @@
+import hashlib
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .models import User
+
+# User fields embedded in every token so requests can be authorised without
+# loading the user.
+USER_CLAIMS = ("is_staff", "is_superuser", "role", "email_verified")
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the `USER_CLAIMS` of the user."""
+
+    def check_blacklist(self):
+        # Checked against the in-memory set only, without a query, so a token
+        # blacklisted by another process is accepted until the set syncs.
+        if is_token_revoked(self):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        blacklisted = super().blacklist()
+        revoked_tokens.add(self[api_settings.JTI_CLAIM])
+        return blacklisted
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+def _claims_changed_key(user_id):
+    return f"jwt:claims-changed:{user_id}"
+
+
+def _user_key(user_id):
+    return f"users:{user_id}"
+
+
+class RevokedTokenSet:
+    """
+    In-process set of the JTIs of blacklisted, unexpired tokens, kept as
+    64-bit hashes so it stays small. New blacklist entries are pulled from
+    the database at most every `REVOKED_TOKENS_SYNC_INTERVAL` seconds and the
+    set is rebuilt every `REVOKED_TOKENS_REBUILD_INTERVAL` seconds to drop
+    expired tokens, so checks normally cost no query. Each sync also rereads
+    the last `REVOKED_TOKENS_SYNC_OVERLAP` seconds, since a row can commit
+    after rows with later `blacklisted_at` values were synced.
+    """
+
+    def __init__(self):
+        self._hashes = set()
+        self._lock = threading.Lock()
+        self._synced_at = None
+        self._checked_at = 0.0
+        self._rebuilt_at = 0.0
+
+    @staticmethod
+    def _hash(jti):
+        return int.from_bytes(
+            hashlib.blake2b(jti.encode(), digest_size=8).digest(), "big"
+        )
+
+    def add(self, jti):
+        self._hashes.add(self._hash(jti))
+
+    def __contains__(self, jti):
+        self.sync()
+        return self._hash(jti) in self._hashes
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def sync(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._checked_at < settings.REVOKED_TOKENS_SYNC_INTERVAL:
+            return
+        # Another thread is already syncing; its result is good enough.
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._checked_at = now
+            rebuild = (
+                self._synced_at is None
+                or now - self._rebuilt_at >= settings.REVOKED_TOKENS_REBUILD_INTERVAL
+            )
+            queryset = BlacklistedToken.objects.filter(
+                token__expires_at__gt=timezone.now()
+            )
+            if not rebuild:
+                overlap = timedelta(seconds=settings.REVOKED_TOKENS_SYNC_OVERLAP)
+                queryset = queryset.filter(
+                    blacklisted_at__gte=self._synced_at - overlap
+                )
+
+            hashes = set() if rebuild else self._hashes
+            synced_at = self._synced_at
+            for jti, blacklisted_at in queryset.values_list(
+                "token__jti", "blacklisted_at"
+            ).iterator():
+                hashes.add(self._hash(jti))
+                if synced_at is None or blacklisted_at > synced_at:
+                    synced_at = blacklisted_at
+
+            self._hashes = hashes
+            self._synced_at = synced_at or timezone.now()
+            if rebuild:
+                self._rebuilt_at = now
+        finally:
+            self._lock.release()
+
+
+revoked_tokens = RevokedTokenSet()
+
+
+def revoke_token(token):
+    """
+    Blacklist `token` (refresh or access) in the database so every process
+    rejects it once its `revoked_tokens` set syncs, and locally right away.
+    """
+    jti = token[api_settings.JTI_CLAIM]
+    outstanding, _ = OutstandingToken.objects.get_or_create(
+        jti=jti,
+        defaults={
+            "user_id": token.get(api_settings.USER_ID_CLAIM),
+            "token": str(token),
+            "expires_at": datetime_from_epoch(token["exp"]),
+        },
+    )
+    BlacklistedToken.objects.get_or_create(token=outstanding)
+    revoked_tokens.add(jti)
+
+
+def is_token_revoked(token):
+    return token[api_settings.JTI_CLAIM] in revoked_tokens
+
+
+def mark_claims_changed(user_id):
+    """
+    Stop trusting the claims of tokens issued to `user_id` before now; those
+    tokens fall back to loading the user from the database.
+    """
+    cache.set(
+        _claims_changed_key(user_id),
+        time.time(),
+        int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+    )
+
+
+def claims_are_current(token):
+    changed_at = cache.get(_claims_changed_key(token[api_settings.USER_ID_CLAIM]))
+    return changed_at is None or token.get("iat", 0) > changed_at
+
+
+def user_from_claims(token):
+    """
+    Build the token's user from its claims without a query. Fields that are
+    not claimed are deferred; use `get_full_user` when they are needed.
+    """
+    claims = {"id": token[api_settings.USER_ID_CLAIM]}
+    claims.update((claim, token[claim]) for claim in USER_CLAIMS)
+    # `from_db` expects the values in model field order.
+    fields = [f.attname for f in User._meta.concrete_fields if f.attname in claims]
+    return User.from_db("default", fields, [claims[name] for name in fields])
+
+
+def get_full_user(user):
+    """
+    Return `user` with every field loaded, from a cache kept for
+    `USER_CACHE_TIMEOUT` seconds when it was built from token claims.
+    """
+    if not user.get_deferred_fields():
+        return user
+    full_user = cache.get(_user_key(user.pk))
+    if full_user is None:
+        full_user = User.objects.get(pk=user.pk)
+        cache.set(_user_key(user.pk), full_user, settings.USER_CACHE_TIMEOUT)
+    return full_user
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(_user_key(user_id))
@@ -1,6 +1,7 @@
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 
 from core.mixins import BulkOperationsMixin, MultiLookupMixin
+from core.ratelimit import RateLimit, request_field
 from core.utils import generate_bulk_schema_view, generate_crud_schema_view
 from core.views import BaseViewSet
 
@@ -52,6 +53,18 @@ class UserViewSet(MultiLookupMixin, BulkOperationsMixin, BaseViewSet):
         "create": [IsAuthenticated],
         "default": [IsAuthenticated],
     }
+    ratelimit_by_action = {
+        "register": [RateLimit("5/h")],
+        "login": [RateLimit("10/m"), RateLimit("20/h", key=request_field("email"))],
+        "forgot_password": [
+            RateLimit("5/h"),
+            RateLimit("3/h", key=request_field("email")),
+        ],
+        "resend_verification_token": [
+            RateLimit("5/h"),
+            RateLimit("3/h", key=request_field("email")),
+        ],
+    }
 
     def get_serializer_class(self):
         if self.action == "register":